@@ -0,0 +1,45 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+import numpy as np
+
+
+class Checkpoint():
+    """Snapshot of a running simulation in a single .npz file: the
+    arrays of the state are stored as they are and the rest (slot
+    counters, RNG states...) as one JSON entry. A checkpoint is written
+    to a temporary file and renamed, so a run killed while saving keeps
+    the previous one.
+    """
+
+    meta_key: str = "meta"
+
+    @staticmethod
+    def save(path: Path, state: dict[str, Any]) -> None:
+        """Write state to path, replacing the previous checkpoint.
+
+        Args:
+            path (Path): The .npz file.
+            state (dict[str, Any]): The arrays of the state, and values
+                that can be written as JSON. None values are kept in
+                the JSON entry.
+        """
+        arrays: dict[str, np.ndarray] = {key: value for key, value in state.items() if isinstance(value, np.ndarray)}
+        meta: dict[str, Any] = {key: value for key, value in state.items() if key not in arrays}
+        temporary: Path = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(temporary, **arrays, **{Checkpoint.meta_key: np.array(json.dumps(meta))})
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path: Path) -> dict[str, Any] | None:
+        """Returns:
+            dict[str, Any] | None: The state saved in path, or None if
+            there is no checkpoint.
+        """
+        if (not path.exists()):
+            return None
+        with np.load(path) as archive:
+            state: dict[str, Any] = {key: archive[key] for key in archive.files if key != Checkpoint.meta_key}
+            state.update(json.loads(str(archive[Checkpoint.meta_key])))
+        return state
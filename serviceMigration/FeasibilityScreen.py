@@ -0,0 +1,123 @@
+import numpy as np
+from PowerConsumptionModel import PowerConsumptionModel as PCM
+from SolverBackend import HeuristicBackend, PlacementProblem
+
+
+class FeasibilityScreen():
+    """Cheap tests that run before the model of a time slot is built.
+    They declare the time slot infeasible from aggregate bounds, find a
+    feasible placement with the greedy pass of HeuristicBackend, and
+    bound the number of time slots the fleet can still survive.
+    """
+
+    eps: float = 1e-9
+
+    @staticmethod
+    def check_infeasible(problem: PlacementProblem) -> str | None:
+        """Test necessary conditions for the time slot to be feasible.
+
+        Args:
+            problem (PlacementProblem): The problem of the time slot.
+
+        Returns:
+            str | None: The condition that does not hold, or None if
+            the time slot may be feasible.
+        """
+        eps: float = FeasibilityScreen.eps
+        replicas: np.ndarray = problem.get_replicas()
+        if (problem.ram_req @ replicas > problem.ram_cap.sum() + eps):
+            return "ram"
+        # Every UAV must keep the battery floor even with its most
+        # favourable set of instances.
+        if ((problem.batt_lvl - problem.get_min_energy() < problem.min_batt_lvl - eps).any()):
+            return "battery"
+        # An instance fits in a UAV if it can be part of a feasible
+        # placement there, counting the replicas that lower the
+        # consumption of the UAV (see PlacementProblem.get_candidates).
+        fits: np.ndarray = problem.get_candidates(eps)
+        if (not fits.any(axis=0).all()):
+            return "instance"
+        min_cpu: np.ndarray = np.where(fits, problem.cpu_coeffs, np.inf).min(axis=0)
+        if (min_cpu @ replicas > problem.shape[0] + eps):
+            return "cpu"
+        return None
+
+    @staticmethod
+    def find_certificate(problem: PlacementProblem) -> np.ndarray | None:
+        """Returns:
+            np.ndarray | None: A feasible placement (UAV × instance)
+            found by the greedy pass of HeuristicBackend, or None. It
+            proves that the time slot is feasible.
+        """
+        heuristic: HeuristicBackend = HeuristicBackend(max_iterations=0)
+        heuristic.build(problem)
+        heuristic.solve()
+        return heuristic.placement
+
+    @staticmethod
+    def get_min_slot_consumption(cpu_freq: np.ndarray,
+                                 input_sizes: np.ndarray,
+                                 cpu_cycles_per_request: np.ndarray,
+                                 max_replicas: np.ndarray,
+                                 n_requests: int,
+                                 time_slot_interval: float) -> np.ndarray:
+        """Lower bound on the energy each UAV consumes in any future
+        time slot, whatever the requests and the placement. The idle
+        consumption is always paid. The requests of a service cost
+        energy (downlink, and CPU or uplink) unless the UAV hosts
+        enough of its replicas for the uplink saving to exceed the CPU
+        cost, in which case all n_requests are assumed to go to it.
+
+        Args:
+            cpu_freq (np.ndarray): The CPU frequency of each UAV.
+            input_sizes (np.ndarray): The input size of each service.
+            cpu_cycles_per_request (np.ndarray): The CPU cycles per
+                request of each service.
+            max_replicas (np.ndarray): The replicas of each service
+                that each UAV can host at most (UAV × service).
+            n_requests (int): The number of requests per time slot.
+            time_slot_interval (float): The duration of a time slot.
+
+        Returns:
+            np.ndarray: The minimum consumption of each UAV (Wh).
+        """
+        idle_energy: float = PCM.get_energy_consumption(
+            cpu_utilization=0.0,
+            uplink_data_rate=0.0,
+            downlink_data_rate=0.0,
+            time_slot_interval=time_slot_interval)
+        # Energy of a single request with max_replicas hosted, which is
+        # the extreme of a cost that is linear in the replicas.
+        request_energy: np.ndarray = PCM.get_energy_consumption(
+            cpu_utilization=max_replicas * cpu_cycles_per_request / cpu_freq[:, None],
+            uplink_data_rate=(1 - max_replicas) * input_sizes,
+            downlink_data_rate=input_sizes,
+            time_slot_interval=time_slot_interval) - idle_energy
+        return idle_energy + np.minimum(0.0, request_energy.min(axis=1)) * n_requests
+
+    @staticmethod
+    def get_max_remaining_slots(problem: PlacementProblem, min_slot_consumption: np.ndarray) -> float:
+        """Certified upper bound on the number of time slots, starting
+        with the current one, that the fleet can still survive. The
+        battery floor applies to every UAV, so the run ends as soon as
+        any UAV cannot pay for one more time slot.
+
+        Args:
+            problem (PlacementProblem): The problem of the current time
+                slot.
+            min_slot_consumption (np.ndarray): The minimum consumption
+                of each UAV in the following time slots, as returned by
+                get_min_slot_consumption.
+
+        Returns:
+            float: The maximum number of remaining time slots, inf if
+            no UAV has a positive minimum consumption.
+        """
+        margin: np.ndarray = problem.batt_lvl - problem.get_min_energy() - problem.min_batt_lvl
+        if ((margin < -FeasibilityScreen.eps).any()):
+            return 0.0
+        consuming: np.ndarray = min_slot_consumption > 0
+        if (not consuming.any()):
+            return float("inf")
+        following: np.ndarray = np.floor((margin[consuming] + FeasibilityScreen.eps) / min_slot_consumption[consuming])
+        return float(1 + following.min())
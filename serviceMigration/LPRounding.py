@@ -0,0 +1,89 @@
+import numpy as np
+import scipy.sparse as sp
+from SolverBackend import PlacementProblem
+
+
+class LPRounding():
+    """Warm start of the placement MILP from its LP relaxation. The
+    relaxation bounds the z of the time slot from above (and proves it
+    infeasible if it has no solution), and its solution is rounded,
+    instance by instance, into a placement that respects the RAM, CPU
+    and battery floor constraints, which is the MIP start of the
+    solver.
+    """
+
+    eps: float = 1e-9
+
+    @staticmethod
+    def solve_relaxation(problem: PlacementProblem) -> tuple[float, np.ndarray] | None:
+        """Solve the LP relaxation of the placement model with HiGHS.
+
+        Args:
+            problem (PlacementProblem): The problem of the time slot.
+
+        Returns:
+            tuple[float, np.ndarray] | None: The bound on z and the
+            fractional placement (UAV × instance), or None if the
+            relaxation is infeasible.
+        """
+        from scipy.optimize import linprog
+        matrices: dict[str, list] = {"=": [], "<": [], ">": []}
+        rhs: dict[str, list] = {"=": [], "<": [], ">": []}
+        for matrix, sense, values in problem.get_constraint_matrices().values():
+            matrices[sense].append(matrix)
+            rhs[sense].append(values)
+        n_vars: int = problem.shape[0] * problem.shape[1] + 1
+        c: np.ndarray = np.zeros(n_vars)
+        c[-1] = -1.0
+        upper: np.ndarray = np.append(np.tile(problem.get_replicas(), problem.shape[0]), problem.batt_lvl.max())
+        lower: np.ndarray = np.zeros(n_vars)
+        lower[-1] = problem.min_z
+        result = linprog(c=c,
+                         A_ub=sp.vstack(matrices["<"] + [-matrix for matrix in matrices[">"]]).tocsr(),
+                         b_ub=np.concatenate(rhs["<"] + [-values for values in rhs[">"]]),
+                         A_eq=sp.vstack(matrices["="]).tocsr(),
+                         b_eq=np.concatenate(rhs["="]),
+                         bounds=np.column_stack([lower, upper]),
+                         method="highs")
+        if (result.status != 0):
+            return None
+        return float(result.x[-1]), result.x[:-1].reshape(problem.shape)
+
+    @staticmethod
+    def round(problem: PlacementProblem, fractional: np.ndarray) -> np.ndarray | None:
+        """Round a fractional placement. The instances are placed one at
+        a time, the most decided first, in a UAV that can still host
+        them: preferably the UAV the relaxation placed them in (at
+        least half), then any UAV it placed part of them in, then any
+        other, and among those the UAV left with the highest battery.
+
+        Args:
+            problem (PlacementProblem): The problem of the time slot,
+                with one column per instance.
+            fractional (np.ndarray): The placement of the relaxation
+                (UAV × instance).
+
+        Returns:
+            np.ndarray | None: The placement (UAV × instance), or None
+            if an instance fits in no UAV.
+        """
+        eps: float = LPRounding.eps
+        ram_used: np.ndarray = np.zeros(problem.shape[0])
+        cpu_used: np.ndarray = np.zeros(problem.shape[0])
+        battery: np.ndarray = problem.batt_lvl - problem.energy_constant
+        placement: np.ndarray = np.zeros(problem.shape)
+        tiers: np.ndarray = (fractional >= 0.5).astype(int) + (fractional > 1e-6).astype(int)
+        for instance in np.lexsort((-problem.ram_req, -fractional.max(axis=0))):
+            new_battery: np.ndarray = battery - problem.energy_coeffs[:, instance]
+            feasible: np.ndarray = (ram_used + problem.ram_req[instance] <= problem.ram_cap + eps) &\
+                                   (cpu_used + problem.cpu_coeffs[:, instance] <= 1.0 + eps) &\
+                                   (new_battery >= problem.min_batt_lvl - eps)
+            if (not feasible.any()):
+                return None
+            order: np.ndarray = np.lexsort((-new_battery, -tiers[:, instance]))
+            uav: int = int(order[feasible[order]][0])
+            placement[uav, instance] = 1.0
+            ram_used[uav] += problem.ram_req[instance]
+            cpu_used[uav] += problem.cpu_coeffs[uav, instance]
+            battery[uav] = new_battery[uav]
+        return placement
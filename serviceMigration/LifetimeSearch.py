@@ -0,0 +1,178 @@
+import csv
+import math
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from SweepRunner import SweepRunner
+
+
+class LifetimeSearch():
+    """Finds the number of time slots survived by every fleet size
+    without simulating all of them. The lifetime grows (almost)
+    monotonically with the fleet size, so if two fleet sizes survive
+    the same time slots, so do the sizes in between. Every curve
+    (n_requests × seed) starts from its smallest and largest fleet, and
+    the intervals whose ends differ are split until they are adjacent
+    sizes, so only the steps of the curve are simulated densely.
+
+    Every fleet size of a curve uses the same seed, so the request
+    streams are common random numbers and the differences between
+    fleet sizes are not noise. The midpoints of all the open intervals
+    are simulated as one parallel batch, with more points per interval
+    when there are fewer intervals than workers. A midpoint whose upper
+    bound (SweepRunner.get_max_time_slots) does not exceed the lifetime
+    of the smaller end of its interval survives exactly as long, and is
+    not simulated.
+    """
+
+    columns: list[str] = SweepRunner.columns + ["Simulated"]
+
+    @staticmethod
+    def get_probes(lifetimes: dict[int, int], batch_size: int) -> list[list[int]]:
+        """Returns the fleet sizes to simulate next for a curve.
+
+        Args:
+            lifetimes (dict[int, int]): The time slots survived by the
+                fleet sizes simulated so far.
+            batch_size (int): The number of fleet sizes to aim for in
+                the batch, for the intervals of this curve.
+
+        Returns:
+            list[list[int]]: The fleet sizes inside every open interval
+            (ends that differ and are not adjacent), evenly spaced.
+        """
+        sizes: list[int] = sorted(lifetimes.keys())
+        intervals: list[tuple[int, int]] = [(low, high) for low, high in zip(sizes, sizes[1:])
+                                            if high - low > 1 and lifetimes[low] != lifetimes[high]]
+        if (not intervals):
+            return []
+        points: int = max(1, math.ceil(batch_size / len(intervals)))
+        probes: list[list[int]] = []
+        for low, high in intervals:
+            inside: set[int] = {low + round((high - low) * (j + 1) / (points + 1)) for j in range(points)}
+            probes.append(sorted(size for size in inside if low < size < high))
+        return probes
+
+    @staticmethod
+    def get_bounded(lifetimes: dict[int, int],
+                    sizes: list[int],
+                    get_bound: Callable[[int], float]) -> dict[int, int]:
+        """Returns the lifetimes of the fleet sizes that need no
+        simulation: those whose upper bound does not exceed the lifetime
+        of the closest smaller known size, which bounds them from
+        below.
+
+        Args:
+            lifetimes (dict[int, int]): The time slots survived by the
+                fleet sizes simulated so far.
+            sizes (list[int]): The fleet sizes to simulate next.
+            get_bound (Callable[[int], float]): The upper bound of the
+                time slots survived by a fleet size.
+
+        Returns:
+            dict[int, int]: The lifetimes of the bounded fleet sizes.
+        """
+        bounded: dict[int, int] = {}
+        for size in sizes:
+            smaller: list[int] = [known for known in lifetimes.keys() if known < size]
+            if (smaller and get_bound(size) <= lifetimes[max(smaller)]):
+                bounded[size] = lifetimes[max(smaller)]
+        return bounded
+
+    @staticmethod
+    def fill(lifetimes: dict[int, int], fleet_sizes: list[int]) -> dict[int, int]:
+        """Returns:
+            dict[int, int]: The time slots survived by every fleet size,
+            those that were not simulated taking the value of the
+            closest smaller simulated size (equal to the closest larger
+            one once the search is over).
+        """
+        sizes: list[int] = sorted(lifetimes.keys())
+        filled: dict[int, int] = {}
+        j: int = 0
+        for size in sorted(fleet_sizes):
+            while (j + 1 < len(sizes) and sizes[j + 1] <= size):
+                j += 1
+            filled[size] = lifetimes[sizes[j]]
+        return filled
+
+    @staticmethod
+    def search(scenario: Path,
+               fleet_sizes: list[int],
+               n_requests: list[int | None],
+               seeds: list[int],
+               output_path: Path,
+               workers: int | None = None,
+               threads: int | None = None,
+               migrator_options: dict[str, Any] | None = None,
+               cache_dir: Path | None = None) -> Iterator[dict[str, Any]]:
+        """Search the lifetime curve of every number of requests and
+        seed, and write it to output_path once it is complete.
+
+        Args:
+            scenario (Path): The path of the input_file.
+            fleet_sizes (list[int]): The consecutive fleet sizes of the
+                curves.
+            n_requests (list[int | None]): The requests per time slot.
+            seeds (list[int]): The seeds of the request streams.
+            output_path (Path): The CSV file of the curves, with the
+                columns of SweepRunner plus "Simulated" (0 for the fleet
+                sizes that were filled in or bounded). It is
+                overwritten.
+            workers (int | None): The number of worker processes.
+            threads (int | None): The number of Gurobi threads per
+                worker.
+            migrator_options (dict[str, Any] | None): Keyword arguments
+                of the ServiceMigrator.
+            cache_dir (Path | None): The directory of the placement
+                caches of the workers.
+
+        Yields:
+            dict[str, Any]: Each simulated configuration with its
+            number of survived time slots, in order of completion.
+        """
+        curves: list[tuple[int | None, int]] = [(requests, seed) for requests in n_requests for seed in seeds]
+        lifetimes: dict[tuple[int | None, int], dict[int, int]] = {curve: {} for curve in curves}
+        requests_per_slot: dict[tuple[int | None, int], int] = {}
+        workers, threads = SweepRunner.split_cores(workers, threads, 2 * len(curves))
+        if (cache_dir is not None):
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        probes: dict[tuple[int | None, int], list[int]] = {curve: [min(fleet_sizes), max(fleet_sizes)]
+                                                           for curve in curves}
+        simulated: dict[tuple[int | None, int], set[int]] = {curve: set() for curve in curves}
+        with SweepRunner.start_pool(workers, threads, cache_dir) as pool:
+            while (any(probes.values())):
+                for curve in curves:
+                    bounded: dict[int, int] = LifetimeSearch.get_bounded(
+                        lifetimes[curve], probes[curve],
+                        lambda n_uavs: SweepRunner.get_max_time_slots(scenario, n_uavs, curve[0], curve[1],
+                                                                      migrator_options=migrator_options))
+                    lifetimes[curve].update(bounded)
+                    probes[curve] = [n_uavs for n_uavs in probes[curve] if n_uavs not in bounded]
+                # The results carry the requests per time slot of the
+                # scenario, so the curve travels along with the config.
+                configs: list[dict[str, Any]] = [{"n_uavs": n_uavs, "n_requests": curve[0], "seed": curve[1],
+                                                  "curve": curve}
+                                                 for curve, sizes in probes.items()
+                                                 for n_uavs in sorted(set(sizes), reverse=True)]
+                for result in SweepRunner.evaluate(pool, scenario, configs, migrator_options):
+                    curve: tuple[int | None, int] = result.pop("curve")
+                    lifetimes[curve][result["n_uavs"]] = result["time_slots"]
+                    simulated[curve].add(result["n_uavs"])
+                    requests_per_slot[curve] = result["n_requests"]
+                    yield result
+                open_curves: int = sum(bool(LifetimeSearch.get_probes(lifetimes[curve], 1)) for curve in curves)
+                batch_size: int = math.ceil(workers / max(1, open_curves))
+                probes = {curve: [size for interval in LifetimeSearch.get_probes(lifetimes[curve], batch_size)
+                                  for size in interval]
+                          for curve in curves}
+
+        with open(output_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(LifetimeSearch.columns)
+            for curve in curves:
+                for n_uavs, time_slots in LifetimeSearch.fill(lifetimes[curve], fleet_sizes).items():
+                    writer.writerow([n_uavs,
+                                     time_slots,
+                                     requests_per_slot[curve],
+                                     curve[1],
+                                     int(n_uavs in simulated[curve])])
@@ -0,0 +1,227 @@
+import csv
+import math
+from pathlib import Path
+from typing import Any, Iterator
+import numpy as np
+from scipy.stats import t as student_t
+from SweepRunner import SweepRunner
+
+
+class ReplicaSummary():
+    """Running summary of the replicas of a configuration (fleet size ×
+    n_requests), updated as each replica completes: the time slots
+    survived, the minimum battery of every time slot and the migrations
+    of every replica.
+    """
+
+    quantiles: tuple[float, ...] = (0.05, 0.5, 0.95)
+
+    def __init__(self) -> None:
+        self.time_slots: list[int] = []
+        self.min_battery: list[np.ndarray] = []
+        self.migrations: list[int] = []
+        self.n_requests: int | None = None
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.time_slots)
+
+    def add(self, result: dict[str, Any]) -> None:
+        """Add a replica, as returned by SweepRunner.simulate. The mean
+        and the variance of the time slots are updated with Welford's
+        method.
+        """
+        self.time_slots.append(result["time_slots"])
+        self.min_battery.append(np.array(result["min_battery"]))
+        self.migrations.append(sum(result["migrations"]))
+        self.n_requests = result["n_requests"]
+        delta: float = result["time_slots"] - self.mean
+        self.mean += delta / len(self)
+        self.m2 += delta * (result["time_slots"] - self.mean)
+
+    def get_half_width(self, confidence: float) -> float:
+        """Returns:
+            float: The half width of the Student t confidence interval
+            of the mean time slots, inf with less than two replicas.
+        """
+        n: int = len(self)
+        if (n < 2):
+            return float("inf")
+        std: float = math.sqrt(self.m2 / (n - 1))
+        return float(student_t.ppf((1 + confidence) / 2, n - 1) * std / math.sqrt(n))
+
+    def summarize(self, confidence: float) -> dict[str, Any]:
+        """Returns:
+            dict[str, Any]: The number of replicas, the mean, standard
+            deviation, confidence interval and quantiles of the time
+            slots, and the mean and quantiles of the migrations per
+            replica.
+        """
+        half_width: float = self.get_half_width(confidence)
+        time_slots: np.ndarray = np.array(self.time_slots)
+        migrations: np.ndarray = np.array(self.migrations)
+        return {"replicas": len(self),
+                "mean": self.mean,
+                "std": math.sqrt(self.m2 / (len(self) - 1)) if len(self) > 1 else float("nan"),
+                "ci_low": self.mean - half_width,
+                "ci_high": self.mean + half_width,
+                **{f"q{round(100 * q):02d}": float(np.quantile(time_slots, q)) for q in self.quantiles},
+                "migrations": float(migrations.mean()),
+                **{f"migrations_q{round(100 * q):02d}": float(np.quantile(migrations, q)) for q in self.quantiles}}
+
+    def get_trajectory(self) -> list[dict[str, Any]]:
+        """Returns:
+            list[dict[str, Any]]: For every time slot, the replicas that
+            survived it and the mean and quantiles of their minimum
+            battery.
+        """
+        rows: list[dict[str, Any]] = []
+        for slot in range(max(self.time_slots, default=0)):
+            values: np.ndarray = np.array([battery[slot] for battery in self.min_battery if battery.size > slot])
+            rows.append({"slot": slot,
+                         "alive": values.size,
+                         "mean": float(values.mean()),
+                         **{f"q{round(100 * q):02d}": float(np.quantile(values, q)) for q in self.quantiles}})
+        return rows
+
+
+class MonteCarlo():
+    """Replicates every configuration (fleet size × n_requests) with
+    independent request streams until the confidence interval of its
+    mean lifetime is narrow enough. Replica k of every configuration
+    uses the seed base_seed + k, so the fleet sizes share their request
+    streams (common random numbers) and their differences have less
+    variance than independent runs would.
+
+    The replicas run in rounds on a SweepRunner pool: the first round
+    runs min_replicas of every configuration and every following round
+    runs, for the configurations that have not converged, the replicas
+    that their current variance says are missing (at most as many as
+    there are workers per open configuration, and max_replicas in
+    total). The summaries are updated as each replica completes and
+    written after every round.
+    """
+
+    columns: list[str] = ["No of UAVs", "Requests", "Replicas", "Mean time slots", "Std", "CI low", "CI high",
+                          "Q05", "Median", "Q95", "Mean migrations", "Migrations Q05", "Migrations median",
+                          "Migrations Q95"]
+    trajectory_columns: list[str] = ["No of UAVs", "Requests", "Slot", "Alive", "Mean min battery",
+                                     "Q05", "Median", "Q95"]
+
+    @staticmethod
+    def get_missing(summary: ReplicaSummary, target_width: float, confidence: float, max_replicas: int) -> int:
+        """Returns:
+            int: The replicas still needed for the half width of the
+            confidence interval to reach target_width, estimated from
+            the current variance, 0 if it already has.
+        """
+        half_width: float = summary.get_half_width(confidence)
+        if (half_width <= target_width):
+            return 0
+        if (math.isinf(half_width)):
+            return max(0, min(2, max_replicas) - len(summary))
+        needed: int = math.ceil(len(summary) * (half_width / max(target_width, 1e-12)) ** 2)
+        return max(1, min(needed, max_replicas) - len(summary))
+
+    @staticmethod
+    def run(scenario: Path,
+            fleet_sizes: list[int],
+            n_requests: list[int | None],
+            output_path: Path,
+            target_width: float = 1.0,
+            confidence: float = 0.95,
+            min_replicas: int = 5,
+            max_replicas: int = 100,
+            base_seed: int = 0,
+            workers: int | None = None,
+            threads: int | None = None,
+            migrator_options: dict[str, Any] | None = None,
+            cache_dir: Path | None = None) -> Iterator[dict[str, Any]]:
+        """Replicate the configurations and write their summaries.
+
+        Args:
+            scenario (Path): The path of the input_file.
+            fleet_sizes (list[int]): The fleet sizes.
+            n_requests (list[int | None]): The requests per time slot.
+            output_path (Path): The CSV file of the summaries, with
+                MonteCarlo.columns. The minimum battery trajectories
+                are written next to it, with the suffix
+                "_trajectories". Both are overwritten.
+            target_width (float): The half width (time slots) of the
+                confidence interval of the mean lifetime at which a
+                configuration stops.
+            confidence (float): The confidence level of the interval.
+            min_replicas (int): The replicas of every configuration
+                before the interval is checked.
+            max_replicas (int): The replicas after which a
+                configuration stops even if it has not converged.
+            base_seed (int): The seed of the first replica.
+            workers (int | None): The number of worker processes.
+            threads (int | None): The number of Gurobi threads per
+                worker.
+            migrator_options (dict[str, Any] | None): Keyword arguments
+                of the ServiceMigrator.
+            cache_dir (Path | None): The directory of the placement
+                caches of the workers.
+
+        Yields:
+            dict[str, Any]: Each replica with its number of survived
+            time slots and the half width of its configuration so far,
+            in order of completion.
+        """
+        keys: list[tuple[int, int | None]] = [(n_uavs, requests) for n_uavs in sorted(fleet_sizes, reverse=True)
+                                              for requests in n_requests]
+        summaries: dict[tuple[int, int | None], ReplicaSummary] = {key: ReplicaSummary() for key in keys}
+        submitted: dict[tuple[int, int | None], int] = {key: 0 for key in keys}
+        workers, threads = SweepRunner.split_cores(workers, threads, len(keys) * min_replicas)
+        if (cache_dir is not None):
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        missing: dict[tuple[int, int | None], int] = {key: min(min_replicas, max_replicas) for key in keys}
+        with SweepRunner.start_pool(workers, threads, cache_dir) as pool:
+            while (any(missing.values())):
+                configs: list[dict[str, Any]] = []
+                for key, count in missing.items():
+                    for k in range(submitted[key], submitted[key] + count):
+                        # The configuration key travels with the config,
+                        # since the results carry the requests per time
+                        # slot of the scenario instead of None.
+                        configs.append({"n_uavs": key[0], "n_requests": key[1], "seed": base_seed + k, "key": key})
+                    submitted[key] += count
+                for result in SweepRunner.evaluate(pool, scenario, configs, migrator_options):
+                    key: tuple[int, int | None] = result.pop("key")
+                    summaries[key].add(result)
+                    yield {**result, "half_width": summaries[key].get_half_width(confidence)}
+                open_keys: list[tuple[int, int | None]] = [
+                    key for key in keys
+                    if (submitted[key] < max_replicas and
+                        MonteCarlo.get_missing(summaries[key], target_width, confidence, max_replicas) > 0)]
+                share: int = max(1, math.ceil(workers / max(1, len(open_keys))))
+                missing = {key: min(share, MonteCarlo.get_missing(summaries[key], target_width, confidence,
+                                                                  max_replicas))
+                           if key in open_keys else 0
+                           for key in keys}
+                MonteCarlo.write(output_path, summaries, confidence)
+
+    @staticmethod
+    def write(output_path: Path, summaries: dict[tuple[int, int | None], ReplicaSummary], confidence: float) -> None:
+        """Write the summaries and the minimum battery trajectories of
+        the configurations with at least one replica.
+        """
+        trajectory_path: Path = output_path.with_name(f"{output_path.stem}_trajectories{output_path.suffix}")
+        with open(output_path, "w", newline="") as file, open(trajectory_path, "w", newline="") as trajectory_file:
+            writer = csv.writer(file)
+            writer.writerow(MonteCarlo.columns)
+            trajectory_writer = csv.writer(trajectory_file)
+            trajectory_writer.writerow(MonteCarlo.trajectory_columns)
+            for (n_uavs, _), summary in summaries.items():
+                if (not len(summary)):
+                    continue
+                row: dict[str, Any] = summary.summarize(confidence)
+                writer.writerow([n_uavs, summary.n_requests, row["replicas"], row["mean"], row["std"],
+                                 row["ci_low"], row["ci_high"], row["q05"], row["q50"], row["q95"],
+                                 row["migrations"], row["migrations_q05"], row["migrations_q50"],
+                                 row["migrations_q95"]])
+                for slot in summary.get_trajectory():
+                    trajectory_writer.writerow([n_uavs, summary.n_requests, slot["slot"], slot["alive"],
+                                                slot["mean"], slot["q05"], slot["q50"], slot["q95"]])
@@ -0,0 +1,112 @@
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from SolverBackend import PlacementProblem
+
+
+class PlacementCache():
+    """LRU cache of the placements of already solved time slots, shared
+    across the time slots of a run and, if a path is given, across
+    runs. A time slot is identified by a fingerprint of its
+    PlacementProblem: the battery, the RAM capacity and the CPU and
+    energy coefficients of every UAV, quantized so that similar time
+    slots collide, with the UAVs sorted so that the same slot with the
+    UAVs permuted collides too.
+
+    A cached placement is only an approximation of the optimal
+    placement of the new time slot, so ServiceMigrator checks that it
+    is feasible before deploying it (reuse=True) or only uses it as the
+    MIP start of the solver (reuse=False).
+    """
+
+    def __init__(self, capacity: int = 4096,
+                       battery_step: float = 0.01,
+                       cpu_step: float = 0.01,
+                       reuse: bool = True,
+                       path: Path | None = None) -> None:
+        """Args:
+            capacity (int): The number of placements kept. The least
+                recently used one is evicted when it is exceeded.
+            battery_step (float): The quantization step of the battery
+                levels and energy coefficients (Wh), and of the RAM
+                capacities (Gb).
+            cpu_step (float): The quantization step of the CPU
+                utilization coefficients.
+            reuse (bool): If True, a feasible cached placement is
+                deployed without solving the time slot. Otherwise, it
+                is only used as a MIP start.
+            path (Path | None): The .npz file the cache is loaded from,
+                if it exists, and saved to by save.
+        """
+        self.capacity: int = capacity
+        self.battery_step: float = battery_step
+        self.cpu_step: float = cpu_step
+        self.reuse: bool = reuse
+        self.path: Path | None = path
+        self.placements: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        if (path is not None and path.exists()):
+            self.load(path)
+
+    def load(self, path: Path) -> None:
+        """Add the placements saved in a .npz file to the cache."""
+        with np.load(path) as archive:
+            for key in archive.files:
+                self.placements[key] = archive[key]
+        while (len(self.placements) > self.capacity):
+            self.placements.popitem(last=False)
+
+    def _quantize(self, values: np.ndarray, step: float) -> np.ndarray:
+        """Returns:
+            np.ndarray: values rounded to multiples of step.
+        """
+        return np.round(values / step).astype(np.int64)
+
+    def fingerprint(self, problem: PlacementProblem) -> tuple[str, np.ndarray]:
+        """Returns:
+            tuple[str, np.ndarray]: The key of the time slot and the
+            order of its UAVs in the canonical (sorted) layout.
+        """
+        features: np.ndarray = np.hstack([
+            self._quantize(problem.batt_lvl[:, None], self.battery_step),
+            self._quantize(problem.ram_cap[:, None], self.battery_step),
+            self._quantize(problem.energy_constant[:, None], self.battery_step),
+            self._quantize(problem.energy_coeffs, self.battery_step),
+            self._quantize(problem.cpu_coeffs, self.cpu_step)])
+        order: np.ndarray = np.lexsort(features.T[::-1])
+        digest = hashlib.sha1()
+        for array in (np.array(problem.shape), problem.instance_service, problem.ram_req,
+                      problem.get_replicas(), features[order]):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest(), order
+
+    def get(self, problem: PlacementProblem) -> np.ndarray | None:
+        """Returns:
+            np.ndarray | None: The cached placement (UAV × instance) of
+            a time slot with the same fingerprint as problem, with its
+            UAVs in the order of problem, or None.
+        """
+        key, order = self.fingerprint(problem)
+        if (key not in self.placements):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.placements.move_to_end(key)
+        placement: np.ndarray = np.empty(problem.shape)
+        placement[order] = self.placements[key]
+        return placement
+
+    def put(self, problem: PlacementProblem, placement: np.ndarray) -> None:
+        """Cache the placement (UAV × instance) of problem."""
+        key, order = self.fingerprint(problem)
+        self.placements[key] = placement[order]
+        self.placements.move_to_end(key)
+        while (len(self.placements) > self.capacity):
+            self.placements.popitem(last=False)
+
+    def save(self) -> None:
+        """Write the cache to its path, if it has one."""
+        if (self.path is not None):
+            np.savez_compressed(self.path, **self.placements)
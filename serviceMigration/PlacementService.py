@@ -0,0 +1,235 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+import gurobipy as gp
+import numpy as np
+from ServiceMigrator import ServiceMigrator
+from SolverBackend import close_cluster_pool
+
+
+class PlacementService():
+    """Long-running placement service for a fleet. The ServiceMigrator
+    (with its incremental model) is built once and kept in memory, and
+    every message of the fleet is the observation of a time slot: the
+    request counts of every UAV for every service and, optionally, the
+    measured battery levels. The reply is the placement of the time
+    slot and the replicas to deploy and remove with respect to the
+    previous one.
+
+    The messages are JSON lines, read from stdin (serve_stdio) or from
+    the clients of a local socket (serve_socket). A message has the
+    keys:
+        requests: The requests of the time slot, a UAV × service list
+            of lists in the order of the scenario.
+        batt_lvl: The battery level of every UAV (Wh). If missing, the
+            levels predicted from the previous placement are used.
+        slot: An optional id, echoed in the reply.
+    A message {"command": "state"} returns the battery levels and the
+    current placement instead, and {"command": "shutdown"} stops the
+    service.
+
+    The reply has the keys slot, status (the solve_path of the
+    ServiceMigrator, or "infeasible" if there is no placement, in
+    which case the previous placement stays deployed and only slot,
+    status and latency are returned), z, placement
+    ({uav_id: [instance_id, ...]}), deploy and remove ([[uav_id,
+    service_id], ...], one entry per replica), migrations, battery (the
+    levels predicted for the end of the time slot) and latency (s).
+    Malformed messages get {"error": ...}.
+    """
+
+    def __init__(self, scenario: Path,
+                       n_uavs: int | None = None,
+                       env: gp.Env | None = None,
+                       migrator_options: dict[str, Any] | None = None) -> None:
+        """Args:
+            scenario (Path): The input_file of the fleet and services.
+            n_uavs (int | None): The number of UAVs. All the UAVs of
+                the file if None.
+            env (gp.Env | None): The Gurobi environment.
+            migrator_options (dict[str, Any] | None): Keyword arguments
+                of the ServiceMigrator, on top of an incremental model
+                built with the matrix API.
+        """
+        fleet, catalog, requests, time_slot_interval, n_requests = ServiceMigrator.read_scenario(
+            scenario, n_uavs, rng=np.random.default_rng(0))
+        self.migrator: ServiceMigrator = ServiceMigrator(uavs=fleet,
+                                                         services=catalog,
+                                                         requests=np.zeros_like(requests),
+                                                         time_slot_interval=time_slot_interval,
+                                                         n_requests=n_requests,
+                                                         env=env,
+                                                         **{"builder": "matrix", "incremental": True,
+                                                            **(migrator_options or {})})
+        self.deployed: bool = False
+        self.running: bool = True
+
+    def handle(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Returns:
+            dict[str, Any]: The reply to a message of the fleet.
+        """
+        command: str = message.get("command", "slot")
+        if (command == "shutdown"):
+            self.running = False
+            return {"command": "shutdown"}
+        if (command == "state"):
+            return self._get_state()
+        if (command != "slot"):
+            return {"error": f"Unknown command: {command}"}
+        try:
+            requests: np.ndarray = np.array(message["requests"], dtype=float)
+            batt_lvl: np.ndarray | None = None
+            if (message.get("batt_lvl") is not None):
+                batt_lvl = np.array(message["batt_lvl"], dtype=float)
+            return self.place(requests, batt_lvl, message.get("slot"))
+        except (KeyError, ValueError, TypeError) as error:
+            return {"error": f"{type(error).__name__}: {error}"}
+
+    def place(self, requests: np.ndarray, batt_lvl: np.ndarray | None = None, slot: Any = None) -> dict[str, Any]:
+        """Solve a time slot with the observed requests and battery
+        levels.
+
+        Args:
+            requests (np.ndarray): The requests (UAV × service).
+            batt_lvl (np.ndarray | None): The measured battery levels.
+            slot (Any): The id of the time slot, echoed in the reply.
+
+        Returns:
+            dict[str, Any]: The reply of the time slot.
+        """
+        start: float = time.perf_counter()
+        migrator: ServiceMigrator = self.migrator
+        if (self.deployed):
+            # Advance from the deployed placement, so that the
+            # migrations are counted against it.
+            migrator.step(requests, batt_lvl)
+        else:
+            migrator.observe(requests, batt_lvl)
+        migrator.setup_model()
+        migrator.solve()
+        if (migrator.placement is None):
+            # The previous placement stays deployed through this time
+            # slot, so the next step advances the batteries with it.
+            if (self.deployed):
+                migrator._set_placement(migrator.last_placement_matrix)
+            return {"slot": slot, "status": "infeasible", "latency": time.perf_counter() - start}
+        self.deployed = True
+        deploy, remove = self._get_moves(migrator.last_placement_matrix, migrator.placement_matrix)
+        return {"slot": slot,
+                "status": migrator.solve_path,
+                "z": migrator.objective,
+                "placement": self._get_placement(migrator.placement_matrix),
+                "deploy": deploy,
+                "remove": remove,
+                "migrations": len(deploy),
+                "battery": migrator.get_slot_metrics()["battery"].tolist(),
+                "latency": time.perf_counter() - start}
+
+    def _get_placement(self, placement: np.ndarray) -> dict[str, list[str]]:
+        """Returns:
+            dict[str, list[str]]: The instances hosted by every UAV.
+        """
+        instance_ids: list[str] = self.migrator.instance_ids
+        return {str(uav): [instance_ids[j] for j in np.flatnonzero(row > 0.5)]
+                for uav, row in zip(self.migrator.uav_ids, placement)}
+
+    def _get_moves(self, previous: np.ndarray | None, placement: np.ndarray) -> tuple[list[list], list[list]]:
+        """Returns:
+            tuple[list[list], list[list]]: The [uav_id, service_id] of
+            every replica to deploy and to remove to go from the
+            previous placement (none if None) to placement. Replicas
+            are counted per service, as in the migrations of the
+            ServiceMigrator.
+        """
+        migrator: ServiceMigrator = self.migrator
+        change: np.ndarray = np.zeros((len(migrator.uav_ids), len(migrator.catalog)))
+        np.add.at(change.T, migrator.instance_service, np.round(placement).T)
+        if (previous is not None):
+            np.subtract.at(change.T, migrator.instance_service, np.round(previous).T)
+        moves: tuple[list[list], list[list]] = ([], [])
+        for i, s in zip(*np.nonzero(change)):
+            entry: list = [migrator.uav_ids[i], migrator.catalog.service_ids[s]]
+            moves[0 if change[i, s] > 0 else 1].extend([entry] * int(abs(change[i, s])))
+        return moves
+
+    def _get_state(self) -> dict[str, Any]:
+        """Returns:
+            dict[str, Any]: The battery levels the next time slot
+            starts from and the deployed placement, if any.
+        """
+        migrator: ServiceMigrator = self.migrator
+        battery: np.ndarray = migrator.get_slot_metrics()["battery"] if self.deployed else migrator.fleet.batt_lvl
+        return {"uav_ids": migrator.uav_ids,
+                "service_ids": migrator.catalog.service_ids,
+                "batt_lvl": battery.tolist(),
+                "placement": self._get_placement(migrator.placement_matrix) if self.deployed else None}
+
+    def handle_line(self, line: str) -> str:
+        """Returns:
+            str: The JSON reply to a JSON line.
+        """
+        reply: dict[str, Any]
+        try:
+            reply = self.handle(json.loads(line))
+        except json.JSONDecodeError as error:
+            reply = {"error": f"JSONDecodeError: {error}"}
+        return json.dumps(reply)
+
+    def serve_stdio(self) -> None:
+        """Answer the JSON lines of stdin on stdout until it is closed
+        or a shutdown command arrives.
+        """
+        for line in sys.stdin:
+            if (not line.strip()):
+                continue
+            sys.stdout.write(self.handle_line(line) + "\n")
+            sys.stdout.flush()
+            if (not self.running):
+                break
+
+    async def serve_socket(self, path: Path | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Answer the JSON lines of the clients of a Unix socket at
+        path or, if it is None, of a TCP socket at host and port, until
+        a shutdown command arrives. The time slots of all the clients
+        are solved one at a time, since they share the fleet.
+        """
+        lock: asyncio.Lock = asyncio.Lock()
+        stopped: asyncio.Event = asyncio.Event()
+
+        async def serve_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                while (not reader.at_eof()):
+                    line: bytes = await reader.readline()
+                    if (not line.strip()):
+                        continue
+                    async with lock:
+                        reply: str = self.handle_line(line.decode())
+                    if (not self.running):
+                        stopped.set()
+                    writer.write(reply.encode() + b"\n")
+                    await writer.drain()
+                    if (not self.running):
+                        break
+            except ConnectionError:
+                pass
+            writer.close()
+
+        server: asyncio.AbstractServer
+        if (path is not None):
+            server = await asyncio.start_unix_server(serve_client, path=str(path))
+        else:
+            server = await asyncio.start_server(serve_client, host=host, port=port)
+        address: Any = path or server.sockets[0].getsockname()[:2]
+        print(f"Listening on {address}", file=sys.stderr, flush=True)
+        async with server:
+            await stopped.wait()
+
+    def dispose(self) -> None:
+        """Free the resources of the model and stop the worker processes
+        of the decomposition backend, if any.
+        """
+        self.migrator.dispose()
+        close_cluster_pool()
@@ -1,4 +1,6 @@
 import gurobipy as gp
+import numpy as np
+from Scenario import Fleet, ServiceCatalog
 
 class PowerConsumptionModel(object):
     """Calulates the instataneous power consumption of a Raspberry Pi 4.
@@ -216,4 +218,181 @@ class PowerConsumptionModel(object):
                                      PowerConsumptionModel.p_eth_idle() +\
                                      PowerConsumptionModel.p_wifi_idle() +\
                                      PowerConsumptionModel.p_wifi_down(downlink_data_rate=downlink_data_rate) +\
-                                     PowerConsumptionModel.p_wifi_up(uplink_data_rate=uplink_data_rate))
\ No newline at end of file
+                                     PowerConsumptionModel.p_wifi_up(uplink_data_rate=uplink_data_rate))
+
+    @staticmethod
+    def get_instance_coefficients(fleet: Fleet,
+                                  catalog: ServiceCatalog,
+                                  requests: np.ndarray,
+                                  time_slot_interval: float
+                                  ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculates the coefficients of the CPU utilization and of the
+        energy consumption of every UAV for hosting each instance. The
+        energy consumption is linear in the placement: the energy
+        consumed without hosting any instance plus the coefficients of
+        the instances hosted.
+
+        Args:
+            fleet (Fleet): The UAVs.
+            catalog (ServiceCatalog): The services.
+            requests (np.ndarray): The number of requests of each UAV
+                (rows) for each service (columns).
+            time_slot_interval (float): The duration of a time slot
+                expressed in hours.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The CPU
+            utilization coefficients (UAV × instance), the energy
+            consumption coefficients (UAV × instance) and the energy
+            consumed by each UAV if it hosts no instance.
+        """
+        instance_requests: np.ndarray = requests[:, catalog.instance_service]
+        serv_data_rates: np.ndarray = requests * catalog.input_size
+        cpu_coeffs: np.ndarray = (catalog.get_instance_values("cpu_cycles_per_deploy") +\
+                                  catalog.get_instance_values("cpu_cycles_per_request") * instance_requests) / fleet.cpu_freq[:, None]
+        idle_energy: float = PowerConsumptionModel.get_energy_consumption(
+            cpu_utilization=0.0,
+            uplink_data_rate=0.0,
+            downlink_data_rate=0.0,
+            time_slot_interval=time_slot_interval)
+        energy_coeffs: np.ndarray = PowerConsumptionModel.get_energy_consumption(
+            cpu_utilization=cpu_coeffs,
+            uplink_data_rate=-serv_data_rates[:, catalog.instance_service],
+            downlink_data_rate=0.0,
+            time_slot_interval=time_slot_interval) - idle_energy
+        data_rate: np.ndarray = serv_data_rates.sum(axis=1)
+        energy_constant: np.ndarray = PowerConsumptionModel.get_energy_consumption(
+            cpu_utilization=0.0,
+            uplink_data_rate=data_rate,
+            downlink_data_rate=data_rate,
+            time_slot_interval=time_slot_interval)
+        return cpu_coeffs, energy_coeffs, energy_constant
+
+    @staticmethod
+    def get_hosted_services(catalog: ServiceCatalog, placements: np.ndarray) -> np.ndarray:
+        """Counts the instances of each service hosted by each UAV.
+
+        Args:
+            catalog (ServiceCatalog): The services.
+            placements (np.ndarray): The placements (... × UAV ×
+                instance), 0 or 1.
+
+        Returns:
+            np.ndarray: The instances of each service hosted by each UAV
+            (... × UAV × service).
+        """
+        instance_services: np.ndarray = np.zeros((len(catalog.instance_service), len(catalog)))
+        instance_services[np.arange(len(catalog.instance_service)), catalog.instance_service] = 1.0
+        return placements @ instance_services
+
+    @staticmethod
+    def get_cpu_utilizations(fleet: Fleet,
+                             catalog: ServiceCatalog,
+                             requests: np.ndarray,
+                             placements: np.ndarray
+                             ) -> np.ndarray:
+        """Calculates the cpu utilization of every UAV for a batch of
+        placements, as get_cpu_utilization does for the variables of a
+        UAV.
+
+        Args:
+            fleet (Fleet): The UAVs.
+            catalog (ServiceCatalog): The services.
+            requests (np.ndarray): The number of requests of each UAV
+                (rows) for each service (columns).
+            placements (np.ndarray): The placements (... × UAV ×
+                instance), 0 or 1. The leading dimensions, if any, index
+                the candidates.
+
+        Returns:
+            np.ndarray: The cpu utilization of every UAV (... × UAV).
+        """
+        cycles: np.ndarray = catalog.get_instance_values("cpu_cycles_per_deploy") +\
+                             catalog.get_instance_values("cpu_cycles_per_request") * requests[:, catalog.instance_service]
+        return np.einsum("...ui,ui->...u", placements, cycles) / fleet.cpu_freq
+
+    @staticmethod
+    def get_downlink_data_rates(catalog: ServiceCatalog,
+                                requests: np.ndarray,
+                                placements: np.ndarray
+                                ) -> np.ndarray:
+        """Calculates the downlink data rate of every UAV for a batch of
+        placements, as get_downlink_data_rate does for the variables of
+        a UAV. It does not depend on the placement: every request is
+        received by the UAV it is made to.
+
+        Args:
+            catalog (ServiceCatalog): The services.
+            requests (np.ndarray): The number of requests of each UAV
+                (rows) for each service (columns).
+            placements (np.ndarray): The placements (... × UAV ×
+                instance).
+
+        Returns:
+            np.ndarray: The downlink data rate of every UAV (... × UAV).
+        """
+        return np.zeros(placements.shape[:-1]) + (requests * catalog.input_size).sum(axis=1)
+
+    @staticmethod
+    def get_uplink_data_rates(catalog: ServiceCatalog,
+                              requests: np.ndarray,
+                              placements: np.ndarray
+                              ) -> np.ndarray:
+        """Calculates the uplink data rate of every UAV for a batch of
+        placements, as get_uplink_data_rate does for the variables of a
+        UAV: the requests for the services the UAV does not host are
+        forwarded.
+
+        Args:
+            catalog (ServiceCatalog): The services.
+            requests (np.ndarray): The number of requests of each UAV
+                (rows) for each service (columns).
+            placements (np.ndarray): The placements (... × UAV ×
+                instance), 0 or 1.
+
+        Returns:
+            np.ndarray: The uplink data rate of every UAV (... × UAV).
+        """
+        hosted: np.ndarray = PowerConsumptionModel.get_hosted_services(catalog, placements)
+        return ((1.0 - hosted) * (requests * catalog.input_size)).sum(axis=-1)
+
+    @staticmethod
+    def evaluate_placements(fleet: Fleet,
+                            catalog: ServiceCatalog,
+                            requests: np.ndarray,
+                            placements: np.ndarray,
+                            time_slot_interval: float
+                            ) -> dict[str, np.ndarray]:
+        """Evaluates a batch of placements without building a model, e.g.
+        to score candidate migrations.
+
+        Args:
+            fleet (Fleet): The UAVs.
+            catalog (ServiceCatalog): The services.
+            requests (np.ndarray): The number of requests of each UAV
+                (rows) for each service (columns).
+            placements (np.ndarray): The placements (K × UAV ×
+                instance, or UAV × instance for a single one), 0 or 1.
+            time_slot_interval (float): The duration of a time slot
+                expressed in hours.
+
+        Returns:
+            dict[str, np.ndarray]: For every placement and UAV (K × UAV,
+            or UAV), its cpu_utilization (0-1), uplink_data_rate and
+            downlink_data_rate (Mbps), step_consumption and battery at
+            the end of the time slot (Wh) and ram_usage (Gb).
+        """
+        cpu_utilization: np.ndarray = PowerConsumptionModel.get_cpu_utilizations(fleet, catalog, requests, placements)
+        uplink_data_rate: np.ndarray = PowerConsumptionModel.get_uplink_data_rates(catalog, requests, placements)
+        downlink_data_rate: np.ndarray = PowerConsumptionModel.get_downlink_data_rates(catalog, requests, placements)
+        step_consumption: np.ndarray = PowerConsumptionModel.get_energy_consumption(
+            cpu_utilization=cpu_utilization,
+            uplink_data_rate=uplink_data_rate,
+            downlink_data_rate=downlink_data_rate,
+            time_slot_interval=time_slot_interval)
+        return {"cpu_utilization": cpu_utilization,
+                "uplink_data_rate": uplink_data_rate,
+                "downlink_data_rate": downlink_data_rate,
+                "step_consumption": step_consumption,
+                "battery": fleet.batt_lvl - step_consumption,
+                "ram_usage": placements @ catalog.get_instance_values("ram_req")}
@@ -1,8 +1,13 @@
 import random
+import numpy as np
 random.seed(20)
 
 class RequestGenerator():
 
+    # The generator of the requests of a ServiceMigrator without its own,
+    # seeded like the module-level random state.
+    default_rng: np.random.Generator = np.random.default_rng(20)
+
     @staticmethod
     def generate_requests(uavs: dict[str, dict[str, float]],
                           services: dict[str, dict[str, dict[str, float|int]]],
@@ -28,4 +33,88 @@ class RequestGenerator():
             uav = random.choice(list(uavs.keys()))
             serv = random.choice(list(services.keys()))
             requests[uav, serv] += 1
-        return requests
\ No newline at end of file
+        return requests
+
+    @staticmethod
+    def generate_request_matrix(n_uavs: int,
+                                n_services: int,
+                                n_requests: int,
+                                rng: np.random.Generator,
+                                uav_weights: np.ndarray | None = None,
+                                service_weights: np.ndarray | None = None
+                                ) -> np.ndarray:
+        """Draw the number of requests of every uav-service combination
+        of a time slot with a single multinomial sample.
+
+        Args:
+            n_uavs (int): The number of UAVs.
+            n_services (int): The number of services.
+            n_requests (int): The number of requests to generate.
+            rng (np.random.Generator): The random number generator.
+            uav_weights (np.ndarray | None): The relative share of the
+                requests that each UAV receives. Uniform if None.
+            service_weights (np.ndarray | None): The relative
+                popularity of each service. Uniform if None.
+
+        Returns:
+            np.ndarray: The number of requests of each UAV (rows) for
+            each service (columns).
+        """
+        uav_p: np.ndarray = RequestGenerator._normalize(uav_weights, n_uavs)
+        service_p: np.ndarray = RequestGenerator._normalize(service_weights, n_services)
+        counts: np.ndarray = rng.multinomial(n_requests, np.outer(uav_p, service_p).ravel())
+        return counts.reshape(n_uavs, n_services)
+
+    @staticmethod
+    def zipf_popularity(n_services: int, exponent: float = 1.0) -> np.ndarray:
+        """Returns the popularity of the services following a Zipf law,
+        the first service being the most popular one.
+
+        Args:
+            n_services (int): The number of services.
+            exponent (float): The exponent of the Zipf law. 0 means
+                uniform popularity.
+
+        Returns:
+            np.ndarray: The popularity of each service (sums 1).
+        """
+        weights: np.ndarray = 1.0 / np.arange(1, n_services + 1) ** exponent
+        return weights / weights.sum()
+
+    @staticmethod
+    def hotspot_weights(n_uavs: int,
+                        n_hotspots: int,
+                        hotspot_share: float,
+                        rng: np.random.Generator) -> np.ndarray:
+        """Returns the share of the requests of each UAV when
+        hotspot_share of them concentrate on n_hotspots random UAVs and
+        the rest are spread uniformly over the whole fleet.
+
+        Args:
+            n_uavs (int): The number of UAVs.
+            n_hotspots (int): The number of UAVs that are hotspots.
+            hotspot_share (float): The share of the requests that go to
+                the hotspots, in [0, 1].
+            rng (np.random.Generator): The random number generator used
+                to choose the hotspots.
+
+        Returns:
+            np.ndarray: The share of the requests of each UAV (sums 1).
+        """
+        weights: np.ndarray = np.full(n_uavs, (1.0 - hotspot_share) / n_uavs)
+        hotspots: np.ndarray = rng.choice(n_uavs, size=n_hotspots, replace=False)
+        weights[hotspots] += hotspot_share / n_hotspots
+        return weights
+
+    @staticmethod
+    def _normalize(weights: np.ndarray | None, size: int) -> np.ndarray:
+        """Returns:
+            np.ndarray: weights scaled to sum 1, or uniform
+            probabilities if weights is None.
+        """
+        if (weights is None):
+            return np.full(size, 1.0 / size)
+        weights = np.asarray(weights, dtype=float)
+        if (weights.shape != (size,) or (weights < 0).any() or weights.sum() <= 0):
+            raise ValueError(f"Expected {size} non-negative weights with a positive sum")
+        return weights / weights.sum()
@@ -0,0 +1,192 @@
+from abc import ABC, abstractmethod
+import zipfile
+from pathlib import Path
+from typing import Any
+import numpy as np
+import pandas as pd
+
+
+class ResultWriter(ABC):
+    """Streams the metrics of every UAV and time slot to a file, with
+    the columns of output/Scenario_36.csv. The time slots are kept in
+    memory until batch_slots of them accumulate and are then appended to
+    the file, so memory does not grow with the length of the run and
+    a crash only loses the last batch.
+    """
+
+    metric_columns: list[str] = ["cpu_utilization", "uplink_data_rate", "downlink_data_rate",
+                                 "battery", "step_consumption", "ram_usage"]
+
+    def __init__(self, output_path: Path, batch_slots: int = 50) -> None:
+        """Args:
+            output_path (Path): The file the results are written to. It
+                is overwritten.
+            batch_slots (int): The number of time slots written at once.
+        """
+        self.output_path: Path = output_path
+        self.batch_slots: int = batch_slots
+        self.n_batches: int = 0
+        self.steps: list[int] = []
+        self.uav_ids: list[list] = []
+        self.metrics: list[dict[str, np.ndarray]] = []
+        if (output_path.exists()):
+            output_path.unlink()
+
+    @staticmethod
+    def get_columns(n_services: int) -> list[str]:
+        """Returns:
+            list[str]: The columns of the results, as in
+            output/Scenario_36.csv.
+        """
+        return ["uav", "step"] + [f"service_{i}" for i in range(n_services)] + ResultWriter.metric_columns
+
+    def write_slot(self, step: int, uav_ids: list, metrics: dict[str, np.ndarray]) -> None:
+        """Add the metrics of a time slot, as returned by
+        ServiceMigrator.get_slot_metrics.
+
+        Args:
+            step (int): The index of the time slot.
+            uav_ids (list): The UAVs, in the order of the metrics.
+            metrics (dict[str, np.ndarray]): The metrics of the time
+                slot.
+        """
+        self.steps.append(step)
+        self.uav_ids.append(uav_ids)
+        self.metrics.append(metrics)
+        if (len(self.steps) >= self.batch_slots):
+            self.flush()
+
+    def _get_batch(self) -> dict[str, np.ndarray]:
+        """Returns:
+            dict[str, np.ndarray]: The columns of the buffered time
+            slots, one row per UAV and time slot. CPU utilization is
+            expressed as a percentage, as in print_solution.
+        """
+        batch: dict[str, np.ndarray] = {
+            "uav": np.concatenate([np.asarray(uav_ids) for uav_ids in self.uav_ids]),
+            "step": np.concatenate([np.full(len(uav_ids), step) for step, uav_ids in zip(self.steps, self.uav_ids)])}
+        services: np.ndarray = np.concatenate([metrics["services_deployed"] for metrics in self.metrics])
+        for i in range(services.shape[1]):
+            batch[f"service_{i}"] = services[:, i]
+        for column in ResultWriter.metric_columns:
+            batch[column] = np.concatenate([metrics[column] for metrics in self.metrics])
+        batch["cpu_utilization"] = batch["cpu_utilization"] * 100
+        return batch
+
+    def flush(self) -> None:
+        """Append the buffered time slots to the file."""
+        if (not self.steps):
+            return
+        self._write_batch(self._get_batch())
+        self.n_batches += 1
+        self.steps = []
+        self.uav_ids = []
+        self.metrics = []
+
+    @abstractmethod
+    def _write_batch(self, batch: dict[str, np.ndarray]) -> None:
+        """Append a batch of rows to the file."""
+
+    def close(self) -> None:
+        """Write the remaining time slots and close the file."""
+        self.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def read(path: Path) -> pd.DataFrame:
+        """Read the results written by any ResultWriter (or by
+        ServiceMigrator.output_to_csv).
+
+        Args:
+            path (Path): The .csv, .npz or .parquet file.
+
+        Returns:
+            pd.DataFrame: The results, one row per UAV and time slot.
+        """
+        if (path.suffix == ".npz"):
+            return NpzResultWriter.read_npz(path)
+        if (path.suffix == ".parquet"):
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+
+class CsvResultWriter(ResultWriter):
+    """Appends the batches as rows of a CSV file."""
+
+    def _write_batch(self, batch: dict[str, np.ndarray]) -> None:
+        pd.DataFrame(batch).to_csv(self.output_path, mode="a", header=self.n_batches == 0, index=False)
+
+
+class NpzResultWriter(ResultWriter):
+    """Appends every batch as a set of .npy arrays (one per column,
+    named "<column>/<batch>") to an uncompressed .npz archive. Use
+    ResultWriter.read to load the whole file as a DataFrame.
+    """
+
+    def _write_batch(self, batch: dict[str, np.ndarray]) -> None:
+        with zipfile.ZipFile(self.output_path, mode="a") as archive:
+            for column, values in batch.items():
+                with archive.open(f"{column}/{self.n_batches:06d}.npy", mode="w", force_zip64=True) as file:
+                    np.lib.format.write_array(file, values, allow_pickle=False)
+
+    @staticmethod
+    def read_npz(path: Path) -> pd.DataFrame:
+        """Returns:
+            pd.DataFrame: The batches of the file concatenated.
+        """
+        columns: dict[str, list[np.ndarray]] = {}
+        with np.load(path) as archive:
+            for name in sorted(archive.files):
+                column, _ = name.split("/")
+                columns.setdefault(column, []).append(archive[name])
+        n_services: int = sum(column.startswith("service_") for column in columns.keys())
+        return pd.DataFrame({column: np.concatenate(columns[column])
+                             for column in ResultWriter.get_columns(n_services) if column in columns})
+
+
+class ParquetResultWriter(ResultWriter):
+    """Writes every batch as a row group of a Parquet file. Requires
+    pyarrow.
+    """
+
+    def __init__(self, output_path: Path, batch_slots: int = 50) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("ParquetResultWriter requires pyarrow: pip install pyarrow") from error
+        super().__init__(output_path, batch_slots)
+        self.pa: Any = pyarrow
+        self.writer: Any = None
+
+    def _write_batch(self, batch: dict[str, np.ndarray]) -> None:
+        table: Any = self.pa.table(batch)
+        if (self.writer is None):
+            self.writer = self.pa.parquet.ParquetWriter(self.output_path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        super().close()
+        if (self.writer is not None):
+            self.writer.close()
+            self.writer = None
+
+
+WRITERS: dict[str, type[ResultWriter]] = {".csv": CsvResultWriter,
+                                          ".npz": NpzResultWriter,
+                                          ".parquet": ParquetResultWriter}
+
+
+def get_result_writer(output_path: Path, batch_slots: int = 50) -> ResultWriter:
+    """Returns:
+        ResultWriter: The writer of the format of output_path, chosen
+        by its suffix (.csv, .npz or .parquet).
+    """
+    if (output_path.suffix not in WRITERS):
+        raise ValueError(f"Unknown result format: {output_path.suffix}")
+    return WRITERS[output_path.suffix](output_path, batch_slots)
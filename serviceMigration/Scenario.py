@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field, replace
+from typing import Any, ClassVar
+import numpy as np
+
+
+@dataclass
+class Fleet():
+    """The UAVs of a scenario as NumPy columns, one row per UAV, in the
+    order of uav_ids.
+    """
+
+    uav_ids: list
+    batt_lvl: np.ndarray
+    ram_cap: np.ndarray
+    cpu_freq: np.ndarray
+
+    columns: ClassVar[tuple[str, ...]] = ("batt_lvl", "ram_cap", "cpu_freq")
+
+    def __len__(self) -> int:
+        return len(self.uav_ids)
+
+    def copy(self) -> "Fleet":
+        """Returns:
+            Fleet: A fleet with its own battery levels, the only column
+            that changes during a run.
+        """
+        return replace(self, uav_ids=list(self.uav_ids), batt_lvl=self.batt_lvl.copy())
+
+    @staticmethod
+    def from_json(uavs: list[dict[str, dict[str, float]]], n_uavs: int | None = None) -> "Fleet":
+        """Read the "uavs" array of an input_file.
+
+        Args:
+            uavs (list[dict[str, dict[str, float]]]): The UAVs of the
+                file, each one a single {uav_id: values} entry.
+            n_uavs (int | None): The number of UAVs of the fleet. If it
+                exceeds the UAVs of the file, they are repeated in
+                order. All of them if None.
+
+        Returns:
+            Fleet: The fleet, with the UAVs numbered from 0 as in
+            read_input.
+        """
+        n_uavs = len(uavs) if n_uavs is None else n_uavs
+        values: list[dict[str, float]] = [next(iter(uavs[i % len(uavs)].values())) for i in range(n_uavs)]
+        return Fleet(uav_ids=list(range(n_uavs)),
+                     batt_lvl=np.array([uav["batt_lvl"] for uav in values], dtype=float),
+                     ram_cap=np.array([uav["ram_cap"] for uav in values], dtype=float),
+                     cpu_freq=np.array([uav["cpu_freq"] for uav in values], dtype=float))
+
+    @staticmethod
+    def from_arrays(arrays: Any, n_uavs: int | None = None) -> "Fleet":
+        """Read the columns written by to_arrays.
+
+        Args:
+            arrays (Any): The arrays, e.g. an open np.load archive.
+            n_uavs (int | None): The number of UAVs of the fleet,
+                repeating the stored UAVs in order if there are fewer.
+                All of them if None.
+
+        Returns:
+            Fleet: The fleet, with the UAVs numbered from 0.
+        """
+        columns: dict[str, np.ndarray] = {column: arrays[f"uav_{column}"] for column in Fleet.columns}
+        n_uavs = len(columns["batt_lvl"]) if n_uavs is None else n_uavs
+        return Fleet(uav_ids=list(range(n_uavs)),
+                     **{column: np.resize(values.astype(float), n_uavs) for column, values in columns.items()})
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Returns:
+            dict[str, np.ndarray]: The columns of the fleet, prefixed
+            with "uav_".
+        """
+        return {f"uav_{column}": getattr(self, column) for column in Fleet.columns}
+
+    @staticmethod
+    def from_dicts(uavs: dict[Any, dict[str, float]]) -> "Fleet":
+        """Returns:
+            Fleet: The fleet of the uavs dict of read_input.
+        """
+        return Fleet(uav_ids=list(uavs.keys()),
+                     batt_lvl=np.array([uav["batt_lvl"] for uav in uavs.values()], dtype=float),
+                     ram_cap=np.array([uav["ram_cap"] for uav in uavs.values()], dtype=float),
+                     cpu_freq=np.array([uav["cpu_freq"] for uav in uavs.values()], dtype=float))
+
+    def to_dicts(self) -> dict[Any, dict[str, float]]:
+        """Returns:
+            dict[Any, dict[str, float]]: The fleet as the uavs dict of
+            read_input.
+        """
+        return {uav: {"batt_lvl": batt_lvl, "ram_cap": ram_cap, "cpu_freq": cpu_freq}
+                for uav, batt_lvl, ram_cap, cpu_freq in zip(self.uav_ids,
+                                                            self.batt_lvl.tolist(),
+                                                            self.ram_cap.tolist(),
+                                                            self.cpu_freq.tolist())}
+
+
+@dataclass
+class ServiceCatalog():
+    """The services of a scenario as NumPy columns, one row per
+    service. The replicas of a service share its values, so they are
+    stored once; instance_service maps each instance (replica) to its
+    service, in the order of instance_ids.
+    """
+
+    service_ids: list[str]
+    replicas: np.ndarray
+    cpu_cycles_per_deploy: np.ndarray
+    cpu_cycles_per_request: np.ndarray
+    ram_req: np.ndarray
+    input_size: np.ndarray
+    instance_service: np.ndarray = field(init=False)
+    instance_ids: list[str] = field(init=False)
+
+    columns: ClassVar[tuple[str, ...]] = ("replicas", "cpu_cycles_per_deploy", "cpu_cycles_per_request", "ram_req", "input_size")
+
+    def __post_init__(self) -> None:
+        self.instance_service = np.repeat(np.arange(len(self.service_ids)), self.replicas)
+        self.instance_ids = [f"{serv}_{replica}" for serv, replicas in zip(self.service_ids, self.replicas.tolist())
+                             for replica in range(replicas)]
+
+    def __len__(self) -> int:
+        return len(self.service_ids)
+
+    def get_instance_values(self, name: str) -> np.ndarray:
+        """Returns:
+            np.ndarray: The column name of the service of each
+            instance.
+        """
+        return getattr(self, name)[self.instance_service]
+
+    @staticmethod
+    def from_json(services: list[dict[str, dict[str, float]]]) -> "ServiceCatalog":
+        """Returns:
+            ServiceCatalog: The services of the "services" array of an
+            input_file, each one a single {service_id: values} entry.
+        """
+        service_ids: list[str] = [next(iter(serv.keys())) for serv in services]
+        values: list[dict[str, float]] = [next(iter(serv.values())) for serv in services]
+        return ServiceCatalog(service_ids=service_ids,
+                              replicas=np.array([serv["replicas"] for serv in values], dtype=int),
+                              cpu_cycles_per_deploy=np.array([serv["cpu_cycles_per_deploy"] for serv in values], dtype=float),
+                              cpu_cycles_per_request=np.array([serv["cpu_cycles_per_request"] for serv in values], dtype=float),
+                              ram_req=np.array([serv["ram_req"] for serv in values], dtype=float),
+                              input_size=np.array([serv["input_size"] for serv in values], dtype=float))
+
+    @staticmethod
+    def from_arrays(arrays: Any) -> "ServiceCatalog":
+        """Returns:
+            ServiceCatalog: The catalog of the columns written by
+            to_arrays, e.g. from an open np.load archive.
+        """
+        return ServiceCatalog(service_ids=arrays["service_ids"].tolist(),
+                              **{column: arrays[f"service_{column}"] for column in ServiceCatalog.columns})
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Returns:
+            dict[str, np.ndarray]: The ids and the columns of the
+            catalog, prefixed with "service_".
+        """
+        return {"service_ids": np.array(self.service_ids, dtype=str),
+                **{f"service_{column}": getattr(self, column) for column in ServiceCatalog.columns}}
+
+    @staticmethod
+    def from_dicts(services: dict[str, dict[str, dict[str, float]]]) -> "ServiceCatalog":
+        """Returns:
+            ServiceCatalog: The catalog of the services dict of
+            read_input, taking the values of the first replica of each
+            service.
+        """
+        first_instances: list[dict[str, float]] = [next(iter(instances.values())) for instances in services.values()]
+        return ServiceCatalog(service_ids=list(services.keys()),
+                              replicas=np.array([len(instances) for instances in services.values()], dtype=int),
+                              cpu_cycles_per_deploy=np.array([serv["cpu_cycles_per_deploy"] for serv in first_instances], dtype=float),
+                              cpu_cycles_per_request=np.array([serv["cpu_cycles_per_request"] for serv in first_instances], dtype=float),
+                              ram_req=np.array([serv["ram_req"] for serv in first_instances], dtype=float),
+                              input_size=np.array([serv["input_size"] for serv in first_instances], dtype=float))
+
+    def to_dicts(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Returns:
+            dict[str, dict[str, dict[str, float]]]: The catalog as the
+            services dict of read_input, with an entry per replica.
+        """
+        services: dict[str, dict[str, dict[str, float]]] = {serv: {} for serv in self.service_ids}
+        for instance, serv in zip(self.instance_ids, self.instance_service.tolist()):
+            services[self.service_ids[serv]][instance] = {
+                "cpu_cycles_per_deploy": float(self.cpu_cycles_per_deploy[serv]),
+                "cpu_cycles_per_request": float(self.cpu_cycles_per_request[serv]),
+                "ram_req": float(self.ram_req[serv]),
+                "input_size": float(self.input_size[serv])}
+        return services
@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+from typing import Any
+import numpy as np
+from Scenario import Fleet, ServiceCatalog
+
+
+class ScenarioGenerator():
+    """Generates large scenarios with heterogeneous UAVs and many
+    services, and writes them as a small JSON header plus an .npz file
+    with a column per UAV and service value, which read_scenario loads
+    without parsing an object per UAV.
+
+    The UAVs are drawn from hardware profiles (RAM capacity × CPU
+    frequency) and start with a battery between min_batt_fraction and
+    full. The number of replicas of every service is set so that the
+    instances use about load of the RAM and CPU of the fleet.
+    """
+
+    batt_cap: float = 46.62
+    ram_caps: tuple[float, ...] = (2.0, 4.0, 8.0)
+    cpu_freqs: tuple[float, ...] = (1.5, 1.8, 2.0)
+    cpu_cycles_per_deploy: tuple[float, float] = (0.5, 1.0)
+    cpu_cycles_per_request: tuple[float, float] = (0.001, 0.003)
+    ram_req: tuple[float, float] = (0.5, 2.0)
+    input_size: tuple[float, float] = (0.1, 0.3)
+
+    @staticmethod
+    def generate_fleet(n_uavs: int, rng: np.random.Generator, min_batt_fraction: float = 0.8) -> Fleet:
+        """Returns:
+            Fleet: n_uavs UAVs with a random hardware profile and
+            battery level.
+        """
+        return Fleet(uav_ids=list(range(n_uavs)),
+                     batt_lvl=np.round(ScenarioGenerator.batt_cap * rng.uniform(min_batt_fraction, 1.0, n_uavs), 2),
+                     ram_cap=rng.choice(ScenarioGenerator.ram_caps, n_uavs),
+                     cpu_freq=rng.choice(ScenarioGenerator.cpu_freqs, n_uavs))
+
+    @staticmethod
+    def generate_catalog(n_services: int, fleet: Fleet, rng: np.random.Generator, load: float = 0.5) -> ServiceCatalog:
+        """Generate the services of a fleet.
+
+        Args:
+            n_services (int): The number of services.
+            fleet (Fleet): The fleet the replicas are sized for.
+            rng (np.random.Generator): The random generator.
+            load (float): The fraction of the RAM and the CPU of the
+                fleet used by the instances, which are split evenly
+                between the services.
+
+        Returns:
+            ServiceCatalog: The services, with at least one replica
+            each.
+        """
+        generator = ScenarioGenerator
+        cpu_cycles_per_deploy: np.ndarray = np.round(rng.uniform(*generator.cpu_cycles_per_deploy, n_services), 3)
+        cpu_cycles_per_request: np.ndarray = np.round(rng.uniform(*generator.cpu_cycles_per_request, n_services), 4)
+        ram_req: np.ndarray = np.round(rng.uniform(*generator.ram_req, n_services), 3)
+        input_size: np.ndarray = np.round(rng.uniform(*generator.input_size, n_services), 2)
+        # The binding resource of each service decides its share.
+        capacity: np.ndarray = np.minimum(fleet.ram_cap.sum() / ram_req, fleet.cpu_freq.sum() / cpu_cycles_per_deploy)
+        replicas: np.ndarray = np.maximum(1, np.floor(load * capacity / n_services)).astype(int)
+        return ServiceCatalog(service_ids=[f"serv_{j}" for j in range(n_services)],
+                              replicas=replicas,
+                              cpu_cycles_per_deploy=cpu_cycles_per_deploy,
+                              cpu_cycles_per_request=cpu_cycles_per_request,
+                              ram_req=ram_req,
+                              input_size=input_size)
+
+    @staticmethod
+    def write(path: Path,
+              fleet: Fleet,
+              catalog: ServiceCatalog,
+              time_slot_interval: float,
+              n_requests: int,
+              metadata: dict[str, Any] | None = None) -> Path:
+        """Write a scenario as path, a JSON header, and an .npz file
+        with the same stem next to it.
+
+        Args:
+            path (Path): The header file. It is overwritten.
+            fleet (Fleet): The UAVs.
+            catalog (ServiceCatalog): The services.
+            time_slot_interval (float): The duration of a time slot.
+            n_requests (int): The number of requests per time slot.
+            metadata (dict[str, Any] | None): Extra entries of the
+                header, e.g. the seed it was generated with.
+
+        Returns:
+            Path: The .npz file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays_path: Path = path.with_suffix(".npz")
+        # Uncompressed, so that np.load reads the columns directly.
+        np.savez(arrays_path, **fleet.to_arrays(), **catalog.to_arrays())
+        header: dict[str, Any] = {"time_slot_interval": time_slot_interval,
+                                  "n_requests": n_requests,
+                                  "n_uavs": len(fleet),
+                                  "n_services": len(catalog),
+                                  "n_instances": len(catalog.instance_ids),
+                                  "arrays": arrays_path.name,
+                                  **(metadata or {})}
+        with open(path, "w") as file:
+            json.dump(header, file, indent=4)
+        return arrays_path
@@ -1,15 +1,39 @@
 import json
+import time
 from typing import Any
 import gurobipy as gp
+import numpy as np
+from FeasibilityScreen import FeasibilityScreen
+from LPRounding import LPRounding
+from PlacementCache import PlacementCache
 from PowerConsumptionModel import PowerConsumptionModel as PCM
 from RequestGenerator import RequestGenerator as RG
+from ResultWriter import ResultWriter
+from Scenario import Fleet, ServiceCatalog
+from SolverBackend import BACKENDS, PlacementProblem, SolverBackend
+from Telemetry import SlotObserver, get_model_stats
 from pathlib import Path
 import pandas as pd
 
 
-env = gp.Env(empty=True)
-env.setParam("OutputFlag", 0)
-env.start()
+_default_env: gp.Env | None = None
+
+
+def get_default_env() -> gp.Env:
+    """Returns the Gurobi environment shared by the ServiceMigrators
+    that are not given one. It is started on first use, so that worker
+    processes that create their own environment do not start it.
+
+    Returns:
+        gp.Env: The default Gurobi environment.
+    """
+    global _default_env
+    if (_default_env is None):
+        _default_env = gp.Env(empty=True)
+        _default_env.setParam("OutputFlag", 0)
+        _default_env.start()
+    return _default_env
+
 
 class ServiceMigrator():
     """ServiceMigrator is a class that takes UAVs and services as input
@@ -19,19 +43,184 @@ class ServiceMigrator():
     """
 
 
-    def __init__(self, uavs: dict[str, dict[str, float]],
-                       services: dict[str, dict[str, dict[str, float]]],
-                       requests: dict[tuple[str, str], float],
+    def __init__(self, uavs: dict[str, dict[str, float]] | Fleet,
+                       services: dict[str, dict[str, dict[str, float]]] | ServiceCatalog,
+                       requests: dict[tuple[str, str], float] | np.ndarray,
                        time_slot_interval: float,
-                       n_requests: int) -> None:
+                       n_requests: int,
+                       incremental: bool = False,
+                       builder: str = "dict",
+                       rng: np.random.Generator | None = None,
+                       uav_weights: np.ndarray | None = None,
+                       service_weights: np.ndarray | None = None,
+                       env: gp.Env | None = None,
+                       backend: str = "gurobi",
+                       backend_options: dict[str, Any] | None = None,
+                       reference_backend: str | None = None,
+                       formulation: str = "replica",
+                       symmetry_breaking: bool = False,
+                       observers: list[SlotObserver] | None = None,
+                       result_writer: ResultWriter | None = None,
+                       time_budget: float | None = None,
+                       placement_cache: PlacementCache | None = None,
+                       screening: bool = False,
+                       reduced: bool = False,
+                       lp_warm_start: bool = False) -> None:
+        """Create a ServiceMigrator.
 
+        Args:
+            uavs (dict[str, dict[str, float]] | Fleet): The UAVs, as
+                returned by read_input or read_scenario. A Fleet is
+                copied, so its battery levels do not change.
+            services (dict[str, dict[str, dict[str, float]]] |
+                ServiceCatalog): The services.
+            requests (dict[tuple[str, str], float] | np.ndarray): The
+                requests of the first time slot, as a dict or as a
+                UAV × service matrix.
+            incremental (bool): If True, the model is built once and,
+                in the following time slots, only the coefficients and
+                right-hand sides that depend on the requests and on the
+                battery levels are updated. The solver is warm-started
+                with the placement of the previous time slot.
+            builder (str): "dict" builds the model one variable and
+                one constraint at a time. "matrix" builds the same
+                model with the matrix API, adding each set of
+                constraints as a single matrix expression.
+            rng (np.random.Generator | None): The generator the
+                requests of the following time slots are drawn from
+                with RequestGenerator.generate_request_matrix.
+                RequestGenerator.default_rng if None.
+            uav_weights (np.ndarray | None): The share of the requests
+                of each UAV. Uniform if None.
+            service_weights (np.ndarray | None): The popularity of each
+                service. Uniform if None.
+            env (gp.Env | None): The Gurobi environment of the models.
+                The default environment is used if None.
+            backend (str): "gurobi" solves the model built by this
+                class. Any other name of SolverBackend.BACKENDS (e.g.
+                "highs") solves the same model, laid out as a
+                PlacementProblem, with that engine. The builder and
+                incremental options only apply to "gurobi".
+            backend_options (dict[str, Any] | None): The options of the
+                SolverBackend.
+            reference_backend (str | None): If given (e.g. "gurobi"),
+                every time slot is also solved with this backend of
+                SolverBackend.BACKENDS, and the gap between its z and
+                the z of backend is appended to self.comparisons. The
+                placement of backend is the one that is deployed.
+            formulation (str): "replica" uses one binary variable per
+                UAV and replica of a service. "aggregated" uses one
+                integer variable per UAV and service that counts the
+                replicas it hosts, which removes the symmetry between
+                the replicas of a service. It is always built with the
+                matrix API.
+            symmetry_breaking (bool): With the aggregated formulation,
+                order the UAVs that are identical in the time slot
+                (same battery, resources and requests) so that only one
+                of their permutations is explored.
+            observers (list[SlotObserver] | None): Hooks that receive a
+                record with the phase timings, the model size, the
+                solver statistics, z and the migrations of every time
+                slot. Nothing is measured if None.
+            result_writer (ResultWriter | None): If given, the metrics
+                of every UAV are streamed to it at each step, and
+                print_solution no longer keeps them in self.output.
+            time_budget (float | None): The seconds each time slot may
+                be solved for. When they run out, the best incumbent is
+                accepted; if there is none, the placement of the
+                previous time slot is kept as long as it is still
+                feasible. self.solve_path records which one was used.
+                No limit if None.
+            placement_cache (PlacementCache | None): If given, the
+                placement of a time slot similar to an already solved
+                one is taken from the cache (if it is feasible and the
+                cache reuses placements) or used as the MIP start, and
+                the placements found are added to it.
+            screening (bool): Run the FeasibilityScreen before building
+                the model of every time slot. A time slot it proves
+                infeasible is neither built nor solved. A feasible
+                placement it finds is the MIP start when the previous
+                placement is no longer feasible, and the fallback when
+                the time budget runs out without any other placement.
+                self.max_remaining_slots bounds the time slots the
+                fleet can still survive, and the run stops (screen
+                "lifetime") once it reaches 0.
+            reduced (bool): Solve a reduced model with the
+                SolverBackend of backend (GurobiBackend for "gurobi"):
+                the placement variables that cannot be part of a
+                feasible placement are not created and the battery rows
+                are only added, lazily, for the UAVs whose battery
+                bounds show they could bind. The builder and
+                incremental options do not apply.
+            lp_warm_start (bool): Solve the LP relaxation of every time
+                slot before the MILP and round it into a feasible
+                placement, which is the MIP start of the Gurobi model
+                when it is better than the placement of the previous
+                time slot, and the last fallback when the time budget
+                runs out. self.lp_bound and self.rounded keep the bound
+                on z and the rounded placement. A time slot whose
+                relaxation is infeasible is not solved.
+        """
 
-        self.uavs: dict[str, dict[str, float]] = uavs
-        self.services: dict[str, dict[str, dict[str, float]]] = services
-        self.requests: dict[tuple[str, str], float] = requests
+        self.fleet: Fleet = uavs.copy() if isinstance(uavs, Fleet) else Fleet.from_dicts(uavs)
+        self.catalog: ServiceCatalog = services if isinstance(services, ServiceCatalog) else\
+                                       ServiceCatalog.from_dicts(services)
+        self.request_matrix: np.ndarray
+        if (isinstance(requests, np.ndarray)):
+            self.request_matrix = requests.astype(float)
+        else:
+            self.request_matrix = np.array([[requests[uav, serv] for serv in self.catalog.service_ids]
+                                            for uav in self.fleet.uav_ids], dtype=float)
+        self.services_dicts: dict[str, dict[str, dict[str, float]]] | None = None
         self.time_slot_interval: float = time_slot_interval
         self.n_requests = n_requests
-        self.model: gp.Model = gp.Model(env=env)
+        self.incremental: bool = incremental
+        self.restored: bool = False
+        if (builder not in ("dict", "matrix")):
+            raise ValueError(f"Unknown builder: {builder}")
+        self.builder: str = builder
+        if (formulation not in ("replica", "aggregated")):
+            raise ValueError(f"Unknown formulation: {formulation}")
+        self.formulation: str = formulation
+        self.symmetry_breaking: bool = symmetry_breaking
+        if (backend != "gurobi" and backend not in BACKENDS):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend: str = backend
+        self.reduced: bool = reduced
+        self.own_model: bool = backend == "gurobi" and not reduced
+        self.backend_options: dict[str, Any] = backend_options or {}
+        self.solver: SolverBackend | None = None
+        self.placement: dict[tuple[str, str], float] | None = None
+        if (reference_backend is not None and reference_backend not in BACKENDS):
+            raise ValueError(f"Unknown backend: {reference_backend}")
+        self.reference_backend: str | None = reference_backend
+        self.comparisons: list[dict[str, float]] = []
+        self.rng: np.random.Generator = rng if rng is not None else RG.default_rng
+        self.uav_weights: np.ndarray | None = uav_weights
+        self.service_weights: np.ndarray | None = service_weights
+        self.env: gp.Env = get_default_env() if env is None else env
+        self.model: gp.Model = gp.Model(env=self.env)
+        self.model_built: bool = False
+        self.last_placement: dict[tuple[str, str], float] | None = None
+        self.observers: list[SlotObserver] = observers or []
+        self.slot: int = 0
+        self.slot_record: dict[str, Any] = {}
+        self.result_writer: ResultWriter | None = result_writer
+        self.time_budget: float | None = time_budget
+        self.solve_path: str | None = None
+        self.first_incumbent_time: float | None = None
+        self.placement_objective: float = float("nan")
+        self.last_placement_matrix: np.ndarray | None = None
+        self.placement_cache: PlacementCache | None = placement_cache
+        self.screening: bool = screening
+        self.screen_problem: PlacementProblem | None = None
+        self.screen_reason: str | None = None
+        self.certificate: np.ndarray | None = None
+        self.max_remaining_slots: float = float("inf")
+        self.min_slot_consumption: np.ndarray | None = None
+        self.lp_warm_start: bool = lp_warm_start
+        self.lp_bound: float | None = None
+        self.rounded: np.ndarray | None = None
         self.X_u_m: dict[tuple[str, str], gp.Var]
         self.z: gp.Var
         self.constraints_1: dict[str, gp.Constr]
@@ -41,22 +230,128 @@ class ServiceMigrator():
         self.constraints_5: dict[str, gp.Constr]
         self.constraints_5: dict[str, gp.Constr]
         self.constraints_6: dict[str, gp.Constr]
+        self.X: gp.MVar
+        self.Y_u_s: dict[tuple[str, str], gp.Var]
+        self.symmetry_constraints: list[gp.Constr] = []
+        self.uav_ids: list[str]
+        self.instance_ids: list[str]
+        self.instance_service: np.ndarray
+        self.services_of_instances: dict[str, str]
+        self.placement_keys: list[tuple[str, str]]
+        self._index_arrays()
+        self.placement_matrix: np.ndarray | None = None
+        self.slot_metrics: dict[str, np.ndarray] | None = None
 
         self.output: dict[str, list[dict[str, Any]]] = {}
-        for uav in self.uavs.keys():
+        for uav in self.uav_ids:
             self.output[uav] = []
 
+    @property
+    def uavs(self) -> dict[str, dict[str, float]]:
+        """Returns:
+            dict[str, dict[str, float]]: The fleet as the uavs dict of
+            read_input, for the dict builder. Changing it does not
+            change the fleet.
+        """
+        return self.fleet.to_dicts()
+
+    @property
+    def services(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Returns:
+            dict[str, dict[str, dict[str, float]]]: The catalog as the
+            services dict of read_input, for the dict builder.
+        """
+        if (self.services_dicts is None):
+            self.services_dicts = self.catalog.to_dicts()
+        return self.services_dicts
+
+    @property
+    def requests(self) -> dict[tuple[str, str], float]:
+        """Returns:
+            dict[tuple[str, str], float]: The requests of the time slot
+            as a dict, for the dict builder.
+        """
+        return {(uav, serv): requests for uav, row in zip(self.uav_ids, self.request_matrix.tolist())
+                for serv, requests in zip(self.catalog.service_ids, row)}
+
     @staticmethod
-    def read_input(file_path: Path, i) -> tuple[dict[str, dict[str, float]],
+    def read_scenario(file_path: Path,
+                      n_uavs: int | None = None,
+                      rng: np.random.Generator | None = None,
+                      uav_weights: np.ndarray | None = None,
+                      service_weights: np.ndarray | None = None,
+                      n_requests: int | None = None) -> tuple[Fleet, ServiceCatalog, np.ndarray, float, int]:
+        """Reads the input_file and returns the information needed to
+        create a ServiceMigrator instance as NumPy columns. The UAVs
+        and services are either listed in the file or, in the files of
+        ScenarioGenerator, stored as columns in the .npz file named by
+        its "arrays" key.
+
+        Args:
+            file_path (Path): The path of the input_file
+            n_uavs (int | None): The number of UAVs. The UAVs of the
+                file are repeated in order if there are fewer. All of
+                them if None.
+            rng (np.random.Generator | None): The generator the
+                requests of the first time slot are drawn from.
+                RequestGenerator.default_rng if None.
+            uav_weights (np.ndarray | None): The share of the requests
+                of each UAV. Uniform if None.
+            service_weights (np.ndarray | None): The popularity of each
+                service. Uniform if None.
+            n_requests (int | None): The number of requests per time
+                slot. The value of the input_file is used if None.
+
+        Returns:
+            tuple[Fleet, ServiceCatalog, np.ndarray, float, int]: The
+            UAVs, the services, the requests of the first time slot
+            (UAV × service), the time_slot_interval and the number of
+            requests per time slot.
+        """
+        input: dict[str, Any]
+        with open(file_path) as file:
+            input = json.loads(file.read())
+        fleet: Fleet
+        catalog: ServiceCatalog
+        if ("arrays" in input):
+            with np.load(file_path.parent / input["arrays"]) as arrays:
+                fleet = Fleet.from_arrays(arrays, n_uavs)
+                catalog = ServiceCatalog.from_arrays(arrays)
+        else:
+            fleet = Fleet.from_json(input["uavs"], n_uavs)
+            catalog = ServiceCatalog.from_json(input["services"])
+        if (n_requests is None):
+            n_requests = input["n_requests"]
+        requests: np.ndarray = ServiceMigrator._generate_requests(fleet.uav_ids, catalog.service_ids, n_requests,
+                                                                  rng, uav_weights, service_weights)
+        return fleet, catalog, requests, input["time_slot_interval"], n_requests
+
+    @staticmethod
+    def read_input(file_path: Path,
+                   i,
+                   rng: np.random.Generator | None = None,
+                   uav_weights: np.ndarray | None = None,
+                   service_weights: np.ndarray | None = None,
+                   n_requests: int | None = None) -> tuple[dict[str, dict[str, float]],
                                              dict[str, dict[str, dict[str, float]]],
                                              dict[tuple[str, str], float],
                                              float,
                                              int]:
-        """Reads the input_file and returns the information needed to
-        create a ServiceMigrator instance.
+        """Same as read_scenario, with the UAVs, the services (one
+        entry per replica) and the requests as dicts.
 
         Args:
             file_path (Path): The path of the input_file
+            i (int): The number of UAVs.
+            rng (np.random.Generator | None): The generator the
+                requests of the first time slot are drawn from.
+                RequestGenerator.default_rng if None.
+            uav_weights (np.ndarray | None): The share of the requests
+                of each UAV. Uniform if None.
+            service_weights (np.ndarray | None): The popularity of each
+                service. Uniform if None.
+            n_requests (int | None): The number of requests per time
+                slot. The value of the input_file is used if None.
 
         Returns:
             tuple[dict[str, dict[str, float]],
@@ -65,45 +360,43 @@ class ServiceMigrator():
                 information needed to create a ServiceMigrator
                 instance.
         """
-        input: dict[str, Any]
-        with open(file_path) as file:
-            input = json.loads(file.read())
+        fleet, catalog, requests, time_slot_interval, n_requests = ServiceMigrator.read_scenario(
+            file_path, i, rng=rng, uav_weights=uav_weights, service_weights=service_weights, n_requests=n_requests)
+        requests_dict: dict[tuple[str, str], float] = {}
+        for uav, row in zip(fleet.uav_ids, requests.tolist()):
+            for serv, serv_requests in zip(catalog.service_ids, row):
+                requests_dict[uav, serv] = int(serv_requests)
+        return fleet.to_dicts(), catalog.to_dicts(), requests_dict, time_slot_interval, n_requests
 
-
-        services: dict[str, dict[str, dict[str, float|int]]] = {}
-        for serv in input["services"]:
-            serv_id, serv_value = next(iter(serv.items()))
-            services[serv_id] = {}
-            for replica in range(serv_value["replicas"]):
-                services[serv_id][f"{serv_id}_{replica}"] = {"cpu_cycles_per_deploy": serv_value["cpu_cycles_per_deploy"],
-                                                            "cpu_cycles_per_request": serv_value["cpu_cycles_per_request"],
-                                                            "ram_req": serv_value["ram_req"],
-                                                            "input_size": serv_value["input_size"]}
-
-        uavs: dict[str, dict[str, float]] = {}
-        for iterr, uav in enumerate(range(i)):
-            uavs[iterr] = {"batt_lvl": 46.62,
-                            "ram_cap": 4.0,
-                            "cpu_freq": 1.5}
-
-        # requests: dict[tuple[str, str], float] = {}
-
-        time_slot_interval: float = input["time_slot_interval"]
-        n_requests: int = input["n_requests"]
-        requests: dict[tuple[str, str], float] = RG.generate_requests(uavs=uavs,
-                                                                    services=services,
-                                                                    n_requests=n_requests)
-        return uavs, services, requests, time_slot_interval, n_requests
+    @staticmethod
+    def _generate_requests(uav_ids: list,
+                           service_ids: list[str],
+                           n_requests: int,
+                           rng: np.random.Generator | None = None,
+                           uav_weights: np.ndarray | None = None,
+                           service_weights: np.ndarray | None = None) -> np.ndarray:
+        """Returns:
+            np.ndarray: The requests of a time slot (UAV × service),
+            drawn with a single multinomial sample from rng or, if it is
+            None, from RequestGenerator.default_rng.
+        """
+        return RG.generate_request_matrix(n_uavs=len(uav_ids),
+                                          n_services=len(service_ids),
+                                          n_requests=n_requests,
+                                          rng=rng if rng is not None else RG.default_rng,
+                                          uav_weights=uav_weights,
+                                          service_weights=service_weights).astype(float)
 
     def _add_variables(self) -> None:
         """Add the variables to the model."""
         self.X_u_m = {}
-        for uav in self.uavs.keys():
-            for serv in self.services.keys():
-                for instance in self.services[serv].keys():
+        services: dict[str, dict[str, dict[str, float]]] = self.services
+        for uav in self.uav_ids:
+            for serv in services.keys():
+                for instance in services[serv].keys():
                     self.X_u_m[(uav, instance)] = self.model.addVar(vtype=gp.GRB.BINARY,
                                                 name=f"x {uav} {instance}")
-        max_batt_lvl: float = max([uav["batt_lvl"] for uav in self.uavs.values()])
+        max_batt_lvl: float = float(self.fleet.batt_lvl.max())
 
         self.z = self.model.addVar(vtype=gp.GRB.CONTINUOUS,
                                    lb=0.3,
@@ -118,7 +411,7 @@ class ServiceMigrator():
         self.constraints_1 = {}
         for serv in self.services.keys():
             for instance in self.services[serv].keys():
-                variables_1: list[gp.Var] = [self.X_u_m[(uav, instance)] for uav in self.uavs.keys()]
+                variables_1: list[gp.Var] = [self.X_u_m[(uav, instance)] for uav in self.uav_ids]
                 lin_expr: gp.LinExpr = gp.quicksum(variables_1)
                 self.constraints_1[f"c1_{instance}"] = self.model.addConstr(lin_expr == 1)
         self.model.update()
@@ -149,11 +442,13 @@ class ServiceMigrator():
         services does not surpass the UAV's cpu_freq.
         """
         self.constraints_3 = {}
+        services: dict[str, dict[str, dict[str, float]]] = self.services
+        requests: dict[tuple[str, str], float] = self.requests
         for uav, uav_value in self.uavs.items():
             lin_expr: gp.LinExpr = PCM.get_cpu_utilization(
-                services=self.services,
+                services=services,
                 uav=(uav, uav_value),
-                requests=self.requests,
+                requests=requests,
                 variables=self.X_u_m)
             self.constraints_3[f"c3_{uav}"] = self.model.addConstr(lin_expr <= 1.0)
 
@@ -166,22 +461,24 @@ class ServiceMigrator():
         """
         self.constraints_4 = {}
         self.constraints_5 = {}
+        services: dict[str, dict[str, dict[str, float]]] = self.services
+        requests: dict[tuple[str, str], float] = self.requests
         for uav, uav_value in self.uavs.items():
             uav_batt_lvl = uav_value["batt_lvl"]
             cpu_utilization: gp.LinExpr = PCM.get_cpu_utilization(
-                services=self.services,
+                services=services,
                 uav=(uav, uav_value),
-                requests=self.requests,
+                requests=requests,
                 variables=self.X_u_m)
             uplink_data_rate: gp.LinExpr = PCM.get_uplink_data_rate(
-                services=self.services,
+                services=services,
                 uav=(uav, uav_value),
-                requests=self.requests,
+                requests=requests,
                 variables=self.X_u_m)
             downlink_data_rate: gp.LinExpr = PCM.get_downlink_data_rate(
-                services=self.services,
+                services=services,
                 uav=(uav, uav_value),
-                requests=self.requests,
+                requests=requests,
                 variables=self.X_u_m)
             energy_consumption: gp.LinExpr = PCM.get_energy_consumption(
                 cpu_utilization=cpu_utilization,
@@ -198,143 +495,723 @@ class ServiceMigrator():
         self.model.setObjective(expr=self.z, sense=gp.GRB.MAXIMIZE)
         self.model.update()
 
+    def _update_model(self) -> None:
+        """Update the coefficients and right-hand sides of the model
+        that depend on the requests and on the battery levels, instead
+        of building the model again. The RAM and replica constraints do
+        not change between time slots.
+        """
+        problem: PlacementProblem = self._get_placement_problem()
+        self.z.UB = problem.batt_lvl.max()
+        for i, uav in enumerate(self.uav_ids):
+            constraint_3: gp.Constr = self.constraints_3[f"c3_{uav}"]
+            constraint_4: gp.Constr = self.constraints_4[f"c4_{uav}"]
+            constraint_5: gp.Constr = self.constraints_5[f"c4_{uav}"]
+            for j, instance in enumerate(self.instance_ids):
+                var: gp.Var = self.X_u_m[(uav, instance)]
+                self.model.chgCoeff(constraint_3, var, problem.cpu_coeffs[i, j])
+                self.model.chgCoeff(constraint_4, var, -problem.energy_coeffs[i, j])
+                self.model.chgCoeff(constraint_5, var, -problem.energy_coeffs[i, j])
+            constraint_4.RHS = problem.min_batt_lvl - problem.batt_lvl[i] + problem.energy_constant[i]
+            constraint_5.RHS = problem.energy_constant[i] - problem.batt_lvl[i]
+        self.model.update()
+
+    def _set_warm_start(self, placement: dict[tuple[str, str], float] | None = None) -> None:
+        """Use a placement as the MIP start of the model.
+
+        Args:
+            placement (dict[tuple[str, str], float] | None): The
+                placement. The one of the previous time slot if None.
+        """
+        placement = self.last_placement if placement is None else placement
+        if (placement is None):
+            return
+        if (self.formulation == "aggregated"):
+            counts: dict[tuple[str, str], float] = {key: 0.0 for key in self.Y_u_s.keys()}
+            for (uav, instance), value in placement.items():
+                counts[(uav, self.services_of_instances[instance])] += value
+            self.model.setAttr("Start", list(self.Y_u_s.values()), [counts[key] for key in self.Y_u_s.keys()])
+            self.model.update()
+            return
+        keys: list[tuple[str, str]] = list(placement.keys())
+        self.model.setAttr("Start",
+                           [self.X_u_m[key] for key in keys],
+                           [placement[key] for key in keys])
+        self.model.update()
+
+    def _index_arrays(self) -> None:
+        """Lay out the UAVs and the instances. Rows follow the order of
+        the fleet and columns the order of the instances of the
+        catalog, as in _add_variables.
+        """
+        self.uav_ids = self.fleet.uav_ids
+        self.instance_ids = self.catalog.instance_ids
+        self.instance_service = self.catalog.instance_service
+        self.services_of_instances = {instance: self.catalog.service_ids[serv] for instance, serv
+                                      in zip(self.instance_ids, self.instance_service.tolist())}
+        self.placement_keys = [(uav, instance) for uav in self.uav_ids for instance in self.instance_ids]
+
+    def _get_request_matrix(self) -> np.ndarray:
+        """Returns:
+            np.ndarray: The number of requests of each UAV (rows) for
+            each service (columns).
+        """
+        return self.request_matrix
+
+    def _get_coefficient_matrices(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The CPU
+            utilization coefficients (UAV × instance), the energy
+            consumption coefficients (UAV × instance) and the energy
+            consumed by each UAV if it hosts no instance, as returned
+            by PowerConsumptionModel.get_instance_coefficients.
+        """
+        return PCM.get_instance_coefficients(self.fleet, self.catalog, self.request_matrix, self.time_slot_interval)
+
+    def _get_placement_problem(self) -> PlacementProblem:
+        """Returns:
+            PlacementProblem: The model of the current time slot laid
+            out as arrays.
+        """
+        cpu_coeffs, energy_coeffs, energy_constant = self._get_coefficient_matrices()
+        return PlacementProblem(uav_ids=self.uav_ids,
+                                instance_ids=self.instance_ids,
+                                service_ids=self.catalog.service_ids,
+                                instance_service=self.instance_service,
+                                ram_req=self.catalog.get_instance_values("ram_req"),
+                                ram_cap=self.fleet.ram_cap,
+                                batt_lvl=self.fleet.batt_lvl.copy(),
+                                cpu_coeffs=cpu_coeffs,
+                                energy_coeffs=energy_coeffs,
+                                energy_constant=energy_constant,
+                                demand=self.request_matrix)
+
+    def _setup_model_matrix(self) -> None:
+        """Build the same model as _add_variables, _add_constraints_1,
+        ..., _add_constraints_4_5 and _add_obj_function, with the
+        placement decisions as a UAV × instance MVar and every set of
+        constraints added as a single sparse matrix constraint over the
+        variables of the model (the flattened MVar followed by z).
+        """
+        problem: PlacementProblem = self._get_placement_problem()
+        names: np.ndarray = np.array([[f"x {uav} {instance}" for instance in self.instance_ids]
+                                      for uav in self.uav_ids])
+        self.X = self.model.addMVar(shape=names.shape,
+                                    vtype=gp.GRB.BINARY,
+                                    name=names)
+        self.z = self.model.addVar(vtype=gp.GRB.CONTINUOUS,
+                                   lb=problem.min_z,
+                                   ub=problem.batt_lvl.max(),
+                                   name="z")
+        self.model.update()
+        constraints: dict[str, gp.MConstr] = {}
+        for family, (matrix, sense, rhs) in problem.get_constraint_matrices().items():
+            constraints[family] = self.model.addMConstr(matrix, None, sense, rhs)
+        self.model.setObjective(expr=self.z, sense=gp.GRB.MAXIMIZE)
+        self.model.update()
+
+        variables: list[list[gp.Var]] = self.X.tolist()
+        self.X_u_m = {}
+        for i, uav in enumerate(self.uav_ids):
+            for j, instance in enumerate(self.instance_ids):
+                self.X_u_m[(uav, instance)] = variables[i][j]
+        self.constraints_1 = {f"c1_{instance}": constr for instance, constr
+                              in zip(self.instance_ids, constraints["c1"].tolist())}
+        self.constraints_2 = {f"c2_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c2"].tolist())}
+        self.constraints_3 = {f"c3_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c3"].tolist())}
+        self.constraints_4 = {f"c4_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c4"].tolist())}
+        self.constraints_5 = {f"c4_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c5"].tolist())}
+
+    def _setup_model_aggregated(self) -> None:
+        """Build the aggregated formulation of the model with the matrix
+        API: Y (UAV × service) counts the replicas of each service
+        hosted by each UAV, and the replica constraints force every
+        service to deploy all its replicas. The uplink data rate keeps
+        its meaning, since Y equals the sum of the per-replica
+        variables of the service.
+        """
+        problem: PlacementProblem = self._get_placement_problem().aggregate()
+        names: np.ndarray = np.array([[f"y {uav} {serv}" for serv in problem.instance_ids]
+                                      for uav in self.uav_ids])
+        Y: gp.MVar = self.model.addMVar(shape=names.shape,
+                                        vtype=gp.GRB.INTEGER,
+                                        ub=np.tile(problem.get_replicas(), (len(self.uav_ids), 1)),
+                                        name=names)
+        self.z = self.model.addVar(vtype=gp.GRB.CONTINUOUS,
+                                   lb=problem.min_z,
+                                   ub=problem.batt_lvl.max(),
+                                   name="z")
+        self.model.update()
+        constraints: dict[str, gp.MConstr] = {}
+        for family, (matrix, sense, rhs) in problem.get_constraint_matrices().items():
+            constraints[family] = self.model.addMConstr(matrix, None, sense, rhs)
+        self.model.setObjective(expr=self.z, sense=gp.GRB.MAXIMIZE)
+        self.model.update()
+
+        variables: list[list[gp.Var]] = Y.tolist()
+        self.Y_u_s = {}
+        for i, uav in enumerate(self.uav_ids):
+            for j, serv in enumerate(problem.instance_ids):
+                self.Y_u_s[(uav, serv)] = variables[i][j]
+        self.constraints_1 = {f"c1_{serv}": constr for serv, constr
+                              in zip(problem.instance_ids, constraints["c1"].tolist())}
+        self.constraints_2 = {f"c2_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c2"].tolist())}
+        self.constraints_3 = {f"c3_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c3"].tolist())}
+        self.constraints_4 = {f"c4_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c4"].tolist())}
+        self.constraints_5 = {f"c4_{uav}": constr for uav, constr
+                              in zip(self.uav_ids, constraints["c5"].tolist())}
+        self._add_symmetry_constraints(problem)
+
+    def _add_symmetry_constraints(self, problem: PlacementProblem) -> None:
+        """Force the UAVs that are identical in the time slot to host
+        replica counts in non-increasing lexicographic order. The
+        counts are encoded as a weighted sum with base max(replicas)+1,
+        which preserves the lexicographic order.
+
+        Args:
+            problem (PlacementProblem): The aggregated problem.
+        """
+        self.model.remove(self.symmetry_constraints)
+        self.symmetry_constraints = []
+        if (not self.symmetry_breaking):
+            self.model.update()
+            return
+        weights: np.ndarray = float(problem.get_replicas().max() + 1) ** np.arange(problem.shape[1] - 1, -1, -1)
+        requests: np.ndarray = self._get_request_matrix()
+        groups: dict[tuple, list[str]] = {}
+        for i, uav in enumerate(self.uav_ids):
+            key: tuple = (self.fleet.batt_lvl[i], self.fleet.ram_cap[i], self.fleet.cpu_freq[i], *requests[i])
+            groups.setdefault(key, []).append(uav)
+        for group in groups.values():
+            for uav_1, uav_2 in zip(group[:-1], group[1:]):
+                lin_expr: gp.LinExpr = gp.quicksum(
+                    [weight * (self.Y_u_s[(uav_1, serv)] - self.Y_u_s[(uav_2, serv)])
+                     for weight, serv in zip(weights, problem.instance_ids)])
+                self.symmetry_constraints.append(self.model.addConstr(lin_expr >= 0))
+        self.model.update()
+
+    def _update_model_aggregated(self) -> None:
+        """Same as _update_model for the aggregated formulation. The
+        symmetry breaking constraints are added again, since the groups
+        of identical UAVs change with the requests and batteries.
+        """
+        problem: PlacementProblem = self._get_placement_problem().aggregate()
+        self.z.UB = problem.batt_lvl.max()
+        for i, uav in enumerate(self.uav_ids):
+            constraint_3: gp.Constr = self.constraints_3[f"c3_{uav}"]
+            constraint_4: gp.Constr = self.constraints_4[f"c4_{uav}"]
+            constraint_5: gp.Constr = self.constraints_5[f"c4_{uav}"]
+            for j, serv in enumerate(problem.instance_ids):
+                var: gp.Var = self.Y_u_s[(uav, serv)]
+                self.model.chgCoeff(constraint_3, var, problem.cpu_coeffs[i, j])
+                self.model.chgCoeff(constraint_4, var, -problem.energy_coeffs[i, j])
+                self.model.chgCoeff(constraint_5, var, -problem.energy_coeffs[i, j])
+            constraint_4.RHS = problem.min_batt_lvl - problem.batt_lvl[i] + problem.energy_constant[i]
+            constraint_5.RHS = problem.energy_constant[i] - problem.batt_lvl[i]
+        self._add_symmetry_constraints(problem)
+
+    def _expand_counts(self, counts: np.ndarray) -> np.ndarray:
+        """Assign the replicas of each service to the UAVs following
+        the replica counts of the aggregated formulation.
+
+        Args:
+            counts (np.ndarray): The number of replicas of each service
+                (columns) hosted by each UAV (rows).
+
+        Returns:
+            np.ndarray: The placement of each instance (UAV × instance).
+        """
+        placement: np.ndarray = np.zeros((len(self.uav_ids), len(self.instance_ids)))
+        counts = np.round(counts).astype(int)
+        for serv in range(counts.shape[1]):
+            hosts: np.ndarray = np.repeat(np.arange(counts.shape[0]), counts[:, serv])
+            placement[hosts, np.flatnonzero(self.instance_service == serv)] = 1.0
+        return placement
+
     def setup_model(self) -> None:
         """Sequentially call all the methods to add variables,
-        constraints and the objective function."""
-        self._add_variables()
-        self._add_constraints_1()
-        self._add_constraints_2()
-        self._add_constraints_3()
-        self._add_constraints_4_5()
-        self._add_obj_function()
+        constraints and the objective function. In incremental mode,
+        the model is only built in the first time slot and updated in
+        the following ones. With screening, the model is not built if
+        the time slot is proven infeasible."""
+        if (not self.observers):
+            if (self.screening):
+                self._screen()
+            if (self.screen_reason is None):
+                self._setup_model()
+            return
+        start: float = time.perf_counter()
+        if (self.screening):
+            self._screen()
+            self.slot_record["screen_time"] = time.perf_counter() - start
+            self.slot_record["screen"] = self.screen_reason or ("feasible" if self.certificate is not None else "unknown")
+            self.slot_record["max_remaining_slots"] = self.max_remaining_slots
+            start = time.perf_counter()
+        if (self.screen_reason is None):
+            self._setup_model()
+            self.slot_record["setup_model_time"] = time.perf_counter() - start
+
+    def _screen(self) -> None:
+        """Run the FeasibilityScreen on the time slot and keep the
+        reason why it is infeasible (None if it may be feasible), a
+        feasible placement if one was found and the maximum number of
+        time slots the fleet can still survive.
+        """
+        if (self.min_slot_consumption is None):
+            catalog: ServiceCatalog = self.catalog
+            max_replicas: np.ndarray = np.minimum(np.minimum(catalog.replicas,
+                                                             np.floor(self.fleet.ram_cap[:, None] / catalog.ram_req)),
+                                                  np.floor(self.fleet.cpu_freq[:, None] / catalog.cpu_cycles_per_deploy))
+            self.min_slot_consumption = FeasibilityScreen.get_min_slot_consumption(
+                cpu_freq=self.fleet.cpu_freq,
+                input_sizes=catalog.input_size,
+                cpu_cycles_per_request=catalog.cpu_cycles_per_request,
+                max_replicas=max_replicas,
+                n_requests=self.n_requests,
+                time_slot_interval=self.time_slot_interval)
+        self.screen_problem = self._get_placement_problem()
+        self.screen_reason = FeasibilityScreen.check_infeasible(self.screen_problem)
+        self.max_remaining_slots = FeasibilityScreen.get_max_remaining_slots(self.screen_problem,
+                                                                             self.min_slot_consumption)
+        if (self.screen_reason is None and self.max_remaining_slots < 1):
+            self.screen_reason = "lifetime"
+        self.certificate = None
+        if (self.screen_reason is None):
+            self.certificate = FeasibilityScreen.find_certificate(self.screen_problem)
+
+    def _setup_model(self) -> None:
+        """Build or update the model of the time slot."""
+        if (not self.own_model):
+            if (self.solver is not None):
+                self.solver.dispose()
+            options: dict[str, Any] = dict(self.backend_options)
+            if (self.reduced):
+                options["reduced"] = True
+            if (self.backend == "gurobi"):
+                options.setdefault("env", self.env)
+            time_limit_option: str | None = BACKENDS[self.backend].time_limit_option
+            if (self.time_budget is not None and time_limit_option is not None):
+                options.setdefault(time_limit_option, self.time_budget)
+            self.solver = BACKENDS[self.backend](**options)
+            problem: PlacementProblem = self._get_placement_problem()
+            self.solver.build(problem.aggregate() if self.formulation == "aggregated" else problem)
+            return
+        if (self.incremental and self.model_built):
+            if (self.formulation == "aggregated"):
+                self._update_model_aggregated()
+            else:
+                self._update_model()
+            self._set_warm_start()
+            return
+        if (self.formulation == "aggregated"):
+            self._setup_model_aggregated()
+        elif (self.builder == "matrix"):
+            self._setup_model_matrix()
+        else:
+            self._add_variables()
+            self._add_constraints_1()
+            self._add_constraints_2()
+            self._add_constraints_3()
+            self._add_constraints_4_5()
+            self._add_obj_function()
+        self.model_built = True
+        # A run restored by set_state starts from the placement it had,
+        # as the incremental update would have.
+        if (self.restored):
+            self._set_warm_start()
+            self.restored = False
 
     def solve(self) -> None:
-        """_summary_
+        """Solve the model with the selected backend and keep the
+        placement found, if any, in self.placement. If there is none,
+        the record of the time slot is sent to the observers, since
+        step will not be called.
         """
-        self.model.optimize()
+        if (not self.observers):
+            self._solve()
+            return
+        start: float = time.perf_counter()
+        self._solve()
+        self.slot_record["solve_time"] = time.perf_counter() - start
+        if (self.solve_path != "cache" and self.screen_reason is None and
+            (not self.lp_warm_start or self.lp_bound is not None)):
+            self.slot_record.update(self.solver.stats if self.solver is not None else get_model_stats(self.model))
+        self.slot_record["z"] = self.objective if self.placement is not None else None
+        self.slot_record["solve_path"] = self.solve_path
+        self.slot_record["first_incumbent_time"] = self.first_incumbent_time
+        self.slot_record["migrations"] = self._count_migrations()
+        if (self.placement is None):
+            self._notify_observers()
+
+    def _count_migrations(self) -> int | None:
+        """Returns:
+            int | None: The replicas of every service that are deployed
+            in a UAV that did not host them in the previous time slot,
+            or None if there is no placement to compare with. Replicas
+            are counted per service, so swapping two replicas of the
+            same service is not a migration.
+        """
+        if (self.placement_matrix is None or self.last_placement_matrix is None):
+            return None
+        hosted: np.ndarray = np.zeros((len(self.uav_ids), len(self.catalog)))
+        np.add.at(hosted.T, self.instance_service, (self.placement_matrix - self.last_placement_matrix).T)
+        return int(np.maximum(0, np.round(hosted)).sum())
+
+    def _notify_observers(self) -> None:
+        """Send the record of the time slot to the observers."""
+        record: dict[str, Any] = {"slot": self.slot, **self.slot_record}
+        for observer in self.observers:
+            observer.on_slot(record)
+        self.slot_record = {}
+
+    def _solve(self) -> None:
+        """Solve the model of the time slot, or take its placement from
+        the placement cache or, if the time budget ran out, from the
+        previous time slot, the screening or the rounding of the LP
+        relaxation. Nothing is solved if the screening or the LP
+        relaxation proved the time slot infeasible.
+        """
+        self.placement = None
+        self.placement_matrix = None
+        self.slot_metrics = None
+        self.solve_path = None
+        runtime: float = 0.0
+        if (self.screening and self.screen_reason is not None):
+            return
+        problem: PlacementProblem | None = self.screen_problem if self.screening else None
+        cached: np.ndarray | None = None
+        if (self.placement_cache is not None):
+            problem = problem or self._get_placement_problem()
+            cached = self.placement_cache.get(problem)
+        if (self.lp_warm_start):
+            problem = problem or self._get_placement_problem()
+            self._round_relaxation(problem)
+            if (self.lp_bound is None):
+                return
+        if (cached is not None and self.placement_cache.reuse and problem.is_feasible(cached)):
+            self._keep_placement(problem, cached, "cache")
+        else:
+            if (cached is not None and self.own_model):
+                self._set_warm_start(dict(zip(self.placement_keys, cached.ravel().tolist())))
+            elif (self.rounded is not None and self.own_model and
+                  (self.last_placement_matrix is None or not problem.is_feasible(self.last_placement_matrix) or
+                   problem.get_battery_lvls(self.rounded).min() >
+                   problem.get_battery_lvls(self.last_placement_matrix).min())):
+                self._set_warm_start(dict(zip(self.placement_keys, self.rounded.ravel().tolist())))
+            elif (self.certificate is not None and self.own_model and
+                  (self.last_placement_matrix is None or not problem.is_feasible(self.last_placement_matrix))):
+                self._set_warm_start(dict(zip(self.placement_keys, self.certificate.ravel().tolist())))
+            runtime = self._run_solver()
+            if (self.placement is not None):
+                self.solve_path = "optimal" if self.status == 2 else "incumbent"
+                if (self.placement_cache is not None):
+                    self.placement_cache.put(problem, self.placement_matrix)
+            elif (self.time_budget is not None):
+                problem = problem or self._get_placement_problem()
+                if (self.last_placement_matrix is not None and problem.is_feasible(self.last_placement_matrix)):
+                    self._keep_placement(problem, self.last_placement_matrix, "fallback")
+                elif (self.certificate is not None):
+                    self._keep_placement(problem, self.certificate, "certificate")
+                elif (self.rounded is not None):
+                    self._keep_placement(problem, self.rounded, "rounding")
+        if (self.reference_backend is not None):
+            self._compare_with_reference(runtime)
+
+    def _round_relaxation(self, problem: PlacementProblem) -> None:
+        """Solve the LP relaxation of the time slot and round its
+        solution, keeping the bound (None if the relaxation is
+        infeasible) and the rounded placement (None if the rounding
+        failed).
+        """
+        start: float = time.perf_counter()
+        self.lp_bound = None
+        self.rounded = None
+        relaxation: tuple[float, np.ndarray] | None = LPRounding.solve_relaxation(problem)
+        if (relaxation is not None):
+            self.lp_bound = relaxation[0]
+            self.rounded = LPRounding.round(problem, relaxation[1])
+        if (self.observers):
+            self.slot_record["lp_time"] = time.perf_counter() - start
+            self.slot_record["lp_bound"] = self.lp_bound
+            self.slot_record["rounded_z"] = float(problem.get_battery_lvls(self.rounded).min())\
+                                            if self.rounded is not None else None
+
+    def _run_solver(self) -> float:
+        """Solve the model with the selected backend and set the
+        placement found, if any.
+
+        Returns:
+            float: The runtime of the solver.
+        """
+        placement: np.ndarray
+        if (not self.own_model):
+            self.solver.solve()
+            if (self.solver.placement is not None):
+                placement = self.solver.placement
+                if (self.formulation == "aggregated"):
+                    placement = self._expand_counts(placement)
+                self._set_placement(placement)
+            return self.solver.runtime
+        self.first_incumbent_time = None
+        if (self.time_budget is None):
+            self.model.optimize()
+        else:
+            # Gurobi stops at the time limit or at its MIPGap, whichever
+            # comes first, and keeps the best incumbent.
+            self.model.Params.TimeLimit = self.time_budget
+            self.model.optimize(self._incumbent_callback)
+        if (self.model.SolCount > 0 and self.formulation == "aggregated"):
+            counts: np.ndarray = np.array(self.model.getAttr("X", list(self.Y_u_s.values())))
+            self._set_placement(self._expand_counts(counts.reshape(len(self.uav_ids), -1)))
+        elif (self.model.SolCount > 0):
+            placement = np.array(self.model.getAttr("X", list(self.X_u_m.values())))
+            self._set_placement(placement.reshape(len(self.uav_ids), -1))
+        return self.model.Runtime
+
+    def _keep_placement(self, problem: PlacementProblem, placement: np.ndarray, solve_path: str) -> None:
+        """Deploy a placement that was not found by the solver in this
+        time slot.
+
+        Args:
+            problem (PlacementProblem): The problem of the time slot.
+            placement (np.ndarray): The placement (UAV × instance).
+            solve_path (str): Where it comes from ("cache",
+                "fallback", "certificate" or "rounding").
+        """
+        self.placement_objective = float(problem.get_battery_lvls(placement).min())
+        self._set_placement(placement)
+        self.solve_path = solve_path
+
+    def _incumbent_callback(self, model: gp.Model, where: int) -> None:
+        """Gurobi callback that records when the first incumbent of the
+        time slot was found.
+        """
+        if (where == gp.GRB.Callback.MIPSOL and self.first_incumbent_time is None):
+            self.first_incumbent_time = model.cbGet(gp.GRB.Callback.RUNTIME)
+
+    def _set_placement(self, placement: np.ndarray) -> None:
+        """Keep the placement of the time slot both as a matrix and as
+        a dict.
+
+        Args:
+            placement (np.ndarray): The placement of each instance
+                (UAV × instance).
+        """
+        self.placement_matrix = placement
+        self.placement = dict(zip(self.placement_keys, placement.ravel().tolist()))
+
+    def _compare_with_reference(self, runtime: float) -> None:
+        """Solve the current time slot with the reference backend and
+        record the gap in z with respect to the selected backend.
+
+        Args:
+            runtime (float): The time the selected backend took to
+                solve the time slot.
+        """
+        options: dict[str, Any] = {"env": self.env} if self.reference_backend == "gurobi" else {}
+        reference: SolverBackend = BACKENDS[self.reference_backend](**options)
+        reference.build(self.solver.problem if self.solver is not None else self._get_placement_problem())
+        reference.solve()
+        objective: float = self.objective if self.placement is not None else float("nan")
+        self.comparisons.append({"z": objective,
+                                 "z_reference": reference.objective,
+                                 "gap": reference.objective - objective,
+                                 "relative_gap": (reference.objective - objective) / reference.objective,
+                                 "runtime": runtime,
+                                 "reference_runtime": reference.runtime})
+        reference.dispose()
+
+    @property
+    def status(self) -> int:
+        """Returns:
+            int: The status of the last solve, as a gp.GRB.Status code,
+            whichever the backend.
+        """
+        if (not self.own_model):
+            return self.solver.status
+        return self.model.Status
+
+    @property
+    def objective(self) -> float:
+        """Returns:
+            float: The battery of the UAV with the least battery at the
+            end of the time slot (z) in the last solution, or in the
+            placement taken from the cache or kept as a fallback.
+        """
+        if (self.solve_path in ("cache", "fallback", "certificate", "rounding")):
+            return self.placement_objective
+        if (not self.own_model):
+            return self.solver.objective
+        return self.z.X
+
+    def get_slot_metrics(self) -> dict[str, np.ndarray]:
+        """Evaluate the placement of the time slot for all the UAVs at
+        once. The result is cached until the next solve or step, so
+        that print_solution, print_uavs_battery_lvls and step share it.
+
+        Returns:
+            dict[str, np.ndarray]: The services deployed in each UAV
+            (UAV × service, 0 or 1) and, for each UAV, its
+            cpu_utilization (0-1), uplink_data_rate and
+            downlink_data_rate (Mbps), step_consumption and battery at
+            the end of the time slot (Wh) and ram_usage (Gb).
+        """
+        if (self.slot_metrics is not None):
+            return self.slot_metrics
+        placement: np.ndarray = self.placement_matrix
+        requests: np.ndarray = self._get_request_matrix()
+        deployed: np.ndarray = np.zeros(requests.shape)
+        np.maximum.at(deployed.T, self.instance_service, (placement > 0.5).T.astype(float))
+        self.slot_metrics = {"services_deployed": deployed.astype(int),
+                             **PCM.evaluate_placements(fleet=self.fleet,
+                                                       catalog=self.catalog,
+                                                       requests=requests,
+                                                       placements=placement,
+                                                       time_slot_interval=self.time_slot_interval)}
+        return self.slot_metrics
 
     def print_solution(self) -> None:
-        """_summary_
+        """Print the placement of the time slot and the resulting
+        consumption of every UAV, and append it to self.output.
         """
-        output = pd.DataFrame()
-        vars = []
-        uav_deployment: list[str]
-        print_lambda = lambda x: f"{x[0]} {x[1]} {x[2]} {x[3]}"
+        metrics: dict[str, np.ndarray] = self.get_slot_metrics()
         uav_data: dict[str, Any]
-        uav_deployment_data: list[int]
-        for uav, uav_value in self.uavs.items():
-            ram_vars: dict[gp.Var, float] = {}
-            uav_data = {}
-            uav_deployment = ["×", "×", "×", "×"]
-            uav_deployment_data = [0, 0, 0, 0]
-            for i, serv in enumerate(self.services.keys()):
-                for instance in self.services[serv].keys():
-                    if (bool(self.X_u_m[uav, instance].X) == True):
-                                uav_deployment[i] = "✓"
-                                uav_deployment_data[i] = 1
-            uav_data["services_deployed"] = uav_deployment_data
-            cpu_utilization: gp.LinExpr = PCM.get_cpu_utilization(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            uav_data["cpu_utilization"] = cpu_utilization.getValue()*100
-
-            uplink_data_rate: gp.LinExpr = PCM.get_uplink_data_rate(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            uav_data["uplink_data_rate"] = uplink_data_rate.getValue()
-            downlink_data_rate: gp.LinExpr = PCM.get_downlink_data_rate(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            uav_data["downlink_data_rate"] = downlink_data_rate.getValue()
-            power_consumption: gp.LinExpr = PCM.get_energy_consumption(
-                cpu_utilization=cpu_utilization,
-                uplink_data_rate=uplink_data_rate,
-                downlink_data_rate=downlink_data_rate,
-                time_slot_interval=self.time_slot_interval)
-            uav_data["battery"] = uav_value['batt_lvl'] - power_consumption.getValue()
-            uav_data["step_consumption"] = power_consumption.getValue()
-            for serv in self.services.keys():
-                for instance_key, instance_value in self.services[serv].items():
-                    ram_vars[self.X_u_m[(uav, instance_key)]] = instance_value["ram_req"]
-            ram_usage: gp.LinExpr = gp.quicksum(
-                [var*coeff for var, coeff in ram_vars.items()])
-            uav_data["ram_usage"] = ram_usage.getValue()
-            self.output[uav].append(uav_data)
-            print(f"{str(uav).ljust(6)}: services -> {print_lambda(uav_deployment)}\tbattery -> {str(round(uav_value['batt_lvl'] - power_consumption.getValue(), 2)).ljust(5, '0')} Wh\tstep consumption -> {str(round(power_consumption.getValue(), 2)).ljust(4,'0')} Wh\tCPU -> {str(round(cpu_utilization.getValue()*100,2)).ljust(6)}%\tRAM -> {ram_usage.getValue()} Gb\tR down -> {str(round(downlink_data_rate.getValue(), 2)).ljust(5,'0')} Mbps\tR up -> {str(round(uplink_data_rate.getValue(), 2)).ljust(5,'0')} Mbps")
+        for i, uav in enumerate(self.uav_ids):
+            uav_deployment_data: list[int] = metrics["services_deployed"][i].tolist()
+            uav_deployment: str = " ".join("✓" if deployed else "×" for deployed in uav_deployment_data)
+            uav_data = {"services_deployed": uav_deployment_data,
+                        "cpu_utilization": float(metrics["cpu_utilization"][i])*100,
+                        "uplink_data_rate": float(metrics["uplink_data_rate"][i]),
+                        "downlink_data_rate": float(metrics["downlink_data_rate"][i]),
+                        "battery": float(metrics["battery"][i]),
+                        "step_consumption": float(metrics["step_consumption"][i]),
+                        "ram_usage": float(metrics["ram_usage"][i])}
+            if (self.result_writer is None):
+                self.output[uav].append(uav_data)
+            print(f"{str(uav).ljust(6)}: services -> {uav_deployment}\tbattery -> {str(round(uav_data['battery'], 2)).ljust(5, '0')} Wh\tstep consumption -> {str(round(uav_data['step_consumption'], 2)).ljust(4,'0')} Wh\tCPU -> {str(round(uav_data['cpu_utilization'],2)).ljust(6)}%\tRAM -> {uav_data['ram_usage']} Gb\tR down -> {str(round(uav_data['downlink_data_rate'], 2)).ljust(5,'0')} Mbps\tR up -> {str(round(uav_data['uplink_data_rate'], 2)).ljust(5,'0')} Mbps")
 
 
     def print_uavs_battery_lvls(self) -> None:
-        """_summary_
+        """Print the battery of every UAV at the end of the time slot.
         """
+        metrics: dict[str, np.ndarray] = self.get_slot_metrics()
+        for i, uav in enumerate(self.uav_ids):
+            print(f"{uav}: {round(metrics['battery'][i], 2)} Wh\t\t(step power consumption = {round(metrics['step_consumption'][i], 2)} Wh)")
 
-        for uav, uav_value in self.uavs.items():
-            cpu_utilization: gp.LinExpr = PCM.get_cpu_utilization(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            uplink_data_rate: gp.LinExpr = PCM.get_uplink_data_rate(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            downlink_data_rate: gp.LinExpr = PCM.get_downlink_data_rate(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            power_consumption: gp.LinExpr = PCM.get_energy_consumption(
-                cpu_utilization=cpu_utilization,
-                uplink_data_rate=uplink_data_rate,
-                downlink_data_rate=downlink_data_rate,
-                time_slot_interval=self.time_slot_interval)
-            print(f"{uav}: {round(uav_value['batt_lvl'] - power_consumption.getValue(), 2)} Wh\t\t(step power consumption = {round(power_consumption.getValue(), 2)} Wh)")
-
-    def step(self) -> None:
+    def step(self, requests: np.ndarray | None = None, batt_lvl: np.ndarray | None = None) -> None:
         """In every step new requests accumulate and UAV resources must
         be recalculated.
+
+        Args:
+            requests (np.ndarray | None): The observed requests of the
+                next time slot (UAV × service). They are drawn if None.
+            batt_lvl (np.ndarray | None): The measured battery levels
+                of the UAVs, instead of those predicted from the
+                placement of the time slot.
+
+        Raises:
+            ValueError: If the observed requests or battery levels do
+                not have the shape of the fleet. Nothing is changed.
+        """
+        self._check_observation(requests, batt_lvl)
+        if (not self.observers):
+            self._step(requests, batt_lvl)
+            self.slot += 1
+            return
+        start: float = time.perf_counter()
+        self._step(requests, batt_lvl)
+        self.slot_record["step_time"] = time.perf_counter() - start
+        self._notify_observers()
+        self.slot += 1
+
+    def _step(self, requests: np.ndarray | None = None, batt_lvl: np.ndarray | None = None) -> None:
+        """Update the battery levels and draw (or observe) the requests
+        of the next time slot.
         """
+        self.last_placement = self.placement
+        self.last_placement_matrix = self.placement_matrix
 
+        metrics: dict[str, np.ndarray] = self.get_slot_metrics()
+        if (self.result_writer is not None):
+            self.result_writer.write_slot(self.slot, self.uav_ids, metrics)
+        self.fleet.batt_lvl[:] = metrics["battery"]
+        self.slot_metrics = None
+        if (requests is None):
+            requests = self._generate_requests(self.uav_ids,
+                                               self.catalog.service_ids,
+                                               self.n_requests,
+                                               self.rng,
+                                               self.uav_weights,
+                                               self.service_weights)
+        self.observe(requests, batt_lvl)
 
-        for uav, uav_value in self.uavs.items():
-            cpu_utilization: gp.LinExpr = PCM.get_cpu_utilization(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            uplink_data_rate: gp.LinExpr = PCM.get_uplink_data_rate(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            downlink_data_rate: gp.LinExpr = PCM.get_downlink_data_rate(
-                services=self.services,
-                uav=(uav, uav_value),
-                requests=self.requests,
-                variables=self.X_u_m)
-            power_consumption: gp.LinExpr = PCM.get_energy_consumption(
-                cpu_utilization=cpu_utilization,
-                uplink_data_rate=uplink_data_rate,
-                downlink_data_rate=downlink_data_rate,
-                time_slot_interval=self.time_slot_interval)
+        if (not self.incremental):
+            self.model.dispose()
+            self.model = gp.Model(env=self.env)
+            self.model_built = False
 
-            self.uavs[uav]["batt_lvl"] -= power_consumption.getValue()
+    def observe(self, requests: np.ndarray, batt_lvl: np.ndarray | None = None) -> None:
+        """Set the inputs of the time slot that is solved next.
 
-        new_requests: dict[tuple[str, str], float] = RG.generate_requests(
-            uavs=self.uavs,
-            services=self.services,
-            n_requests=self.n_requests)
+        Args:
+            requests (np.ndarray): The requests of each UAV for each
+                service (UAV × service).
+            batt_lvl (np.ndarray | None): The battery levels of the
+                UAVs. They are kept if None.
+        """
+        self._check_observation(requests, batt_lvl)
+        self.request_matrix = requests.astype(float)
+        if (batt_lvl is not None):
+            self.fleet.batt_lvl[:] = batt_lvl
+        self.slot_metrics = None
 
-        for new_request_id, new_request_value in new_requests.items():
-            self.requests[new_request_id] = new_request_value
+    def _check_observation(self, requests: np.ndarray | None, batt_lvl: np.ndarray | None) -> None:
+        """Raise a ValueError if the observed requests or battery levels
+        do not have the shape of the fleet.
+        """
+        if (requests is not None and requests.shape != (len(self.uav_ids), len(self.catalog))):
+            raise ValueError(f"Expected {len(self.uav_ids)} × {len(self.catalog)} requests, got {requests.shape}")
+        if (batt_lvl is not None and batt_lvl.shape != self.fleet.batt_lvl.shape):
+            raise ValueError(f"Expected {len(self.uav_ids)} battery levels, got {batt_lvl.shape}")
+
+    def get_state(self) -> dict[str, Any]:
+        """Returns:
+            dict[str, Any]: What the next time slot starts from, for a
+            checkpoint: its index, the battery levels, its requests,
+            the state of rng and the placement of the previous time
+            slot, for the migrations and the fallback.
+        """
+        return {"slot": self.slot,
+                "batt_lvl": self.fleet.batt_lvl.copy(),
+                "request_matrix": self.request_matrix.copy(),
+                "rng_state": self.rng.bit_generator.state,
+                "last_placement_matrix": self.last_placement_matrix}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        """Continue from a state returned by get_state. The model is
+        built again (or updated) by the next setup_model.
+        """
+        self.slot = int(state["slot"])
+        self.observe(np.asarray(state["request_matrix"]), np.asarray(state["batt_lvl"]))
+        self.rng.bit_generator.state = state["rng_state"]
+        self.last_placement_matrix = state.get("last_placement_matrix")
+        self.last_placement = None
+        self.restored = self.incremental
+        if (self.last_placement_matrix is not None):
+            self.last_placement = dict(zip(self.placement_keys, self.last_placement_matrix.ravel().tolist()))
 
-        self.model = gp.Model(env=env)
+    def dispose(self) -> None:
+        """Free the resources of the model."""
+        self.model.dispose()
+        if (self.solver is not None):
+            self.solver.dispose()
 
     def output_to_csv(self, output_path: Path) -> None:
         """Save the results of the run to a file.
@@ -344,7 +1221,7 @@ class ServiceMigrator():
         """
 
         columns: list[str] = ["uav", "step"]
-        for i, _ in enumerate(self.services.keys()):
+        for i in range(len(self.catalog)):
             columns.append(f"service_{i}")
         columns += ["battery", "step_consumption", "cpu_utilization", "ram_usage", "downlink_data_rate", "uplink_data_rate"]
         output_data: list = []
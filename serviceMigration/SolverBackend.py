@@ -0,0 +1,1074 @@
+from abc import ABC, abstractmethod
+import atexit
+from dataclasses import dataclass
+import math
+import multiprocessing as mp
+import os
+import time
+from typing import Any
+import numpy as np
+import scipy.sparse as sp
+from Telemetry import get_model_stats
+
+_cluster_env: Any = None
+_cluster_pool: Any = None
+_cluster_pool_workers: int = 0
+
+
+@dataclass
+class PlacementProblem():
+    """The placement model of a time slot laid out as arrays, with the
+    UAVs as rows and the instances as columns. It is the input of every
+    SolverBackend. demand, if given, holds the requests of every UAV
+    for every service (UAV × service) of the time slot.
+    """
+
+    uav_ids: list
+    instance_ids: list[str]
+    service_ids: list[str]
+    instance_service: np.ndarray
+    ram_req: np.ndarray
+    ram_cap: np.ndarray
+    batt_lvl: np.ndarray
+    cpu_coeffs: np.ndarray
+    energy_coeffs: np.ndarray
+    energy_constant: np.ndarray
+    min_batt_lvl: float = 13.986
+    min_z: float = 0.3
+    replicas: np.ndarray | None = None
+    demand: np.ndarray | None = None
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Returns:
+            tuple[int, int]: The number of UAVs and of instances.
+        """
+        return self.cpu_coeffs.shape
+
+    def get_replicas(self) -> np.ndarray:
+        """Returns:
+            np.ndarray: The number of replicas each column must deploy,
+            1 for every instance unless the problem is aggregated.
+        """
+        if (self.replicas is None):
+            return np.ones(self.shape[1])
+        return self.replicas
+
+    def aggregate(self) -> "PlacementProblem":
+        """Returns the aggregated version of the problem, with one
+        integer column per service that counts the replicas of the
+        service hosted by each UAV instead of one binary column per
+        replica. The replicas of a service share their coefficients, so
+        both problems have the same optimal z.
+
+        Returns:
+            PlacementProblem: The aggregated problem.
+        """
+        services, first_instances = np.unique(self.instance_service, return_index=True)
+        return PlacementProblem(uav_ids=self.uav_ids,
+                                instance_ids=[self.service_ids[serv] for serv in services],
+                                service_ids=self.service_ids,
+                                instance_service=services,
+                                ram_req=self.ram_req[first_instances],
+                                ram_cap=self.ram_cap,
+                                batt_lvl=self.batt_lvl,
+                                cpu_coeffs=self.cpu_coeffs[:, first_instances],
+                                energy_coeffs=self.energy_coeffs[:, first_instances],
+                                energy_constant=self.energy_constant,
+                                min_batt_lvl=self.min_batt_lvl,
+                                min_z=self.min_z,
+                                replicas=np.bincount(self.instance_service)[services],
+                                demand=self.demand)
+
+    @staticmethod
+    def _get_block_matrix(coeffs: np.ndarray, z_coeff: float = 0.0) -> sp.csr_matrix:
+        """Lay out one row per UAV with its coefficients over the
+        flattened UAV × instance variables, followed by the column of z.
+
+        Args:
+            coeffs (np.ndarray): The coefficients (UAV × instance).
+            z_coeff (float): The coefficient of z in every row.
+
+        Returns:
+            sp.csr_matrix: The matrix of the constraints.
+        """
+        n_uavs, n_instances = coeffs.shape
+        n_cols: int = n_uavs * n_instances + 1
+        indices: np.ndarray = np.arange(n_uavs * n_instances).reshape(n_uavs, n_instances)
+        if (z_coeff == 0.0):
+            return sp.csr_matrix((coeffs.ravel(), indices.ravel(), np.arange(0, n_uavs * n_instances + 1, n_instances)),
+                                 shape=(n_uavs, n_cols))
+        data: np.ndarray = np.hstack([coeffs, np.full((n_uavs, 1), z_coeff)])
+        indices = np.hstack([indices, np.full((n_uavs, 1), n_uavs * n_instances)])
+        return sp.csr_matrix((data.ravel(), indices.ravel(), np.arange(0, n_uavs * (n_instances + 1) + 1, n_instances + 1)),
+                             shape=(n_uavs, n_cols))
+
+    def get_constraint_matrices(self) -> dict[str, tuple[sp.csr_matrix, str, np.ndarray]]:
+        """Returns the sets of constraints of the model over the
+        flattened UAV × instance variables followed by z, with the
+        senses of gp.GRB ("=", "<", ">").
+
+        Returns:
+            dict[str, tuple[sp.csr_matrix, str, np.ndarray]]: The
+            matrix, the sense and the right-hand side of the replica
+            (c1), RAM (c2), CPU (c3), battery floor (c4) and minimum
+            battery (c5) constraints.
+        """
+        n_uavs, n_instances = self.shape
+        replicas_matrix: sp.csr_matrix = sp.hstack([sp.kron(np.ones((1, n_uavs)), sp.eye(n_instances)),
+                                                    sp.csr_matrix((n_instances, 1))]).tocsr()
+        ram_coeffs: np.ndarray = np.tile(self.ram_req, (n_uavs, 1))
+        return {"c1": (replicas_matrix, "=", self.get_replicas().astype(float)),
+                "c2": (self._get_block_matrix(ram_coeffs), "<", self.ram_cap),
+                "c3": (self._get_block_matrix(self.cpu_coeffs), "<", np.ones(n_uavs)),
+                "c4": (self._get_block_matrix(-self.energy_coeffs), ">",
+                       self.min_batt_lvl - self.batt_lvl + self.energy_constant),
+                "c5": (self._get_block_matrix(-self.energy_coeffs, z_coeff=-1.0), ">",
+                       self.energy_constant - self.batt_lvl)}
+
+    def get_battery_lvls(self, placement: np.ndarray) -> np.ndarray:
+        """Returns:
+            np.ndarray: The battery level of each UAV at the end of the
+            time slot if placement (UAV × instance) is deployed.
+        """
+        return self.batt_lvl - self.energy_constant - (self.energy_coeffs * placement).sum(axis=1)
+
+    def get_min_energy(self) -> np.ndarray:
+        """Returns:
+            np.ndarray: The least energy each UAV can consume in the
+            time slot, hosting all the replicas that lower its
+            consumption and none of the others, regardless of its
+            capacity.
+        """
+        return self.energy_constant + (np.minimum(self.energy_coeffs, 0.0) * self.get_replicas()).sum(axis=1)
+
+    def get_candidates(self, tolerance: float = 1e-9) -> np.ndarray:
+        """Returns:
+            np.ndarray: False for the pairs (UAV × instance) that are
+            not part of any feasible placement: a single replica of the
+            instance exceeds the RAM or the CPU of the UAV, or takes
+            its battery below the floor even if it also hosts every
+            replica that lowers its consumption.
+        """
+        energy: np.ndarray = self.get_min_energy()[:, None] + np.maximum(self.energy_coeffs, 0.0)
+        return (self.ram_req <= self.ram_cap[:, None] + tolerance) &\
+               (self.cpu_coeffs <= 1.0 + tolerance) &\
+               (self.batt_lvl[:, None] - energy >= self.min_batt_lvl - tolerance)
+
+    def get_battery_bounds(self, candidates: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Returns:
+            tuple[np.ndarray, np.ndarray]: The lowest and the highest
+            battery each UAV can end the time slot with, hosting
+            replicas of the candidates (UAV × instance, every pair if
+            None) within its CPU. The energy of the replicas is bounded
+            by the fractional knapsack over the CPU, so the bounds are
+            valid but not tight.
+        """
+        replicas: np.ndarray = self.get_replicas()
+        energy_coeffs: np.ndarray = self.energy_coeffs * replicas
+        cpu_coeffs: np.ndarray = self.cpu_coeffs * replicas
+        if (candidates is not None):
+            energy_coeffs = np.where(candidates, energy_coeffs, 0.0)
+        battery: np.ndarray = self.batt_lvl - self.energy_constant
+        return (battery - self._get_max_knapsack(np.maximum(energy_coeffs, 0.0), cpu_coeffs),
+                battery + self._get_max_knapsack(np.maximum(-energy_coeffs, 0.0), cpu_coeffs))
+
+    @staticmethod
+    def _get_max_knapsack(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Returns:
+            np.ndarray: For each row, the highest total value of the
+            columns (values × weights) whose total weight is at most 1,
+            taking fractions of them.
+        """
+        order: np.ndarray = np.argsort(-values / np.maximum(weights, 1e-12), axis=1, kind="stable")
+        values = np.take_along_axis(values, order, axis=1)
+        weights = np.take_along_axis(weights, order, axis=1)
+        free: np.ndarray = 1.0 - (np.cumsum(weights, axis=1) - weights)
+        fraction: np.ndarray = np.clip(free / np.maximum(weights, 1e-12), 0.0, 1.0)
+        return (values * fraction).sum(axis=1)
+
+    def is_feasible(self, placement: np.ndarray, tolerance: float = 1e-6) -> bool:
+        """Returns:
+            bool: True if placement (UAV × instance) deploys every
+            replica and respects the RAM, CPU and battery floor
+            constraints of the time slot.
+        """
+        return bool(np.allclose(placement.sum(axis=0), self.get_replicas(), atol=tolerance) and\
+                    (placement @ self.ram_req <= self.ram_cap + tolerance).all() and\
+                    ((self.cpu_coeffs * placement).sum(axis=1) <= 1.0 + tolerance).all() and\
+                    (self.get_battery_lvls(placement) >= self.min_batt_lvl - tolerance).all())
+
+
+class SolverBackend(ABC):
+    """Interface of the engines that solve a PlacementProblem. The
+    status codes follow gp.GRB.Status (2 optimal, 3 infeasible, 9 time
+    limit...). time_limit_option is the option that limits the solve
+    time of the engine (in seconds), None if it has no such option.
+    """
+
+    name: str = ""
+    time_limit_option: str | None = None
+    tolerance: float = 1e-6
+
+    def __init__(self, **options) -> None:
+        """Args:
+            options: Engine specific options, plus reduced (solve the
+                reduced model of MilpBackend, ignored by HeuristicBackend).
+        """
+        self.reduced: bool = options.pop("reduced", False)
+        self.options: dict = options
+        self.problem: PlacementProblem
+        self.status: int = 1
+        self.objective: float = float("nan")
+        self.placement: np.ndarray | None = None
+        self.build_time: float = 0.0
+        self.runtime: float = 0.0
+        self.stats: dict[str, Any] = {}
+
+    @abstractmethod
+    def build(self, problem: PlacementProblem) -> None:
+        """Prepare the engine to solve problem."""
+
+    @abstractmethod
+    def solve(self) -> None:
+        """Solve the problem given to build and set status, objective,
+        placement (UAV × instance, None if no solution was found) and
+        stats (the model size and solve statistics, with the keys of
+        the Telemetry.SlotObserver records).
+        """
+
+    def dispose(self) -> None:
+        """Free the resources of the engine."""
+        pass
+
+
+class MilpBackend(SolverBackend):
+    """Base of the MILP engines, which can also solve a reduced model
+    (option reduced=True): the variables of the pairs that
+    PlacementProblem.get_candidates rules out are not created, the
+    battery floor (c4) and z (c5) rows of a UAV are left out when its
+    battery bounds show they cannot bind. If lazy_initial_rows is
+    given, the model starts with the rest of the rows of only that
+    many UAVs, those with the lowest highest battery, and the rows
+    that the solution violates are added and the model solved again
+    until it violates none (at most lazy_max_rounds times). By default
+    (lazy_initial_rows_default None), every row that can bind is in
+    the model from the start.
+    """
+
+    lazy_initial_rows_default: int | None = None
+
+    def __init__(self, **options) -> None:
+        """Args:
+            options: Engine specific options, plus reduced,
+                lazy_initial_rows and lazy_max_rounds.
+        """
+        self.lazy_initial_rows: int | None = options.pop("lazy_initial_rows", self.lazy_initial_rows_default)
+        self.lazy_max_rounds: int = options.pop("lazy_max_rounds", 50)
+        super().__init__(**options)
+        self.columns: np.ndarray | None = None
+        self.lazy_rows: dict[str, tuple[sp.csr_matrix, str, np.ndarray]] = {}
+        self.pending_rows: dict[str, np.ndarray] = {}
+        self.lazy_rounds: int = 0
+
+    def _get_constraints(self, problem: PlacementProblem) -> list[tuple[sp.csr_matrix, str, np.ndarray]]:
+        """Returns the constraints the model is built with: every
+        constraint of problem or, in a reduced model, the constraints
+        over the candidate variables (self.columns, followed by z)
+        with only the initial battery rows. The other battery rows
+        that can bind are kept in self.lazy_rows.
+
+        Returns:
+            list[tuple[sp.csr_matrix, str, np.ndarray]]: The matrix,
+            the sense and the right-hand side of each set.
+        """
+        matrices: dict[str, tuple[sp.csr_matrix, str, np.ndarray]] = problem.get_constraint_matrices()
+        if (not self.reduced):
+            self.columns = None
+            return list(matrices.values())
+        n_uavs, n_instances = problem.shape
+        candidates: np.ndarray = problem.get_candidates()
+        self.columns = np.flatnonzero(candidates.ravel())
+        keep: np.ndarray = np.append(self.columns, n_uavs * n_instances)
+        lowest, highest = problem.get_battery_bounds(candidates)
+        max_z: float = min(highest.min(), problem.batt_lvl.max())
+        self.pending_rows = {"c4": lowest < problem.min_batt_lvl + self.tolerance,
+                             "c5": lowest < max_z + self.tolerance}
+        self.lazy_rows = {family: (matrices[family][0][:, keep], matrices[family][1], matrices[family][2])
+                          for family in self.pending_rows.keys()}
+        self.lazy_rounds = 0
+        initial: np.ndarray = np.ones(n_uavs, dtype=bool)
+        if (self.lazy_initial_rows is not None):
+            initial[np.argsort(highest, kind="stable")[self.lazy_initial_rows:]] = False
+        constraints: list[tuple[sp.csr_matrix, str, np.ndarray]] = [
+            (matrices[family][0][:, keep], matrices[family][1], matrices[family][2]) for family in ("c1", "c2", "c3")]
+        return constraints + self._pop_lazy_rows(initial)
+
+    def _pop_lazy_rows(self, uavs: np.ndarray) -> list[tuple[sp.csr_matrix, str, np.ndarray]]:
+        """Returns:
+            list[tuple[sp.csr_matrix, str, np.ndarray]]: The pending
+            battery rows of the UAVs (a boolean mask), which are no
+            longer pending.
+        """
+        rows: list[tuple[sp.csr_matrix, str, np.ndarray]] = []
+        for family, pending in self.pending_rows.items():
+            selected: np.ndarray = np.flatnonzero(pending & uavs)
+            if (selected.size > 0):
+                matrix, sense, rhs = self.lazy_rows[family]
+                rows.append((matrix[selected], sense, rhs[selected]))
+                pending[selected] = False
+        return rows
+
+    def _get_violated_rows(self, placement: np.ndarray, z: float) -> list[tuple[sp.csr_matrix, str, np.ndarray]]:
+        """Returns:
+            list[tuple[sp.csr_matrix, str, np.ndarray]]: The pending
+            battery rows that placement (UAV × instance) and z violate,
+            which are no longer pending.
+        """
+        battery: np.ndarray = self.problem.get_battery_lvls(placement)
+        violated: np.ndarray = (self.pending_rows["c4"] & (battery < self.problem.min_batt_lvl - self.tolerance)) |\
+                               (self.pending_rows["c5"] & (battery < z - self.tolerance))
+        return self._pop_lazy_rows(violated)
+
+    def _expand(self, values: np.ndarray) -> np.ndarray:
+        """Returns:
+            np.ndarray: The placement (UAV × instance) of the values of
+            the placement variables of the model.
+        """
+        if (self.columns is None):
+            return np.round(values).reshape(self.problem.shape)
+        placement: np.ndarray = np.zeros(self.problem.shape[0] * self.problem.shape[1])
+        placement[self.columns] = np.round(values)
+        return placement.reshape(self.problem.shape)
+
+    def _get_upper_bounds(self) -> np.ndarray:
+        """Returns:
+            np.ndarray: The upper bound of each placement variable of
+            the model.
+        """
+        upper_bounds: np.ndarray = np.tile(self.problem.get_replicas(), self.problem.shape[0])
+        if (self.columns is None):
+            return upper_bounds
+        return upper_bounds[self.columns]
+
+    def _solve_rounds(self) -> None:
+        """Solve the model and set status, objective, placement and
+        runtime. A reduced model is solved again with the lazy rows
+        that its solution violates until it violates none, all the
+        rounds sharing the time limit of the options. If the last
+        round still violates some, its placement is kept with status
+        13 (SUBOPTIMAL) when it is feasible for the whole model.
+        """
+        start: float = time.perf_counter()
+        time_limit: float | None = self.options.get(self.time_limit_option) if self.time_limit_option else None
+        self.lazy_rounds = 0
+        while (True):
+            remaining: float | None = None
+            if (time_limit is not None):
+                remaining = max(0.0, time_limit - (time.perf_counter() - start))
+            values: np.ndarray | None = self._optimize(remaining)
+            self.lazy_rounds += 1
+            if (values is None):
+                self.placement = None
+                self.objective = float("nan")
+                break
+            self.placement = self._expand(values[:-1])
+            self.objective = float(values[-1])
+            if (not self.reduced):
+                break
+            violated: list[tuple[sp.csr_matrix, str, np.ndarray]] = self._get_violated_rows(self.placement,
+                                                                                            self.objective)
+            if (not violated):
+                break
+            if (self.lazy_rounds >= self.lazy_max_rounds or
+                (time_limit is not None and time.perf_counter() - start >= time_limit)):
+                if (self.problem.is_feasible(self.placement)):
+                    self.status = 13
+                    self.objective = float(self.problem.get_battery_lvls(self.placement).min())
+                else:
+                    self.status = 9 if self.lazy_rounds < self.lazy_max_rounds else 7
+                    self.placement = None
+                    self.objective = float("nan")
+                break
+            for matrix, sense, rhs in violated:
+                self._add_rows(matrix, sense, rhs)
+        self.runtime = time.perf_counter() - start
+
+    @abstractmethod
+    def _optimize(self, time_limit: float | None) -> np.ndarray | None:
+        """Solve the model once and set status.
+
+        Args:
+            time_limit (float | None): The seconds left, None if there
+                is no limit.
+
+        Returns:
+            np.ndarray | None: The values of the variables of the model
+            (the placement variables followed by z), or None if no
+            solution was found.
+        """
+
+    @abstractmethod
+    def _add_rows(self, matrix: sp.csr_matrix, sense: str, rhs: np.ndarray) -> None:
+        """Add a set of constraints over the variables of the model."""
+
+    def _get_reduction_stats(self) -> dict[str, Any]:
+        """Returns:
+            dict[str, Any]: The variables pruned, the battery rows that
+            were never added and the rounds solved by a reduced model.
+        """
+        if (self.columns is None):
+            return {}
+        return {"pruned_vars": self.problem.shape[0] * self.problem.shape[1] - self.columns.size,
+                "pending_rows": int(sum(pending.sum() for pending in self.pending_rows.values())),
+                "lazy_rounds": self.lazy_rounds}
+
+
+class HighsBackend(MilpBackend):
+    """Solves the placement model with the open-source HiGHS MILP solver
+    through scipy.optimize.milp. Options: time_limit (s), mip_rel_gap
+    and presolve.
+    """
+
+    name: str = "highs"
+    time_limit_option: str | None = "time_limit"
+
+    def build(self, problem: PlacementProblem) -> None:
+        start: float = time.perf_counter()
+        from scipy.optimize import Bounds
+        self.problem = problem
+        self.matrices: list[sp.csr_matrix] = []
+        self.lower: list[np.ndarray] = []
+        self.upper: list[np.ndarray] = []
+        for matrix, sense, rhs in self._get_constraints(problem):
+            self._add_rows(matrix, sense, rhs)
+        n_vars: int = self.matrices[0].shape[1]
+        self.c: np.ndarray = np.zeros(n_vars)
+        self.c[-1] = -1.0
+        self.integrality: np.ndarray = np.ones(n_vars)
+        self.integrality[-1] = 0
+        lb: np.ndarray = np.zeros(n_vars)
+        ub: np.ndarray = np.ones(n_vars)
+        ub[:-1] = self._get_upper_bounds()
+        lb[-1] = problem.min_z
+        ub[-1] = problem.batt_lvl.max()
+        self.bounds: Bounds = Bounds(lb, ub)
+        self._stack_constraints()
+        self.build_time = time.perf_counter() - start
+
+    def _add_rows(self, matrix: sp.csr_matrix, sense: str, rhs: np.ndarray) -> None:
+        self.matrices.append(matrix)
+        self.lower.append(rhs if sense in ("=", ">") else np.full(rhs.shape, -np.inf))
+        self.upper.append(rhs if sense in ("=", "<") else np.full(rhs.shape, np.inf))
+        self.constraints = None
+
+    def _stack_constraints(self) -> None:
+        """Join the sets of constraints into the LinearConstraint given
+        to milp.
+        """
+        from scipy.optimize import LinearConstraint
+        self.constraints: LinearConstraint | None = LinearConstraint(sp.vstack(self.matrices).tocsr(),
+                                                                     np.concatenate(self.lower),
+                                                                     np.concatenate(self.upper))
+
+    def solve(self) -> None:
+        self._solve_rounds()
+        self.stats = {"num_vars": self.c.size,
+                      "num_constrs": self.constraints.A.shape[0],
+                      "num_nzs": self.constraints.A.nnz,
+                      "runtime": self.runtime,
+                      "node_count": getattr(self.result, "mip_node_count", None),
+                      "mip_gap": getattr(self.result, "mip_gap", None),
+                      "status": self.status,
+                      **self._get_reduction_stats()}
+
+    def _optimize(self, time_limit: float | None) -> np.ndarray | None:
+        from scipy.optimize import milp
+        if (self.constraints is None):
+            self._stack_constraints()
+        options: dict = dict(self.options)
+        if (time_limit is not None):
+            options["time_limit"] = time_limit
+        self.result = milp(c=self.c,
+                           integrality=self.integrality,
+                           bounds=self.bounds,
+                           constraints=self.constraints,
+                           options=options)
+        # scipy.optimize.milp status: 0 optimal, 1 iteration or time
+        # limit, 2 infeasible, 3 unbounded, 4 other.
+        self.status = {0: 2, 1: 9, 2: 3, 3: 5}.get(self.result.status, 1)
+        return self.result.x
+
+
+class GurobiBackend(MilpBackend):
+    """Solves the placement model with Gurobi through the matrix API.
+    Options: env (gp.Env) and any Gurobi parameter (e.g. TimeLimit).
+    A reduced model adds its lazy rows from a callback within a single
+    solve, so it starts with the rows of 8 UAVs by default.
+    """
+
+    name: str = "gurobi"
+    time_limit_option: str | None = "TimeLimit"
+    lazy_initial_rows_default: int | None = 8
+
+    def build(self, problem: PlacementProblem) -> None:
+        import gurobipy as gp
+        start: float = time.perf_counter()
+        self.problem = problem
+        options: dict = dict(self.options)
+        self.model: gp.Model = gp.Model(env=options.pop("env", None))
+        self.model.Params.OutputFlag = 0
+        for param, value in options.items():
+            self.model.setParam(param, value)
+        constraints: list[tuple[sp.csr_matrix, str, np.ndarray]] = self._get_constraints(problem)
+        upper_bounds: np.ndarray = self._get_upper_bounds()
+        self.X: gp.MVar = self.model.addMVar(shape=upper_bounds.shape,
+                                             vtype=gp.GRB.INTEGER,
+                                             ub=upper_bounds)
+        self.z: gp.Var = self.model.addVar(lb=problem.min_z, ub=problem.batt_lvl.max())
+        self.model.update()
+        for matrix, sense, rhs in constraints:
+            self._add_rows(matrix, sense, rhs)
+        self.model.setObjective(self.z, gp.GRB.MAXIMIZE)
+        self.model.update()
+        self.build_time = time.perf_counter() - start
+
+    def _add_rows(self, matrix: sp.csr_matrix, sense: str, rhs: np.ndarray) -> None:
+        self.model.addMConstr(matrix, None, sense, rhs)
+
+    def solve(self) -> None:
+        if (self.reduced):
+            self._solve_lazily()
+        else:
+            self._solve_rounds()
+        self.stats = {**get_model_stats(self.model), "status": self.status}
+        if (self.reduced):
+            self.stats.update(self._get_reduction_stats())
+
+    def _solve_lazily(self) -> None:
+        """Solve a reduced model in a single branch and bound, adding
+        the pending battery rows that an incumbent violates as lazy
+        constraints from a callback, instead of solving it again.
+        """
+        import gurobipy as gp
+        self.variables: list[gp.Var] = self.X.tolist() + [self.z]
+        self.model.Params.LazyConstraints = 1
+        start: float = time.perf_counter()
+        self.model.optimize(self._lazy_callback)
+        self.runtime = time.perf_counter() - start
+        self.status = self.model.Status
+        if (self.model.SolCount == 0):
+            self.placement = None
+            self.objective = float("nan")
+            return
+        self.placement = self._expand(self.X.X)
+        self.objective = self.z.X
+
+    def _lazy_callback(self, model: Any, where: int) -> None:
+        """Gurobi callback that adds the pending battery rows violated
+        by every new incumbent.
+        """
+        import gurobipy as gp
+        if (where != gp.GRB.Callback.MIPSOL):
+            return
+        values: np.ndarray = np.array(model.cbGetSolution(self.variables))
+        violated: list[tuple[sp.csr_matrix, str, np.ndarray]] = self._get_violated_rows(self._expand(values[:-1]),
+                                                                                        values[-1])
+        if (violated):
+            self.lazy_rounds += 1
+        for matrix, sense, rhs in violated:
+            for row in range(matrix.shape[0]):
+                start, end = matrix.indptr[row], matrix.indptr[row + 1]
+                lin_expr: gp.LinExpr = gp.LinExpr(matrix.data[start:end].tolist(),
+                                                  [self.variables[col] for col in matrix.indices[start:end]])
+                model.cbLazy(lin_expr >= rhs[row] if sense == ">" else lin_expr <= rhs[row])
+
+    def _optimize(self, time_limit: float | None) -> np.ndarray | None:
+        if (time_limit is not None):
+            self.model.Params.TimeLimit = time_limit
+        self.model.optimize()
+        self.status = self.model.Status
+        if (self.model.SolCount == 0):
+            return None
+        return np.append(self.X.X, self.z.X)
+
+    def dispose(self) -> None:
+        self.model.dispose()
+
+
+class HeuristicBackend(SolverBackend):
+    """Places the instances without a MILP solver. A greedy pass assigns
+    the instances, largest RAM first, to the feasible UAV that leaves
+    the highest minimum battery. A local search then moves or swaps the
+    instances of the UAV with the least battery while that raises the
+    minimum. It respects the replica, RAM, CPU and battery floor
+    constraints, but the result is not proven optimal, so a placement
+    is reported with status 13 (SUBOPTIMAL) and a failure to place an
+    instance with status 3 (INFEASIBLE). Options: max_iterations of the
+    local search (default 1000).
+    """
+
+    name: str = "heuristic"
+    eps: float = 1e-9
+
+    def build(self, problem: PlacementProblem) -> None:
+        if ((problem.get_replicas() != 1).any()):
+            raise ValueError("HeuristicBackend does not support aggregated problems")
+        self.problem = problem
+
+    def solve(self) -> None:
+        start: float = time.perf_counter()
+        assignment: np.ndarray | None = self._greedy()
+        if (assignment is None):
+            self.status = 3
+            self.placement = None
+            self.objective = float("nan")
+        else:
+            assignment = self._local_search(assignment)
+            n_uavs, n_instances = self.problem.shape
+            self.placement = np.zeros((n_uavs, n_instances))
+            self.placement[assignment, np.arange(n_instances)] = 1.0
+            self.status = 13
+            self.objective = self.problem.get_battery_lvls(self.placement).min()
+        self.runtime = time.perf_counter() - start
+        n_uavs, n_instances = self.problem.shape
+        self.stats = {"num_vars": n_uavs * n_instances,
+                      "num_constrs": None,
+                      "num_nzs": None,
+                      "runtime": self.runtime,
+                      "node_count": None,
+                      "mip_gap": None,
+                      "status": self.status}
+
+    def _greedy(self) -> np.ndarray | None:
+        """Returns:
+            np.ndarray | None: The UAV that hosts each instance, or None
+            if an instance does not fit in any UAV.
+        """
+        problem: PlacementProblem = self.problem
+        n_uavs, n_instances = problem.shape
+        self.ram_used: np.ndarray = np.zeros(n_uavs)
+        self.cpu_used: np.ndarray = np.zeros(n_uavs)
+        self.battery: np.ndarray = problem.batt_lvl - problem.energy_constant
+        assignment: np.ndarray = np.full(n_instances, -1)
+        for instance in np.argsort(-problem.ram_req, kind="stable"):
+            new_battery: np.ndarray = self.battery - problem.energy_coeffs[:, instance]
+            feasible: np.ndarray = (self.ram_used + problem.ram_req[instance] <= problem.ram_cap + self.eps) &\
+                                   (self.cpu_used + problem.cpu_coeffs[:, instance] <= 1.0 + self.eps) &\
+                                   (new_battery >= problem.min_batt_lvl - self.eps)
+            if (not feasible.any()):
+                return None
+            new_min: np.ndarray = np.minimum(self._min_excluding(self.battery), new_battery)
+            new_min[~feasible] = -np.inf
+            candidates: np.ndarray = np.flatnonzero(new_min >= new_min.max() - self.eps)
+            uav: int = candidates[np.argmax(new_battery[candidates])]
+            self._assign(instance, uav, 1.0)
+            assignment[instance] = uav
+        return assignment
+
+    def _local_search(self, assignment: np.ndarray) -> np.ndarray:
+        """Move or swap the instances of the UAV with the least battery
+        while that raises the minimum battery.
+
+        Args:
+            assignment (np.ndarray): The UAV that hosts each instance.
+
+        Returns:
+            np.ndarray: The improved assignment.
+        """
+        problem: PlacementProblem = self.problem
+        n_uavs, _ = problem.shape
+        for _ in range(self.options.get("max_iterations", 1000)):
+            order: np.ndarray = np.argsort(self.battery, kind="stable")
+            worst: int = order[0]
+            current_min: float = self.battery[worst]
+            best: tuple[float, int, int, int] = (current_min + self.eps, -1, -1, -1)
+            for instance in np.flatnonzero(assignment == worst):
+                # Move instance from worst to any other UAV.
+                worst_battery: float = self.battery[worst] + problem.energy_coeffs[worst, instance]
+                new_battery: np.ndarray = self.battery - problem.energy_coeffs[:, instance]
+                feasible: np.ndarray = (self.ram_used + problem.ram_req[instance] <= problem.ram_cap + self.eps) &\
+                                       (self.cpu_used + problem.cpu_coeffs[:, instance] <= 1.0 + self.eps) &\
+                                       (new_battery >= problem.min_batt_lvl - self.eps)
+                feasible[worst] = False
+                others_min: np.ndarray = np.where(np.arange(n_uavs) == order[1],
+                                                  self.battery[order[2]] if n_uavs > 2 else np.inf,
+                                                  self.battery[order[1]] if n_uavs > 1 else np.inf)
+                new_min: np.ndarray = np.minimum(np.minimum(others_min, new_battery), worst_battery)
+                new_min[~feasible] = -np.inf
+                uav: int = int(np.argmax(new_min))
+                if (new_min[uav] > best[0]):
+                    best = (new_min[uav], instance, uav, -1)
+                # Swap instance with an instance hosted by another UAV.
+                others: np.ndarray = np.flatnonzero(assignment != worst)
+                if (others.size == 0):
+                    continue
+                hosts: np.ndarray = assignment[others]
+                worst_battery_swap: np.ndarray = worst_battery - problem.energy_coeffs[worst, others]
+                host_battery: np.ndarray = self.battery[hosts] + problem.energy_coeffs[hosts, others] -\
+                                           problem.energy_coeffs[hosts, instance]
+                feasible = (self.ram_used[worst] - problem.ram_req[instance] + problem.ram_req[others] <= problem.ram_cap[worst] + self.eps) &\
+                           (self.ram_used[hosts] - problem.ram_req[others] + problem.ram_req[instance] <= problem.ram_cap[hosts] + self.eps) &\
+                           (self.cpu_used[worst] - problem.cpu_coeffs[worst, instance] + problem.cpu_coeffs[worst, others] <= 1.0 + self.eps) &\
+                           (self.cpu_used[hosts] - problem.cpu_coeffs[hosts, others] + problem.cpu_coeffs[hosts, instance] <= 1.0 + self.eps) &\
+                           (np.minimum(worst_battery_swap, host_battery) >= problem.min_batt_lvl - self.eps)
+                others_min = np.where(hosts == order[1],
+                                      self.battery[order[2]] if n_uavs > 2 else np.inf,
+                                      self.battery[order[1]] if n_uavs > 1 else np.inf)
+                new_min = np.minimum(np.minimum(others_min, worst_battery_swap), host_battery)
+                new_min[~feasible] = -np.inf
+                k: int = int(np.argmax(new_min))
+                if (new_min[k] > best[0]):
+                    best = (new_min[k], instance, hosts[k], others[k])
+            _, instance, uav, other = best
+            if (instance < 0):
+                break
+            self._assign(instance, worst, -1.0)
+            self._assign(instance, uav, 1.0)
+            assignment[instance] = uav
+            if (other >= 0):
+                self._assign(other, uav, -1.0)
+                self._assign(other, worst, 1.0)
+                assignment[other] = worst
+        return assignment
+
+    def _assign(self, instance: int, uav: int, sign: float) -> None:
+        """Add (sign 1) or remove (sign -1) instance to/from uav."""
+        self.ram_used[uav] += sign * self.problem.ram_req[instance]
+        self.cpu_used[uav] += sign * self.problem.cpu_coeffs[uav, instance]
+        self.battery[uav] -= sign * self.problem.energy_coeffs[uav, instance]
+
+    @staticmethod
+    def _min_excluding(values: np.ndarray) -> np.ndarray:
+        """Returns:
+            np.ndarray: For each position, the minimum of values
+            without that position.
+        """
+        if (values.size == 1):
+            return np.full(1, np.inf)
+        order: np.ndarray = np.argsort(values, kind="stable")
+        result: np.ndarray = np.full(values.shape, values[order[0]])
+        result[order[0]] = values[order[1]]
+        return result
+
+
+def _get_cluster_env() -> Any:
+    """Returns:
+        gp.Env: The Gurobi environment of the cluster subproblems solved
+        in this process, started silently on first use.
+    """
+    global _cluster_env
+    if (_cluster_env is None):
+        import gurobipy as gp
+        _cluster_env = gp.Env(empty=True)
+        _cluster_env.setParam("OutputFlag", 0)
+        _cluster_env.start()
+    return _cluster_env
+
+
+def _get_cluster_pool(workers: int) -> Any:
+    """Returns:
+        mp.pool.Pool: The pool of worker processes of
+        DecompositionBackend, shared by its instances (one per time
+        slot) and started on first use, or again if the number of
+        workers changes.
+    """
+    global _cluster_pool, _cluster_pool_workers
+    if (_cluster_pool is None or _cluster_pool_workers != workers):
+        close_cluster_pool()
+        _cluster_pool = mp.get_context("spawn").Pool(processes=workers)
+        _cluster_pool_workers = workers
+    return _cluster_pool
+
+
+@atexit.register
+def close_cluster_pool() -> None:
+    """Stop the worker processes of DecompositionBackend, if they were
+    started. The next instance starts them again. It also runs when the
+    interpreter exits.
+    """
+    global _cluster_pool, _cluster_pool_workers
+    if (_cluster_pool is None):
+        return
+    _cluster_pool.close()
+    _cluster_pool.join()
+    _cluster_pool = None
+    _cluster_pool_workers = 0
+
+
+def _solve_cluster(args: tuple[str, dict[str, Any], PlacementProblem]
+                   ) -> tuple[int, float, np.ndarray | None, dict[str, Any]]:
+    """Solve the subproblem of a cluster of DecompositionBackend, in
+    this process or in a worker process.
+
+    Args:
+        args (tuple[str, dict[str, Any], PlacementProblem]): The name
+            of the backend, its options and the subproblem.
+
+    Returns:
+        tuple[int, float, np.ndarray | None, dict[str, Any]]: The
+        status, the objective, the placement and the stats of the
+        backend.
+    """
+    name, options, problem = args
+    if (problem.shape[1] == 0):
+        battery: np.ndarray = problem.batt_lvl - problem.energy_constant
+        if ((battery < problem.min_batt_lvl - SolverBackend.tolerance).any()):
+            return 3, float("nan"), None, {}
+        return 2, float(battery.min()), np.zeros(problem.shape), {}
+    if (name == "gurobi" and options.get("env") is None):
+        options = {**options, "env": _get_cluster_env()}
+    backend: SolverBackend = BACKENDS[name](**options)
+    backend.build(problem)
+    backend.solve()
+    backend.dispose()
+    return backend.status, backend.objective, backend.placement, backend.stats
+
+
+class DecompositionBackend(SolverBackend):
+    """Splits the fleet into clusters of about cluster_size UAVs, which
+    only share the replica constraints and z, and gives each cluster a
+    share of the replicas of every service proportional to the requests
+    of its UAVs for the service (largest remainder). The aggregated
+    subproblems of the clusters are solved independently by the MILP
+    backend named by the option backend, in parallel worker processes,
+    so the solve time grows with the number of clusters rather than
+    with the size of the monolithic model.
+
+    A reconciliation pass then moves replicas between clusters: first
+    out of the clusters that are infeasible with their share, to the
+    feasible cluster with the most free RAM, then from the cluster with
+    the lowest z, the most consuming replica of its worst UAV, to the
+    cluster with the highest z, as long as that raises the lowest z.
+    Only the clusters involved in a move are solved again. The
+    placement is not proven optimal, so it is reported with status 13
+    (SUBOPTIMAL), or 3 (INFEASIBLE) if some cluster stays infeasible.
+
+    By default the UAVs are sorted by battery and dealt to the clusters
+    in turn, so every cluster has a similar mix of batteries. Options:
+    cluster_size (default 25), clusters (the cluster of every UAV
+    instead, e.g. from their positions), backend ("highs" or "gurobi",
+    default "highs"), workers (default one per core; with 1, or in a
+    daemonic process such as the workers of SweepRunner, the clusters
+    are solved in this process), max_moves of the reconciliation
+    (default 50), time_limit (s, of every subproblem) and the options
+    of the backend.
+    """
+
+    name: str = "decomposition"
+    time_limit_option: str | None = "time_limit"
+
+    def build(self, problem: PlacementProblem) -> None:
+        start: float = time.perf_counter()
+        options: dict[str, Any] = dict(self.options)
+        self.cluster_size: int = options.pop("cluster_size", 25)
+        labels: np.ndarray | None = options.pop("clusters", None)
+        self.backend: str = options.pop("backend", "highs")
+        if (self.backend not in ("highs", "gurobi")):
+            raise ValueError(f"DecompositionBackend needs a MILP backend, got {self.backend}")
+        self.workers: int = options.pop("workers", None) or os.cpu_count() or 1
+        self.max_moves: int = options.pop("max_moves", 50)
+        time_limit: float | None = options.pop("time_limit", None)
+        if (time_limit is not None and BACKENDS[self.backend].time_limit_option is not None):
+            options[BACKENDS[self.backend].time_limit_option] = time_limit
+        if (self.reduced):
+            options["reduced"] = True
+        self.backend_options: dict[str, Any] = options
+        self.problem = problem
+        self.aggregated: PlacementProblem = problem if problem.replicas is not None else problem.aggregate()
+        n_uavs: int = problem.shape[0]
+        if (labels is None):
+            n_clusters: int = max(1, math.ceil(n_uavs / self.cluster_size))
+            labels = np.empty(n_uavs, dtype=int)
+            labels[np.argsort(problem.batt_lvl - problem.energy_constant, kind="stable")] = np.arange(n_uavs) % n_clusters
+        _, self.labels = np.unique(labels, return_inverse=True)
+        self.members: list[np.ndarray] = [np.flatnonzero(self.labels == c) for c in range(self.labels.max() + 1)]
+        self.shares: np.ndarray = self._get_shares()
+        self.results: list[tuple[int, float, np.ndarray | None, dict[str, Any]]] = []
+        self.moves: int = 0
+        self.build_time = time.perf_counter() - start
+
+    def _get_shares(self) -> np.ndarray:
+        """Returns:
+            np.ndarray: The replicas of every service (column of the
+            aggregated problem) given to every cluster (cluster ×
+            service), proportional to the requests of the cluster, or
+            to its RAM for the services without requests.
+        """
+        problem: PlacementProblem = self.aggregated
+        n_clusters: int = len(self.members)
+        replicas: np.ndarray = problem.get_replicas().astype(int)
+        ram: np.ndarray = np.bincount(self.labels, weights=problem.ram_cap, minlength=n_clusters)
+        weights: np.ndarray = np.tile((ram / ram.sum())[:, None], (1, replicas.size))
+        if (problem.demand is not None):
+            demand: np.ndarray = np.zeros((n_clusters, problem.demand.shape[1]))
+            np.add.at(demand, self.labels, problem.demand)
+            demand = demand[:, problem.instance_service]
+            total: np.ndarray = demand.sum(axis=0)
+            weights = np.where(total > 0, demand / np.maximum(total, 1e-12), weights)
+        quotas: np.ndarray = replicas * weights
+        shares: np.ndarray = np.floor(quotas).astype(int)
+        remainders: np.ndarray = replicas - shares.sum(axis=0)
+        ranks: np.ndarray = np.argsort(np.argsort(-(quotas - shares), axis=0, kind="stable"), axis=0)
+        return shares + (ranks < remainders).astype(int)
+
+    def _get_subproblem(self, cluster: int) -> PlacementProblem:
+        """Returns:
+            PlacementProblem: The aggregated problem of the UAVs of a
+            cluster, with the services of its share.
+        """
+        problem: PlacementProblem = self.aggregated
+        rows: np.ndarray = self.members[cluster]
+        cols: np.ndarray = np.flatnonzero(self.shares[cluster])
+        return PlacementProblem(uav_ids=[problem.uav_ids[i] for i in rows],
+                                instance_ids=[problem.instance_ids[j] for j in cols],
+                                service_ids=problem.service_ids,
+                                instance_service=problem.instance_service[cols],
+                                ram_req=problem.ram_req[cols],
+                                ram_cap=problem.ram_cap[rows],
+                                batt_lvl=problem.batt_lvl[rows],
+                                cpu_coeffs=problem.cpu_coeffs[np.ix_(rows, cols)],
+                                energy_coeffs=problem.energy_coeffs[np.ix_(rows, cols)],
+                                energy_constant=problem.energy_constant[rows],
+                                min_batt_lvl=problem.min_batt_lvl,
+                                min_z=problem.min_z,
+                                replicas=self.shares[cluster, cols])
+
+    def _solve_clusters(self, clusters: list[int]) -> list[tuple[int, float, np.ndarray | None, dict[str, Any]]]:
+        """Returns:
+            list[tuple[int, float, np.ndarray | None, dict[str, Any]]]:
+            The results of _solve_cluster for the clusters, solved in
+            the worker processes if there are several.
+        """
+        tasks: list[tuple[str, dict[str, Any], PlacementProblem]] = [
+            (self.backend, self.backend_options, self._get_subproblem(c)) for c in clusters]
+        if (self.workers == 1 or len(tasks) == 1 or mp.current_process().daemon):
+            return [_solve_cluster(task) for task in tasks]
+        return _get_cluster_pool(self.workers).map(_solve_cluster, tasks)
+
+    def _update(self, clusters: list[int]) -> None:
+        """Solve the clusters again and keep their results."""
+        for c, result in zip(clusters, self._solve_clusters(clusters)):
+            self.results[c] = result
+
+    def _move(self, service: int, source: int, target: int) -> None:
+        """Move one replica of a service from the share of a cluster to
+        another.
+        """
+        self.shares[source, service] -= 1
+        self.shares[target, service] += 1
+        self.moves += 1
+
+    def _repair(self) -> bool:
+        """Move a replica out of every infeasible cluster, the one with
+        the most RAM, to the feasible clusters with the most free RAM,
+        and solve the clusters involved again.
+
+        Returns:
+            bool: True if some replica was moved.
+        """
+        problem: PlacementProblem = self.aggregated
+        feasible: np.ndarray = np.array([result[2] is not None for result in self.results])
+        free_ram: np.ndarray = np.array([problem.ram_cap[rows].sum() for rows in self.members]) -\
+                               self.shares @ problem.ram_req
+        order: list[int] = np.argsort(-free_ram, kind="stable").tolist()
+        candidates: list[int] = [c for c in order if feasible[c]] or order
+        changed: set[int] = set()
+        for k, source in enumerate(np.flatnonzero(~feasible).tolist()):
+            if (self.moves >= self.max_moves):
+                break
+            targets: list[int] = [c for c in candidates if c != source]
+            hosted: np.ndarray = np.flatnonzero(self.shares[source])
+            if (not targets or hosted.size == 0):
+                continue
+            target: int = targets[k % len(targets)]
+            self._move(int(hosted[np.argmax(problem.ram_req[hosted])]), source, target)
+            changed.update((source, target))
+        if (changed):
+            self._update(sorted(changed))
+        return bool(changed)
+
+    def _lift(self) -> bool:
+        """Move the most consuming replica of the worst UAV of the
+        cluster with the lowest z to the cluster with the highest z,
+        keeping the move only if it raises the lowest z of the two.
+
+        Returns:
+            bool: True if the move was kept.
+        """
+        problem: PlacementProblem = self.aggregated
+        objectives: np.ndarray = np.array([result[1] for result in self.results])
+        source, target = int(np.argmin(objectives)), int(np.argmax(objectives))
+        if (source == target):
+            return False
+        rows: np.ndarray = self.members[source]
+        cols: np.ndarray = np.flatnonzero(self.shares[source])
+        counts: np.ndarray = self.results[source][2]
+        battery: np.ndarray = problem.batt_lvl[rows] - problem.energy_constant[rows] -\
+                              (problem.energy_coeffs[np.ix_(rows, cols)] * counts).sum(axis=1)
+        worst: int = int(np.argmin(battery))
+        hosted: np.ndarray = np.flatnonzero(counts[worst] > 0.5)
+        if (hosted.size == 0):
+            return False
+        service: int = int(cols[hosted[np.argmax(problem.energy_coeffs[rows[worst], cols[hosted]])]])
+        previous: list[tuple[int, float, np.ndarray | None, dict[str, Any]]] = [self.results[source],
+                                                                                self.results[target]]
+        self._move(service, source, target)
+        self._update([source, target])
+        lifted: float = min(self.results[source][1], self.results[target][1])
+        if (self.results[source][2] is not None and self.results[target][2] is not None and
+            lifted > objectives[source] + self.tolerance):
+            return True
+        self._move(service, target, source)
+        self.results[source], self.results[target] = previous
+        return False
+
+    def _assemble(self) -> np.ndarray:
+        """Returns:
+            np.ndarray: The placement of problem (UAV × column) made of
+            the placements of the clusters.
+        """
+        problem: PlacementProblem = self.aggregated
+        counts: np.ndarray = np.zeros(problem.shape)
+        for c, rows in enumerate(self.members):
+            counts[np.ix_(rows, np.flatnonzero(self.shares[c]))] = np.round(self.results[c][2])
+        if (self.problem is problem):
+            return counts
+        placement: np.ndarray = np.zeros(self.problem.shape)
+        for j, serv in enumerate(problem.instance_service.tolist()):
+            hosts: np.ndarray = np.repeat(np.arange(counts.shape[0]), counts[:, j].astype(int))
+            placement[hosts, np.flatnonzero(self.problem.instance_service == serv)] = 1.0
+        return placement
+
+    def solve(self) -> None:
+        start: float = time.perf_counter()
+        self.moves = 0
+        self.results = self._solve_clusters(list(range(len(self.members))))
+        while (self.moves < self.max_moves and any(result[2] is None for result in self.results)):
+            if (not self._repair()):
+                break
+        self.placement = None
+        self.objective = float("nan")
+        self.status = 3
+        if (all(result[2] is not None for result in self.results)):
+            while (self.moves < self.max_moves and self._lift()):
+                pass
+            self.placement = self._assemble()
+            self.objective = float(self.problem.get_battery_lvls(self.placement).min())
+            self.status = 13
+        self.runtime = time.perf_counter() - start
+        sizes: dict[str, list[int]] = {key: [result[3].get(key) or 0 for result in self.results]
+                                       for key in ("num_vars", "num_constrs", "num_nzs")}
+        self.stats = {**{key: sum(values) for key, values in sizes.items()},
+                      "runtime": self.runtime,
+                      "node_count": None,
+                      "mip_gap": None,
+                      "status": self.status,
+                      "clusters": len(self.members),
+                      "moves": self.moves}
+
+
+BACKENDS: dict[str, type[SolverBackend]] = {HighsBackend.name: HighsBackend,
+                                            GurobiBackend.name: GurobiBackend,
+                                            HeuristicBackend.name: HeuristicBackend,
+                                            DecompositionBackend.name: DecompositionBackend}
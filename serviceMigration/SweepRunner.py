@@ -0,0 +1,479 @@
+import csv
+import json
+import multiprocessing as mp
+import multiprocessing.pool
+import os
+from pathlib import Path
+from typing import Any, Iterator
+import gurobipy as gp
+import numpy as np
+from Checkpoint import Checkpoint
+from PlacementCache import PlacementCache
+from RequestGenerator import RequestGenerator as RG
+from ResultWriter import ResultWriter, get_result_writer
+from ServiceMigrator import ServiceMigrator
+from Telemetry import JsonLinesTelemetry, SlotObserver
+
+_worker_env: gp.Env | None = None
+_worker_cache: PlacementCache | None = None
+
+
+class SweepRunner():
+    """Runs many configurations (fleet size × n_requests × seed) of the
+    service migration simulation in a pool of worker processes. Each
+    configuration is simulated until the problem becomes unfeasible and
+    the number of time slots it survived is streamed to a CSV file.
+    """
+
+    columns: list[str] = ["No of UAVs", "Time slots", "Requests", "Seed"]
+    default_migrator_options: dict[str, Any] = {"builder": "matrix", "incremental": True}
+    request_options: tuple[str, ...] = ("zipf_exponent", "hotspots", "hotspot_share")
+    checkpoint_every: int = 10
+
+    @staticmethod
+    def make_configs(fleet_sizes: list[int],
+                     n_requests: list[int | None],
+                     seeds: list[int]) -> list[dict[str, Any]]:
+        """Returns:
+            list[dict[str, Any]]: Every combination of fleet size,
+            number of requests and seed. The largest fleets go first,
+            since they take the longest to become unfeasible.
+        """
+        configs: list[dict[str, Any]] = []
+        for n_uavs in sorted(fleet_sizes, reverse=True):
+            for requests in n_requests:
+                for seed in seeds:
+                    configs.append({"n_uavs": n_uavs,
+                                    "n_requests": requests,
+                                    "seed": seed})
+        return configs
+
+    @staticmethod
+    def split_cores(workers: int | None,
+                    threads: int | None,
+                    n_configs: int) -> tuple[int, int]:
+        """Split the cores of the machine between worker processes and
+        solver threads per worker.
+
+        Args:
+            workers (int | None): The number of worker processes. If
+                None, one per core (at most one per configuration).
+            threads (int | None): The number of Gurobi threads per
+                worker. If None, the cores are divided evenly.
+            n_configs (int): The number of configurations to run.
+
+        Returns:
+            tuple[int, int]: The number of workers and of threads.
+        """
+        cores: int = os.cpu_count() or 1
+        if (workers is None):
+            workers = max(1, min(cores // (threads or 1), n_configs))
+        if (threads is None):
+            threads = max(1, cores // workers)
+        return workers, threads
+
+    @staticmethod
+    def get_request_weights(n_uavs: int,
+                            n_services: int,
+                            rng: np.random.Generator,
+                            zipf_exponent: float | None = None,
+                            hotspots: int | None = None,
+                            hotspot_share: float | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """Returns the weights of the requests of a configuration.
+
+        Args:
+            n_uavs (int): The number of UAVs.
+            n_services (int): The number of services.
+            rng (np.random.Generator): The generator the hotspots are
+                chosen with.
+            zipf_exponent (float | None): The exponent of the Zipf
+                popularity of the services. Uniform if None.
+            hotspots (int | None): The number of UAVs that receive
+                hotspot_share of the requests. Uniform if None.
+            hotspot_share (float | None): The share of the requests of
+                the hotspots, 0.5 if None.
+
+        Returns:
+            tuple[np.ndarray | None, np.ndarray | None]: The uav_weights
+            and service_weights of the ServiceMigrator.
+        """
+        uav_weights: np.ndarray | None = None
+        if (hotspots):
+            uav_weights = RG.hotspot_weights(n_uavs, min(hotspots, n_uavs),
+                                             0.5 if hotspot_share is None else hotspot_share, rng)
+        service_weights: np.ndarray | None = None
+        if (zipf_exponent is not None):
+            service_weights = RG.zipf_popularity(n_services, zipf_exponent)
+        return uav_weights, service_weights
+
+    @staticmethod
+    def get_migrator_arguments(scenario: Path,
+                               n_uavs: int,
+                               n_requests: int | None,
+                               seed: int,
+                               migrator_options: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Read a configuration and draw its first time slot.
+
+        Args:
+            scenario (Path): The path of the input_file.
+            n_uavs (int): The number of UAVs.
+            n_requests (int | None): The number of requests per time
+                slot. The value of the input_file is used if None.
+            seed (int): The seed of the request stream.
+            migrator_options (dict[str, Any] | None): As in simulate.
+
+        Returns:
+            dict[str, Any]: The keyword arguments of the ServiceMigrator
+            of the configuration, with n_requests the requests per time
+            slot.
+        """
+        migrator_options = dict(migrator_options or {})
+        request_options: dict[str, Any] = {key: migrator_options.pop(key) for key in SweepRunner.request_options
+                                           if migrator_options.get(key) is not None}
+        rng: np.random.Generator = np.random.default_rng(seed)
+        uavs, services, requests, time_slot_interval, requests_per_slot = ServiceMigrator.read_scenario(
+            scenario, n_uavs, rng=rng, n_requests=n_requests)
+        uav_weights, service_weights = SweepRunner.get_request_weights(len(uavs), len(services), rng,
+                                                                       **request_options)
+        if (request_options):
+            # The weights depend on the size of the scenario, so the
+            # first time slot is drawn again with them.
+            requests = RG.generate_request_matrix(len(uavs), len(services), requests_per_slot, rng,
+                                                  uav_weights, service_weights).astype(float)
+        return {"uavs": uavs,
+                "services": services,
+                "requests": requests,
+                "time_slot_interval": time_slot_interval,
+                "n_requests": requests_per_slot,
+                "rng": rng,
+                "uav_weights": uav_weights,
+                "service_weights": service_weights,
+                **SweepRunner.default_migrator_options,
+                **migrator_options}
+
+    @staticmethod
+    def get_max_time_slots(scenario: Path,
+                           n_uavs: int,
+                           n_requests: int | None,
+                           seed: int,
+                           env: gp.Env | None = None,
+                           migrator_options: dict[str, Any] | None = None) -> float:
+        """Upper bound on the time slots a configuration survives, from
+        the FeasibilityScreen of its first time slot. Nothing is solved.
+
+        Returns:
+            float: The bound, inf if the fleet has no minimum
+            consumption.
+        """
+        arguments: dict[str, Any] = SweepRunner.get_migrator_arguments(scenario, n_uavs, n_requests, seed,
+                                                                       migrator_options)
+        service_migrator: ServiceMigrator = ServiceMigrator(env=env, **{**arguments, "screening": True})
+        service_migrator._screen()
+        service_migrator.dispose()
+        return service_migrator.max_remaining_slots
+
+    @staticmethod
+    def simulate(scenario: Path,
+                 n_uavs: int,
+                 n_requests: int | None,
+                 seed: int,
+                 env: gp.Env | None = None,
+                 migrator_options: dict[str, Any] | None = None,
+                 telemetry_path: Path | None = None,
+                 results_path: Path | None = None,
+                 placement_cache: PlacementCache | None = None,
+                 checkpoint_path: Path | None = None,
+                 resume: bool = False) -> dict[str, Any]:
+        """Simulate a configuration until the problem becomes
+        unfeasible.
+
+        Args:
+            scenario (Path): The path of the input_file.
+            n_uavs (int): The number of UAVs.
+            n_requests (int | None): The number of requests per time
+                slot. The value of the input_file is used if None.
+            seed (int): The seed of the request stream.
+            env (gp.Env | None): The Gurobi environment.
+            migrator_options (dict[str, Any] | None): Keyword arguments
+                of the ServiceMigrator (builder, incremental, backend,
+                formulation...), on top of
+                SweepRunner.default_migrator_options, and the
+                SweepRunner.request_options of get_request_weights.
+            telemetry_path (Path | None): If given, the record of every
+                time slot is written to this JSON-lines file.
+            results_path (Path | None): If given, the metrics of every
+                UAV and time slot are streamed to this file (.csv, .npz
+                or .parquet).
+            placement_cache (PlacementCache | None): The cache of
+                placements of the ServiceMigrator.
+            checkpoint_path (Path | None): If given, the state of the
+                run is saved to this .npz file every
+                SweepRunner.checkpoint_every time slots, and the file
+                is removed once the run is over. Runs that stream
+                results are not checkpointed, since their results file
+                cannot be resumed.
+            resume (bool): Continue from the checkpoint at
+                checkpoint_path, if there is one. The telemetry is then
+                appended to, so the time slots after the checkpoint may
+                appear twice.
+
+        Returns:
+            dict[str, Any]: The number of time slots survived
+            ("time_slots") and of requests per time slot
+            ("n_requests"), and the trajectories of the minimum battery
+            (z, "min_battery") and of the migrations ("migrations") of
+            every survived time slot.
+        """
+        arguments: dict[str, Any] = SweepRunner.get_migrator_arguments(scenario, n_uavs, n_requests, seed,
+                                                                       migrator_options)
+        requests_per_slot: int = arguments["n_requests"]
+        if (results_path is not None):
+            checkpoint_path = None
+        checkpoint: dict[str, Any] | None = None
+        if (checkpoint_path is not None and resume):
+            checkpoint = Checkpoint.load(checkpoint_path)
+        observers: list[SlotObserver] = []
+        if (telemetry_path is not None):
+            observers.append(JsonLinesTelemetry(telemetry_path,
+                                                labels={"n_uavs": n_uavs, "n_requests": requests_per_slot, "seed": seed},
+                                                append=checkpoint is not None))
+        result_writer: ResultWriter | None = None
+        if (results_path is not None):
+            result_writer = get_result_writer(results_path)
+        service_migrator: ServiceMigrator = ServiceMigrator(env=env,
+                                                            observers=observers,
+                                                            result_writer=result_writer,
+                                                            placement_cache=placement_cache,
+                                                            **arguments)
+        time_slots: int = 0
+        min_battery: list[float] = []
+        migrations: list[int] = []
+        if (checkpoint is not None):
+            service_migrator.set_state(checkpoint)
+            time_slots = int(checkpoint["time_slots"])
+            min_battery = checkpoint["min_battery"].tolist()
+            migrations = checkpoint["migrations"].tolist()
+        while(True):
+            service_migrator.setup_model()
+            service_migrator.solve()
+            if (service_migrator.placement is None):
+                break
+            min_battery.append(float(service_migrator.objective))
+            migrations.append(service_migrator._count_migrations() or 0)
+            service_migrator.step()
+            time_slots += 1
+            if (checkpoint_path is not None and time_slots % SweepRunner.checkpoint_every == 0):
+                Checkpoint.save(checkpoint_path, {**service_migrator.get_state(),
+                                                  "time_slots": time_slots,
+                                                  "min_battery": np.array(min_battery),
+                                                  "migrations": np.array(migrations, dtype=int)})
+        service_migrator.dispose()
+        if (checkpoint_path is not None):
+            checkpoint_path.unlink(missing_ok=True)
+        for observer in observers:
+            observer.close()
+        if (result_writer is not None):
+            result_writer.close()
+        return {"time_slots": time_slots,
+                "n_requests": requests_per_slot,
+                "min_battery": min_battery,
+                "migrations": migrations}
+
+    @staticmethod
+    def _init_worker(threads: int, cache_dir: Path | None = None) -> None:
+        """Start the Gurobi environment of a worker process and, if
+        cache_dir is given, its placement cache, loaded with the
+        placements saved by every worker of previous sweeps.
+        """
+        global _worker_env, _worker_cache
+        _worker_env = gp.Env(empty=True)
+        _worker_env.setParam("OutputFlag", 0)
+        _worker_env.setParam("Threads", threads)
+        _worker_env.start()
+        if (cache_dir is not None):
+            _worker_cache = PlacementCache(path=cache_dir / f"{mp.current_process().name}.npz")
+            for shard in sorted(cache_dir.glob("*.npz")):
+                if (shard != _worker_cache.path):
+                    _worker_cache.load(shard)
+
+    @staticmethod
+    def _run_config(args: tuple[Path, dict[str, Any], dict[str, Any] | None, Path | None, Path | None, str,
+                                Path | None, bool]) -> dict[str, Any]:
+        """Simulate a configuration in a worker process."""
+        scenario, config, migrator_options, telemetry_dir, results_dir, results_format, checkpoint_dir, resume = args
+        telemetry_path: Path | None = None
+        if (telemetry_dir is not None):
+            telemetry_path = telemetry_dir / SweepRunner.get_file_name(config, "telemetry", ".jsonl")
+        results_path: Path | None = None
+        if (results_dir is not None):
+            results_path = results_dir / SweepRunner.get_file_name(config, "results", results_format)
+        checkpoint_path: Path | None = None
+        if (checkpoint_dir is not None):
+            checkpoint_path = checkpoint_dir / SweepRunner.get_file_name(config, "checkpoint", ".npz")
+        result: dict[str, Any] = SweepRunner.simulate(scenario=scenario,
+                                                      n_uavs=config["n_uavs"],
+                                                      n_requests=config["n_requests"],
+                                                      seed=config["seed"],
+                                                      env=_worker_env,
+                                                      migrator_options=migrator_options,
+                                                      telemetry_path=telemetry_path,
+                                                      results_path=results_path,
+                                                      placement_cache=_worker_cache,
+                                                      checkpoint_path=checkpoint_path,
+                                                      resume=resume)
+        if (_worker_cache is not None):
+            _worker_cache.save()
+        return {**config, **result}
+
+    @staticmethod
+    def get_file_name(config: dict[str, Any], prefix: str, suffix: str) -> str:
+        """Returns:
+            str: The name of a per-configuration file (telemetry,
+            results or checkpoint).
+        """
+        return f"{prefix}_{config['n_uavs']}_{config['n_requests']}_{config['seed']}{suffix}"
+
+    @staticmethod
+    def _read_header(output_path: Path) -> list[str] | None:
+        """Returns:
+            list[str] | None: The header of the CSV file, or None if it
+            does not exist or is empty.
+        """
+        if (not output_path.exists()):
+            return None
+        with open(output_path, newline="") as file:
+            return next(csv.reader(file), None)
+
+    @staticmethod
+    def get_pending(scenario: Path, configs: list[dict[str, Any]], output_path: Path) -> list[dict[str, Any]]:
+        """Returns:
+            list[dict[str, Any]]: The configurations that have no row in
+            output_path yet. The rows record the requests per time slot
+            of the scenario for the configurations with n_requests
+            None.
+        """
+        if (SweepRunner._read_header(output_path) != SweepRunner.columns):
+            return configs
+        with open(scenario) as file:
+            scenario_requests: int = json.loads(file.read())["n_requests"]
+        with open(output_path, newline="") as file:
+            done: set[tuple[int, int, int]] = {(int(row[0]), int(row[2]), int(row[3]))
+                                               for row in list(csv.reader(file))[1:] if row}
+        return [config for config in configs
+                if (config["n_uavs"], config["n_requests"] or scenario_requests, config["seed"]) not in done]
+
+    @staticmethod
+    def run(scenario: Path,
+            configs: list[dict[str, Any]],
+            output_path: Path,
+            workers: int | None = None,
+            threads: int | None = None,
+            migrator_options: dict[str, Any] | None = None,
+            telemetry_dir: Path | None = None,
+            results_dir: Path | None = None,
+            results_format: str = ".csv",
+            cache_dir: Path | None = None,
+            checkpoint_dir: Path | None = None,
+            resume: bool = False) -> Iterator[dict[str, Any]]:
+        """Run the configurations in a process pool and write a row to
+        output_path as soon as each one finishes.
+
+        Args:
+            scenario (Path): The path of the input_file.
+            configs (list[dict[str, Any]]): The configurations, as
+                returned by make_configs.
+            output_path (Path): The CSV file of the results. It is
+                overwritten, unless resume is set and it has the header
+                SweepRunner.columns, in which case the results are
+                appended to it.
+            workers (int | None): The number of worker processes.
+            threads (int | None): The number of Gurobi threads per
+                worker.
+            migrator_options (dict[str, Any] | None): Keyword arguments
+                of the ServiceMigrator.
+            telemetry_dir (Path | None): If given, the record of every
+                time slot of each configuration is written to a
+                JSON-lines file of this directory.
+            results_dir (Path | None): If given, the metrics of every
+                UAV and time slot of each configuration are streamed to
+                a file of this directory.
+            results_format (str): The format of the results files:
+                ".csv", ".npz" or ".parquet".
+            cache_dir (Path | None): If given, every worker keeps a
+                PlacementCache that is saved to this directory after
+                each configuration and loaded by the workers of later
+                sweeps, so replicated configurations skip most solves.
+            checkpoint_dir (Path | None): If given, every running
+                configuration is checkpointed to a file of this
+                directory (see simulate).
+            resume (bool): Skip the configurations that already have a
+                row in output_path, and continue the others from their
+                checkpoints.
+
+        Yields:
+            dict[str, Any]: Each configuration with its number of
+            survived time slots, in order of completion.
+
+        Raises:
+            ValueError: If resume is set and output_path exists with
+                other columns.
+        """
+        header: list[str] | None = SweepRunner._read_header(output_path)
+        if (resume and header is not None and header != SweepRunner.columns):
+            # Resuming would truncate a file written by another mode
+            # (e.g. the curves of LifetimeSearch).
+            raise ValueError(f"Cannot resume {output_path}: its columns are not {SweepRunner.columns}")
+        if (resume):
+            configs = SweepRunner.get_pending(scenario, configs, output_path)
+        workers, threads = SweepRunner.split_cores(workers, threads, len(configs))
+        write_header: bool = not resume or header != SweepRunner.columns
+        for directory in (telemetry_dir, results_dir, cache_dir, checkpoint_dir):
+            if (directory is not None):
+                directory.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w" if write_header else "a", newline="") as file, \
+             SweepRunner.start_pool(workers, threads, cache_dir) as pool:
+            writer = csv.writer(file)
+            if (write_header):
+                writer.writerow(SweepRunner.columns)
+                file.flush()
+            for result in SweepRunner.evaluate(pool, scenario, configs, migrator_options,
+                                               telemetry_dir, results_dir, results_format, checkpoint_dir, resume):
+                writer.writerow([result["n_uavs"],
+                                 result["time_slots"],
+                                 result["n_requests"],
+                                 result["seed"]])
+                file.flush()
+                yield result
+
+    @staticmethod
+    def start_pool(workers: int, threads: int, cache_dir: Path | None = None) -> mp.pool.Pool:
+        """Returns:
+            mp.pool.Pool: A pool of spawned worker processes, each one
+            with its Gurobi environment of threads threads and, if
+            cache_dir is given, its PlacementCache.
+        """
+        context = mp.get_context("spawn")
+        return context.Pool(processes=workers,
+                            initializer=SweepRunner._init_worker,
+                            initargs=(threads, cache_dir))
+
+    @staticmethod
+    def evaluate(pool: mp.pool.Pool,
+                 scenario: Path,
+                 configs: list[dict[str, Any]],
+                 migrator_options: dict[str, Any] | None = None,
+                 telemetry_dir: Path | None = None,
+                 results_dir: Path | None = None,
+                 results_format: str = ".csv",
+                 checkpoint_dir: Path | None = None,
+                 resume: bool = False) -> Iterator[dict[str, Any]]:
+        """Simulate the configurations in pool (see run for the
+        arguments).
+
+        Yields:
+            dict[str, Any]: Each configuration with its number of
+            survived time slots, in order of completion.
+        """
+        tasks = [(scenario, config, migrator_options, telemetry_dir, results_dir, results_format, checkpoint_dir, resume)
+                 for config in configs]
+        yield from pool.imap_unordered(SweepRunner._run_config, tasks)
@@ -0,0 +1,104 @@
+import json
+import math
+from pathlib import Path
+from typing import Any, TextIO
+
+
+class SlotObserver():
+    """Hook that receives one record per time slot of a
+    ServiceMigrator. The ServiceMigrator only measures and collects the
+    records when at least one observer is given, so a run without
+    observers does not pay for the instrumentation.
+
+    Every record has the keys:
+        slot: The index of the time slot, starting at 0.
+        setup_model_time, solve_time, step_time: The wall time (s) of
+            each phase. step_time is missing in the last time slot,
+            which has no solution.
+        num_vars, num_constrs, num_nzs: The size of the model.
+        runtime: The time (s) reported by the solver.
+        node_count: The branch-and-bound nodes explored.
+        mip_gap: The relative MIP gap of the solution.
+        status: The status of the solve, as a gp.GRB.Status code.
+        z: The battery of the UAV with the least battery at the end of
+            the time slot.
+        solve_path: "optimal", "incumbent" (a solution that is not
+            proven optimal, e.g. when the time budget ran out), "cache"
+            (a placement of the PlacementCache, in which case the model
+            size and solver statistics are missing), "fallback" (the
+            placement of the previous time slot), "certificate" (the
+            placement found by the FeasibilityScreen), "rounding" (the
+            rounded LP relaxation) or None if there is no placement.
+        first_incumbent_time: The runtime (s) when the first incumbent
+            was found, only with a time budget and the Gurobi backend.
+        migrations: The replicas that are deployed in a different UAV
+            than in the previous time slot.
+    With screening, the records also have screen_time, screen ("ram",
+    "battery", "instance", "cpu" or "lifetime" if the time slot was
+    proven infeasible, in which case the model is neither built nor
+    solved, "feasible" or "unknown") and max_remaining_slots.
+    With a reduced model, the records also have pruned_vars (the
+    placement variables that were not created), pending_rows (the
+    battery rows left out of the model) and lazy_rounds (the solves,
+    or the Gurobi callbacks, that added violated rows).
+    With an LP warm start, the records also have lp_time, lp_bound
+    (the z of the LP relaxation, None if it is infeasible, in which
+    case the MILP is not solved) and rounded_z (the z of its rounded
+    placement, None if the rounding failed).
+    With the decomposition backend, the records also have clusters and
+    moves (the replicas moved between clusters by the reconciliation).
+    The values that a backend does not provide are None.
+    """
+
+    def on_slot(self, record: dict[str, Any]) -> None:
+        """Called once a time slot is finished.
+
+        Args:
+            record (dict[str, Any]): The record of the time slot.
+        """
+        pass
+
+    def close(self) -> None:
+        """Free the resources of the observer."""
+        pass
+
+
+class JsonLinesTelemetry(SlotObserver):
+    """Writes every record as a line of JSON to a file, flushed after
+    each time slot so that a run can be followed while it goes on.
+    """
+
+    def __init__(self, output_path: Path,
+                       labels: dict[str, Any] | None = None,
+                       append: bool = False) -> None:
+        """Args:
+            output_path (Path): The JSON-lines file.
+            labels (dict[str, Any] | None): Fields added to every record
+                (e.g. the number of UAVs and the seed of the run).
+            append (bool): Append to output_path instead of
+                overwriting it.
+        """
+        self.labels: dict[str, Any] = labels or {}
+        self.file: TextIO = open(output_path, "a" if append else "w")
+
+    def on_slot(self, record: dict[str, Any]) -> None:
+        self.file.write(json.dumps({**self.labels, **record}) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def get_model_stats(model: Any) -> dict[str, Any]:
+    """Returns:
+        dict[str, Any]: The size and the solve statistics of a solved
+        gp.Model, with the keys of the SlotObserver records.
+    """
+    mip_gap: float | None = model.MIPGap if model.IsMIP and model.SolCount > 0 else None
+    return {"num_vars": model.NumVars,
+            "num_constrs": model.NumConstrs,
+            "num_nzs": model.NumNZs,
+            "runtime": model.Runtime,
+            "node_count": int(model.NodeCount),
+            "mip_gap": mip_gap if mip_gap is not None and math.isfinite(mip_gap) else None,
+            "status": model.Status}
@@ -0,0 +1,47 @@
+import json
+from ServiceMigrator import ServiceMigrator
+from pathlib import Path
+import numpy as np
+import time
+
+# Compare the build and solve times of the Gurobi and HiGHS backends on
+# the first time slots of every input/save/Scenario_*.json fleet size.
+
+scenarios: list[Path] = sorted(Path("../input/save").glob("Scenario_*.json"),
+                               key=lambda path: int(path.stem.split("_")[1]))
+backends: list[str] = ["gurobi", "highs"]
+n_slots: int = 5
+seed: int = 20
+
+print(f"{'UAVs'.rjust(5)}  {'backend'.ljust(7)}  {'build (s)'.rjust(9)}  {'solve (s)'.rjust(9)}  {'z slot 0'.rjust(9)}")
+for scenario in scenarios:
+    with open(scenario) as file:
+        n_uavs: int = len(json.loads(file.read())["uavs"])
+    for backend in backends:
+        rng: np.random.Generator = np.random.default_rng(seed)
+        uavs, services, requests, time_slot_interval, n_requests = ServiceMigrator.read_scenario(scenario, n_uavs, rng=rng)
+        service_migrator: ServiceMigrator = ServiceMigrator(uavs=uavs,
+                                                            services=services,
+                                                            requests=requests,
+                                                            time_slot_interval=time_slot_interval,
+                                                            n_requests=n_requests,
+                                                            builder="matrix",
+                                                            rng=rng,
+                                                            backend=backend)
+        build_times: list[float] = []
+        solve_times: list[float] = []
+        objectives: list[float] = []
+        for _ in range(n_slots):
+            start: float = time.perf_counter()
+            service_migrator.setup_model()
+            build_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            service_migrator.solve()
+            solve_times.append(time.perf_counter() - start)
+            if (service_migrator.status != 2):
+                break
+            objectives.append(service_migrator.objective)
+            service_migrator.step()
+        service_migrator.dispose()
+        z: str = f"{objectives[0]:9.4f}" if objectives else "unfeas.".rjust(9)
+        print(f"{str(n_uavs).rjust(5)}  {backend.ljust(7)}  {np.mean(build_times):9.4f}  {np.mean(solve_times):9.4f}  {z}")
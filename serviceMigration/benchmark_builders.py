@@ -0,0 +1,70 @@
+from ServiceMigrator import ServiceMigrator
+from pathlib import Path
+import numpy as np
+import time
+
+# Compare the time needed to build the model of the first time slot
+# with the "dict" builder and with the "matrix" builder.
+
+scenario: Path = Path("../input/Scenario_36.json")
+n_uavs_list: list[int] = [36, 60, 200, 1000]
+repetitions: int = 3
+
+
+def get_rows(service_migrator: ServiceMigrator) -> list[int]:
+    """Returns:
+        list[int]: The indices of the constraints of the model, sorted
+        by family and by UAV/instance, so that both builders can be
+        compared row by row.
+    """
+    rows: list[int] = []
+    for constraints in (service_migrator.constraints_1,
+                        service_migrator.constraints_2,
+                        service_migrator.constraints_3,
+                        service_migrator.constraints_4,
+                        service_migrator.constraints_5):
+        rows += [constr.index for constr in constraints.values()]
+    return rows
+
+
+def check_same_model(dict_migrator: ServiceMigrator, matrix_migrator: ServiceMigrator) -> None:
+    """Check that both builders produced the same model."""
+    dict_rows: list[int] = get_rows(dict_migrator)
+    matrix_rows: list[int] = get_rows(matrix_migrator)
+    for attr in ("RHS", "Sense"):
+        dict_values: np.ndarray = np.array(dict_migrator.model.getAttr(attr))[dict_rows]
+        matrix_values: np.ndarray = np.array(matrix_migrator.model.getAttr(attr))[matrix_rows]
+        assert (np.allclose(dict_values, matrix_values) if attr == "RHS" else (dict_values == matrix_values).all()), attr
+    for attr in ("LB", "UB", "Obj", "VType"):
+        assert dict_migrator.model.getAttr(attr) == matrix_migrator.model.getAttr(attr), attr
+    difference = dict_migrator.model.getA()[dict_rows] - matrix_migrator.model.getA()[matrix_rows]
+    assert abs(difference).max() < 1e-9, "A"
+
+
+print(f"{'UAVs'.rjust(5)}  {'vars'.rjust(7)}  {'constrs'.rjust(7)}  {'dict (s)'.rjust(9)}  {'matrix (s)'.rjust(10)}  {'speedup'.rjust(7)}")
+for n_uavs in n_uavs_list:
+    uavs, services, requests, time_slot_interval, n_requests = ServiceMigrator.read_input(scenario, n_uavs)
+    build_times: dict[str, float] = {}
+    migrators: dict[str, ServiceMigrator] = {}
+    for builder in ("dict", "matrix"):
+        best: float = float("inf")
+        for _ in range(repetitions):
+            service_migrator: ServiceMigrator = ServiceMigrator(uavs=uavs,
+                                                                services=services,
+                                                                requests=requests,
+                                                                time_slot_interval=time_slot_interval,
+                                                                n_requests=n_requests,
+                                                                builder=builder)
+            start: float = time.perf_counter()
+            service_migrator.setup_model()
+            best = min(best, time.perf_counter() - start)
+            n_vars: int = service_migrator.model.NumVars
+            n_constrs: int = service_migrator.model.NumConstrs
+            if (builder in migrators):
+                migrators[builder].dispose()
+            migrators[builder] = service_migrator
+        build_times[builder] = best
+    check_same_model(migrators["dict"], migrators["matrix"])
+    for service_migrator in migrators.values():
+        service_migrator.dispose()
+    print(f"{str(n_uavs).rjust(5)}  {str(n_vars).rjust(7)}  {str(n_constrs).rjust(7)}  {build_times['dict']:9.4f}  {build_times['matrix']:10.4f}  {build_times['dict'] / build_times['matrix']:6.1f}x")
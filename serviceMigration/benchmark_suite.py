@@ -0,0 +1,181 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+import numpy as np
+from ServiceMigrator import ServiceMigrator
+
+# Time the build (per constraint family), solve, step, print_solution
+# and output_to_csv phases of ServiceMigrator, along with the peak
+# memory, on the input/save scenarios plus larger generated fleets.
+# The results are written as JSON and compared with a stored baseline:
+# the script exits with status 1 if any phase regressed, and with
+# status 2 if there is no baseline to compare with (run it once with
+# --update-baseline on the machine that runs the comparison).
+
+families: dict[str, str] = {"variables": "_add_variables",
+                            "constraints_1": "_add_constraints_1",
+                            "constraints_2": "_add_constraints_2",
+                            "constraints_3": "_add_constraints_3",
+                            "constraints_4_5": "_add_constraints_4_5",
+                            "objective": "_add_obj_function"}
+
+
+def get_cases(generated_sizes: list[int]) -> list[tuple[str, Path, int]]:
+    """Returns:
+        list[tuple[str, Path, int]]: The name, input_file and number of
+        UAVs of every benchmark case.
+    """
+    cases: list[tuple[str, Path, int]] = []
+    for scenario in sorted(Path("../input/save").glob("Scenario_*.json"),
+                           key=lambda path: int(path.stem.split("_")[1])):
+        with open(scenario) as file:
+            cases.append((scenario.stem, scenario, len(json.loads(file.read())["uavs"])))
+    for n_uavs in generated_sizes:
+        cases.append((f"Generated_{n_uavs}", Path("../input/Scenario_36.json"), n_uavs))
+    return cases
+
+
+def timed(timings: dict[str, list[float]], phase: str, function: Callable, *args) -> Any:
+    """Call function and append its duration to timings[phase]."""
+    start: float = time.perf_counter()
+    result: Any = function(*args)
+    timings.setdefault(phase, []).append(time.perf_counter() - start)
+    return result
+
+
+def run_case(scenario: Path, n_uavs: int, n_slots: int, seed: int, options: dict[str, Any]) -> dict[str, float]:
+    """Simulate n_slots time slots and time every phase.
+
+    Returns:
+        dict[str, float]: The median time of every phase in seconds.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    uavs, services, requests, time_slot_interval, n_requests = ServiceMigrator.read_scenario(scenario, n_uavs, rng=rng)
+    service_migrator: ServiceMigrator = ServiceMigrator(uavs=uavs,
+                                                        services=services,
+                                                        requests=requests,
+                                                        time_slot_interval=time_slot_interval,
+                                                        n_requests=n_requests,
+                                                        rng=rng,
+                                                        **options)
+    per_family: bool = options.get("builder", "dict") == "dict" and not options.get("incremental", False) and\
+                       options.get("backend", "gurobi") == "gurobi" and options.get("formulation", "replica") == "replica"
+    timings: dict[str, list[float]] = {}
+    for _ in range(n_slots):
+        if (per_family):
+            start: float = time.perf_counter()
+            for family, method in families.items():
+                timed(timings, f"setup_model.{family}", getattr(service_migrator, method))
+            timings.setdefault("setup_model", []).append(time.perf_counter() - start)
+        else:
+            timed(timings, "setup_model", service_migrator.setup_model)
+        timed(timings, "solve", service_migrator.solve)
+        if (service_migrator.placement is None):
+            break
+        with contextlib.redirect_stdout(io.StringIO()):
+            timed(timings, "print_solution", service_migrator.print_solution)
+        timed(timings, "step", service_migrator.step)
+    with tempfile.TemporaryDirectory() as directory:
+        timed(timings, "output_to_csv", service_migrator.output_to_csv, Path(directory) / "output.csv")
+    service_migrator.dispose()
+    return {phase: float(np.median(values)) for phase, values in timings.items()}
+
+
+def measure_memory(scenario: Path, n_uavs: int, n_slots: int, seed: int, options: dict[str, Any]) -> float:
+    """Returns:
+        float: The peak memory allocated by Python (MB) while running
+        the case. Memory allocated by the solver itself is not traced.
+    """
+    tracemalloc.start()
+    run_case(scenario, n_uavs, n_slots, seed, options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def compare(results: dict[str, dict[str, float]],
+            baseline: dict[str, dict[str, float]],
+            tolerance: float,
+            min_difference: float) -> list[str]:
+    """Returns:
+        list[str]: A description of every metric that is more than
+        tolerance (relative) and min_difference (absolute) worse than
+        the baseline.
+    """
+    regressions: list[str] = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            reference: float | None = baseline.get(case, {}).get(metric)
+            if (reference is None):
+                continue
+            if (value > reference * (1 + tolerance) and value - reference > min_difference):
+                regressions.append(f"{case} {metric}: {value:.4f} vs baseline {reference:.4f} "
+                                   f"(+{(value / reference - 1) * 100:.0f}%)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 120],
+                        help="UAVs of the generated cases")
+    parser.add_argument("--slots", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--options", type=json.loads, default={},
+                        help='ServiceMigrator options as JSON, e.g. \'{"builder": "matrix"}\'')
+    parser.add_argument("--output", type=Path, default=Path("../output/benchmark.json"))
+    parser.add_argument("--baseline", type=Path, default=Path("../output/benchmark_baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown with respect to the baseline")
+    parser.add_argument("--min-difference", type=float, default=0.002,
+                        help="Differences below this value (s or MB) are ignored")
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    args = parser.parse_args()
+    if (not args.update_baseline and not args.baseline.exists()):
+        print(f"ERROR: there is no baseline at {args.baseline}. Run with --update-baseline to create it.",
+              file=sys.stderr)
+        sys.exit(2)
+
+    results: dict[str, dict[str, float]] = {}
+    for name, scenario, n_uavs in get_cases(args.sizes):
+        results[name] = run_case(scenario, n_uavs, args.slots, args.seed, args.options)
+        if (args.memory):
+            results[name]["peak_memory_mb"] = measure_memory(scenario, n_uavs, args.slots, args.seed, args.options)
+        print(f"{name.ljust(14)} " + "  ".join(f"{metric} {value:.4f}" for metric, value in results[name].items()))
+
+    report: dict[str, Any] = {"meta": {"python": platform.python_version(),
+                                       "machine": platform.machine(),
+                                       "cpus": os.cpu_count(),
+                                       "slots": args.slots,
+                                       "seed": args.seed,
+                                       "options": args.options},
+                              "results": results}
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+
+    if (args.update_baseline):
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    with open(args.baseline) as file:
+        baseline: dict[str, Any] = json.loads(file.read())
+    if (baseline["meta"] != report["meta"]):
+        print(f"WARNING: the baseline was run with {baseline['meta']}")
+    regressions: list[str] = compare(results, baseline["results"], args.tolerance, args.min_difference)
+    if (regressions):
+        print("REGRESSIONS with respect to the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions with respect to the baseline.")
@@ -0,0 +1,40 @@
+import argparse
+from ServiceMigrator import ServiceMigrator
+from pathlib import Path
+import numpy as np
+
+# Run a simulation with a fast engine (by default the heuristic) while
+# solving every time slot with a reference engine too (by default
+# Gurobi), and report the gap in z and the speedup per time slot.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", type=Path, default=Path("../input/Scenario_36.json"))
+    parser.add_argument("--uavs", type=int, default=36)
+    parser.add_argument("--slots", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--backend", default="heuristic")
+    parser.add_argument("--reference", default="gurobi")
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    uavs, services, requests, time_slot_interval, n_requests = ServiceMigrator.read_scenario(args.scenario, args.uavs, rng=rng)
+    service_migrator: ServiceMigrator = ServiceMigrator(uavs=uavs,
+                                                        services=services,
+                                                        requests=requests,
+                                                        time_slot_interval=time_slot_interval,
+                                                        n_requests=n_requests,
+                                                        rng=rng,
+                                                        backend=args.backend,
+                                                        reference_backend=args.reference)
+    print(f"{'slot'.rjust(4)}  {'z'.rjust(8)}  {'z ref'.rjust(8)}  {'gap (%)'.rjust(8)}  {'time (ms)'.rjust(9)}  {'ref (ms)'.rjust(9)}")
+    for slot in range(args.slots):
+        service_migrator.setup_model()
+        service_migrator.solve()
+        comparison: dict[str, float] = service_migrator.comparisons[-1]
+        print(f"{str(slot).rjust(4)}  {comparison['z']:8.4f}  {comparison['z_reference']:8.4f}  {comparison['relative_gap']*100:8.4f}  {comparison['runtime']*1000:9.2f}  {comparison['reference_runtime']*1000:9.2f}")
+        if (service_migrator.placement is None):
+            print(f"No placement from slot {slot} on.")
+            break
+        service_migrator.step()
+    service_migrator.dispose()
@@ -0,0 +1,46 @@
+import argparse
+import json
+from pathlib import Path
+import numpy as np
+from Scenario import Fleet, ServiceCatalog
+from ScenarioGenerator import ScenarioGenerator
+
+# Generate a scenario with heterogeneous UAVs and many services, or
+# convert an existing JSON scenario with --convert, and write it as a
+# JSON header plus an .npz file with its columns.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uavs", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=50)
+    parser.add_argument("--load", type=float, default=0.5,
+                        help="Fraction of the RAM and CPU of the fleet used by the instances")
+    parser.add_argument("--requests-per-uav", type=float, default=250.0)
+    parser.add_argument("--time-slot-interval", type=float, default=0.166666667)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--convert", type=Path, default=None,
+                        help="A JSON scenario to write in the header + .npz format instead")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="The header file (default: ../input/generated/Scenario_<uavs>.json)")
+    args = parser.parse_args()
+
+    if (args.convert is not None):
+        with open(args.convert) as file:
+            input = json.loads(file.read())
+        fleet = Fleet.from_json(input["uavs"])
+        catalog = ServiceCatalog.from_json(input["services"])
+        time_slot_interval = input["time_slot_interval"]
+        n_requests = input["n_requests"]
+        metadata = {"source": args.convert.name}
+    else:
+        rng = np.random.default_rng(args.seed)
+        fleet = ScenarioGenerator.generate_fleet(args.uavs, rng)
+        catalog = ScenarioGenerator.generate_catalog(args.services, fleet, rng, args.load)
+        time_slot_interval = args.time_slot_interval
+        n_requests = round(args.requests_per_uav * args.uavs)
+        metadata = {"seed": args.seed, "load": args.load}
+
+    output = args.output or Path(f"../input/generated/Scenario_{len(fleet)}.json")
+    arrays_path = ScenarioGenerator.write(output, fleet, catalog, time_slot_interval, n_requests, metadata)
+    print(f"{output}: {len(fleet)} UAVs, {len(catalog)} services, {len(catalog.instance_ids)} instances "
+          f"({arrays_path.stat().st_size / 1e6:.1f} MB of arrays)")
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+from pathlib import Path
+from PlacementService import PlacementService
+
+# Keep the model of a fleet in memory and answer every time slot it
+# observes (JSON lines with its requests and battery levels) with the
+# new placement, on stdin/stdout or on a local socket.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", type=Path, default=Path("../input/Scenario_36.json"))
+    parser.add_argument("--uavs", type=int, default=None,
+                        help="Number of UAVs (default: all the UAVs of the scenario)")
+    parser.add_argument("--socket", type=Path, default=None,
+                        help="Listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--port", type=int, default=None,
+                        help="Listen on this TCP port of localhost instead of stdin/stdout")
+    parser.add_argument("--backend", choices=["gurobi", "highs", "heuristic", "decomposition"], default="gurobi")
+    parser.add_argument("--cluster-size", type=int, default=25,
+                        help="UAVs per cluster of the decomposition backend, solved in parallel with HiGHS")
+    parser.add_argument("--reduced", action="store_true")
+    parser.add_argument("--screening", action="store_true")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Seconds each time slot may be solved for")
+    args = parser.parse_args()
+
+    service = PlacementService(scenario=args.scenario,
+                               n_uavs=args.uavs,
+                               migrator_options={"backend": args.backend,
+                                                 "reduced": args.reduced,
+                                                 "screening": args.screening,
+                                                 "time_budget": args.time_budget,
+                                                 "backend_options": {"cluster_size": args.cluster_size}
+                                                                    if args.backend == "decomposition" else None})
+    if (args.socket is not None or args.port is not None):
+        asyncio.run(service.serve_socket(path=args.socket, port=args.port or 0))
+    else:
+        service.serve_stdio()
+    service.dispose()
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+import numpy as np
+from RequestGenerator import RequestGenerator as RG
+from ServiceMigrator import ServiceMigrator
+
+# Stand in for the fleet of a placement service: send the requests of
+# every time slot, drawn as in the simulation, with the battery levels
+# the service predicted (plus optional sensor noise) as the readings,
+# until the service finds no placement. Print the latency of every
+# reply. The service is started as a subprocess on stdin/stdout unless
+# --socket or --port is given.
+
+
+async def replay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    fleet, catalog, requests, _, n_requests = ServiceMigrator.read_scenario(args.scenario, args.uavs, rng=rng)
+    batt_lvl = fleet.batt_lvl
+    latencies = []
+    for slot in range(args.slots):
+        message = {"slot": slot, "requests": requests.astype(int).tolist(), "batt_lvl": batt_lvl.tolist()}
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        if ("error" in reply):
+            print(reply["error"], file=sys.stderr)
+            break
+        latencies.append(reply["latency"])
+        print(f"slot {slot}: {reply['status']}\tz -> {reply.get('z', float('nan')):.2f} Wh\t"
+              f"migrations -> {reply.get('migrations')}\tlatency -> {1000 * reply['latency']:.1f} ms")
+        if (reply["status"] == "infeasible"):
+            break
+        batt_lvl = np.array(reply["battery"]) + rng.normal(0.0, args.noise, len(batt_lvl))
+        requests = RG.generate_request_matrix(n_uavs=len(fleet), n_services=len(catalog), n_requests=n_requests, rng=rng)
+    if (latencies):
+        print(f"{len(latencies)} slots, latency: median {1000 * np.median(latencies):.1f} ms, "
+              f"max {1000 * np.max(latencies):.1f} ms")
+    writer.write(json.dumps({"command": "shutdown"}).encode() + b"\n")
+    await writer.drain()
+    await reader.readline()
+
+
+async def main(args: argparse.Namespace) -> None:
+    if (args.socket is not None):
+        reader, writer = await asyncio.open_unix_connection(str(args.socket))
+        await replay(reader, writer, args)
+        writer.close()
+        return
+    if (args.port is not None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+        await replay(reader, writer, args)
+        writer.close()
+        return
+    command = [sys.executable, str(Path(__file__).with_name("placement_service.py")), "--scenario", str(args.scenario)]
+    if (args.uavs is not None):
+        command += ["--uavs", str(args.uavs)]
+    process = await asyncio.create_subprocess_exec(*command, stdin=asyncio.subprocess.PIPE,
+                                                   stdout=asyncio.subprocess.PIPE)
+    await replay(process.stdout, process.stdin, args)
+    process.stdin.close()
+    await process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", type=Path, default=Path("../input/Scenario_36.json"))
+    parser.add_argument("--uavs", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="Standard deviation of the battery readings around the predicted levels (Wh)")
+    parser.add_argument("--socket", type=Path, default=None)
+    parser.add_argument("--port", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -1,38 +1,141 @@
-import json
-from typing import Any
-from RequestGenerator import RequestGenerator as RG
-from ServiceMigrator import ServiceMigrator
-import time
+import argparse
+from LifetimeSearch import LifetimeSearch
+from MonteCarlo import MonteCarlo
+from SweepRunner import SweepRunner
 from pathlib import Path
 
-jotas = []
-for i in range(10, 60):
+# Simulate every fleet size until the problem becomes unfeasible, with
+# the configurations spread over a pool of worker processes, and stream
+# the number of survived time slots to epochs.csv. With --search, only
+# the fleet sizes where the lifetime changes are simulated, and the
+# curves are written to lifetime_search.csv. With --replicas, every
+# configuration is replicated over seeds until the confidence interval
+# of its mean lifetime is narrow enough, and the summaries are written
+# to replicas.csv. Each mode writes its own columns, so they have
+# separate default outputs.
 
-    uavs, services, requests, time_slot_interval, n_requests = ServiceMigrator.read_input(Path("../input/Scenario_36.json"), i)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", type=Path, default=Path("../input/Scenario_36.json"))
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Output CSV (default: ../output/epochs.csv, or ../output/lifetime_search.csv with "
+                             "--search and ../output/replicas.csv with --replicas)")
+    parser.add_argument("--min-uavs", type=int, default=10)
+    parser.add_argument("--max-uavs", type=int, default=59)
+    parser.add_argument("--requests", type=int, nargs="+", default=[None],
+                        help="Requests per time slot (default: the value of the scenario)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[20])
+    parser.add_argument("--zipf-exponent", type=float, default=None,
+                        help="Draw the services of the requests with a Zipf popularity of this exponent "
+                             "(default: uniform)")
+    parser.add_argument("--hotspots", type=int, default=None,
+                        help="Send --hotspot-share of the requests to this many random UAVs (default: uniform)")
+    parser.add_argument("--hotspot-share", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: cores / threads)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Gurobi threads per worker (default: cores / workers)")
+    parser.add_argument("--builder", choices=["dict", "matrix"], default="matrix")
+    parser.add_argument("--no-incremental", dest="incremental", action="store_false")
+    parser.add_argument("--backend", choices=["gurobi", "highs", "heuristic", "decomposition"], default="gurobi")
+    parser.add_argument("--cluster-size", type=int, default=25,
+                        help="UAVs per cluster of the decomposition backend, solved with HiGHS")
+    parser.add_argument("--formulation", choices=["replica", "aggregated"], default="replica")
+    parser.add_argument("--symmetry-breaking", action="store_true")
+    parser.add_argument("--reduced", action="store_true",
+                        help="Prune the placement variables that cannot be feasible and only add the battery rows "
+                             "that can bind, lazily with Gurobi")
+    parser.add_argument("--screening", action="store_true",
+                        help="Screen every time slot before building its model and stop without solving "
+                             "once it is proven infeasible")
+    parser.add_argument("--lp-warm-start", action="store_true",
+                        help="Start the MILP of every time slot from the rounded LP relaxation, and record its bound")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Seconds each time slot may be solved for before the best incumbent (or the "
+                             "previous placement) is accepted")
+    parser.add_argument("--cache", type=Path, default=None,
+                        help="Directory of the placement caches shared by the workers and by later sweeps")
+    parser.add_argument("--telemetry", type=Path, default=None,
+                        help="Directory for a JSON-lines file per configuration with the record of every time slot")
+    parser.add_argument("--results", type=Path, default=None,
+                        help="Directory for a file per configuration with the metrics of every UAV and time slot")
+    parser.add_argument("--results-format", choices=[".csv", ".npz", ".parquet"], default=".csv")
+    parser.add_argument("--checkpoints", type=Path, default=None,
+                        help="Directory where every running configuration is checkpointed every few time slots")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip the configurations already in --output and continue the others from their "
+                             "checkpoints")
+    parser.add_argument("--search", action="store_true",
+                        help="Bisect the fleet sizes of every curve instead of simulating all of them, and "
+                             "write the complete curves at the end")
+    parser.add_argument("--replicas", type=int, default=None,
+                        help="Replicate every configuration over up to this many seeds, starting at the first "
+                             "of --seeds, and write mean/quantile summaries")
+    parser.add_argument("--min-replicas", type=int, default=5)
+    parser.add_argument("--target-width", type=float, default=1.0,
+                        help="Half width (time slots) of the confidence interval at which replication stops")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    args = parser.parse_args()
+    if (args.output is None):
+        if (args.replicas is not None):
+            args.output = Path("../output/replicas.csv")
+        elif (args.search):
+            args.output = Path("../output/lifetime_search.csv")
+        else:
+            args.output = Path("../output/epochs.csv")
 
-    service_migrator: ServiceMigrator = ServiceMigrator(uavs=uavs,
-                                                        services=services,
-                                                        requests=requests,
-                                                        time_slot_interval=time_slot_interval,
-                                                        n_requests=n_requests)
-    j: int = 0
-    times = []
-    while(True):
-        j += 1
-        start = time.time()
-        service_migrator.setup_model()
-        service_migrator.solve()
-        if (service_migrator.model.Status != 2):
-            print(f"From Iter {j} and on it is unfeasable.")
-            break
-        #print(f"------------------Iter {str(i).rjust(2, ' ')}------------------")
-        #service_migrator.print_solution()
-        service_migrator.step()
-        times.append(time.time()-start)
-        #print(f"-------------------------------------------")
-        #print()
-    jotas.append(j-1)
-for iter,j in enumerate(jotas):
-    print(iter+10, " -> ", j)
-
-#service_migrator.output_to_csv(Path("Scenario_36.csv"))
\ No newline at end of file
+    migrator_options = {"builder": args.builder,
+                        "incremental": args.incremental,
+                        "backend": args.backend,
+                        "formulation": args.formulation,
+                        "symmetry_breaking": args.symmetry_breaking,
+                        "time_budget": args.time_budget,
+                        "screening": args.screening,
+                        "reduced": args.reduced,
+                        "lp_warm_start": args.lp_warm_start,
+                        "zipf_exponent": args.zipf_exponent,
+                        "hotspots": args.hotspots,
+                        "hotspot_share": args.hotspot_share if args.hotspots else None,
+                        "backend_options": {"cluster_size": args.cluster_size} if args.backend == "decomposition" else None}
+    if (args.replicas is not None):
+        results = MonteCarlo.run(scenario=args.scenario,
+                                 fleet_sizes=list(range(args.min_uavs, args.max_uavs + 1)),
+                                 n_requests=args.requests,
+                                 output_path=args.output,
+                                 target_width=args.target_width,
+                                 confidence=args.confidence,
+                                 min_replicas=args.min_replicas,
+                                 max_replicas=args.replicas,
+                                 base_seed=args.seeds[0],
+                                 workers=args.workers,
+                                 threads=args.threads,
+                                 migrator_options=migrator_options,
+                                 cache_dir=args.cache)
+    elif (args.search):
+        results = LifetimeSearch.search(scenario=args.scenario,
+                                        fleet_sizes=list(range(args.min_uavs, args.max_uavs + 1)),
+                                        n_requests=args.requests,
+                                        seeds=args.seeds,
+                                        output_path=args.output,
+                                        workers=args.workers,
+                                        threads=args.threads,
+                                        migrator_options=migrator_options,
+                                        cache_dir=args.cache)
+    else:
+        configs = SweepRunner.make_configs(fleet_sizes=list(range(args.min_uavs, args.max_uavs + 1)),
+                                           n_requests=args.requests,
+                                           seeds=args.seeds)
+        results = SweepRunner.run(scenario=args.scenario,
+                                  configs=configs,
+                                  output_path=args.output,
+                                  workers=args.workers,
+                                  threads=args.threads,
+                                  migrator_options=migrator_options,
+                                  telemetry_dir=args.telemetry,
+                                  results_dir=args.results,
+                                  results_format=args.results_format,
+                                  cache_dir=args.cache,
+                                  checkpoint_dir=args.checkpoints,
+                                  resume=args.resume)
+    for result in results:
+        print(f"{result['n_uavs']}  ->  {result['time_slots']}  (requests={result['n_requests']}, seed={result['seed']})")
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The modules of serviceMigration import each other by their flat
+# names, as when the scripts are run from that directory.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "serviceMigration"))
@@ -0,0 +1,53 @@
+from pathlib import Path
+import gurobipy as gp
+import numpy as np
+import scipy.sparse as sp
+from ServiceMigrator import ServiceMigrator
+from SweepRunner import SweepRunner
+
+SCENARIO: Path = Path(__file__).resolve().parents[1] / "input" / "Scenario_36.json"
+
+
+def get_constraint_rows(migrator: ServiceMigrator, columns: list[str]) -> np.ndarray:
+    # The rows of the c1, ..., c5 constraints of the model, over the
+    # variables named in columns, followed by the right-hand side.
+    migrator.model.update()
+    positions: dict[str, int] = {name: j for j, name in enumerate(columns)}
+    rows: list[np.ndarray] = []
+    for constraints in (migrator.constraints_1, migrator.constraints_2, migrator.constraints_3,
+                        migrator.constraints_4, migrator.constraints_5):
+        for constr in constraints.values():
+            row: np.ndarray = np.zeros(len(columns) + 1)
+            expr: gp.LinExpr = migrator.model.getRow(constr)
+            for k in range(expr.size()):
+                row[positions[expr.getVar(k).VarName]] += expr.getCoeff(k)
+            row[-1] = constr.RHS
+            rows.append(row)
+    return np.array(rows)
+
+
+def test_dict_and_matrix_builders_build_the_same_constraints() -> None:
+    env: gp.Env = gp.Env(params={"OutputFlag": 0})
+    migrators: dict[str, ServiceMigrator] = {}
+    for builder in ("dict", "matrix"):
+        arguments: dict = SweepRunner.get_migrator_arguments(SCENARIO, 10, None, 20, {"builder": builder,
+                                                                                     "incremental": False})
+        migrators[builder] = ServiceMigrator(env=env, **arguments)
+        migrators[builder].setup_model()
+    migrator: ServiceMigrator = migrators["matrix"]
+    columns: list[str] = [f"x {uav} {instance}" for uav in migrator.uav_ids
+                          for instance in migrator.instance_ids] + ["z"]
+    dict_rows: np.ndarray = get_constraint_rows(migrators["dict"], columns)
+    matrix_rows: np.ndarray = get_constraint_rows(migrator, columns)
+    np.testing.assert_allclose(dict_rows, matrix_rows, rtol=1e-9, atol=1e-9)
+
+    matrices = migrator._get_placement_problem().get_constraint_matrices()
+    expected: np.ndarray = np.vstack([np.hstack([sp.csr_matrix(matrix).toarray(), rhs[:, None]])
+                                      for matrix, _, rhs in matrices.values()])
+    np.testing.assert_allclose(matrix_rows, expected, rtol=1e-9, atol=1e-9)
+    senses: list[str] = [constr.Sense for constr in migrators["dict"].model.getConstrs()]
+    assert sorted(senses) == sorted(sense for matrix, sense, _ in matrices.values()
+                                    for _ in range(matrix.shape[0]))
+    for builder_migrator in migrators.values():
+        builder_migrator.dispose()
+    env.dispose()
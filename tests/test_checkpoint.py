@@ -0,0 +1,39 @@
+from pathlib import Path
+import gurobipy as gp
+import numpy as np
+import pytest
+from ServiceMigrator import ServiceMigrator
+from SweepRunner import SweepRunner
+
+SCENARIO: Path = Path(__file__).resolve().parents[1] / "input" / "Scenario_36.json"
+
+
+class Crash(Exception):
+    pass
+
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    env: gp.Env = gp.Env(params={"OutputFlag": 0})
+    checkpoint_path: Path = tmp_path / "checkpoint.npz"
+    monkeypatch.setattr(SweepRunner, "checkpoint_every", 5)
+    expected: dict = SweepRunner.simulate(SCENARIO, 20, None, 20, env=env)
+
+    step = ServiceMigrator.step
+
+    def crashing_step(self: ServiceMigrator, *args, **kwargs) -> None:
+        step(self, *args, **kwargs)
+        if (self.slot == 12):
+            raise Crash()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ServiceMigrator, "step", crashing_step)
+        with pytest.raises(Crash):
+            SweepRunner.simulate(SCENARIO, 20, None, 20, env=env, checkpoint_path=checkpoint_path)
+    assert checkpoint_path.exists()
+    resumed: dict = SweepRunner.simulate(SCENARIO, 20, None, 20, env=env,
+                                         checkpoint_path=checkpoint_path, resume=True)
+    assert not checkpoint_path.exists()
+    assert resumed["time_slots"] == expected["time_slots"] > 10
+    np.testing.assert_allclose(resumed["min_battery"], expected["min_battery"])
+    assert resumed["migrations"] == expected["migrations"]
+    env.dispose()
@@ -0,0 +1,29 @@
+import numpy as np
+from scipy.optimize import milp, LinearConstraint
+from FeasibilityScreen import FeasibilityScreen
+from SolverBackend import PlacementProblem
+
+
+def test_negative_energy_coefficients_are_not_screened_out() -> None:
+    # Hosting instance 1 saves more energy than instance 0 costs, so the
+    # placement [1, 1] ends the time slot at 15.5 Wh, above the floor,
+    # although instance 0 alone would take the UAV below it.
+    problem: PlacementProblem = PlacementProblem(uav_ids=["uav_0"],
+                                                 instance_ids=["s0_0", "s1_0"],
+                                                 service_ids=["s0", "s1"],
+                                                 instance_service=np.array([0, 1]),
+                                                 ram_req=np.array([0.1, 0.1]),
+                                                 ram_cap=np.array([1.0]),
+                                                 batt_lvl=np.array([15.0]),
+                                                 cpu_coeffs=np.array([[0.1, 0.1]]),
+                                                 energy_coeffs=np.array([[1.5, -2.0]]),
+                                                 energy_constant=np.array([0.0]))
+    result = milp(c=np.zeros(2),
+                  constraints=[LinearConstraint(np.eye(2), 1.0, 1.0),
+                               LinearConstraint(problem.energy_coeffs,
+                                                -np.inf, problem.batt_lvl - problem.min_batt_lvl)],
+                  integrality=np.ones(2),
+                  bounds=(0, 1))
+    assert result.status == 0
+    np.testing.assert_allclose(result.x, [1.0, 1.0])
+    assert FeasibilityScreen.check_infeasible(problem) is None
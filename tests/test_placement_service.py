@@ -0,0 +1,30 @@
+from pathlib import Path
+import numpy as np
+from PlacementService import PlacementService
+
+SCENARIO: Path = Path(__file__).resolve().parents[1] / "input" / "Scenario_36.json"
+
+
+def get_requests(service: PlacementService, seed: int) -> list[list[float]]:
+    shape: tuple[int, int] = (len(service.migrator.uav_ids), len(service.migrator.catalog))
+    return np.random.default_rng(seed).integers(0, 30, shape).tolist()
+
+
+def test_malformed_message_leaves_state_unchanged() -> None:
+    reference: PlacementService = PlacementService(SCENARIO, n_uavs=20)
+    service: PlacementService = PlacementService(SCENARIO, n_uavs=20)
+    first: list[list[float]] = get_requests(reference, 1)
+    second: list[list[float]] = get_requests(reference, 2)
+    replies: list[dict] = []
+    for placement_service, messages in ((reference, [first, second]),
+                                        (service, [first, second[:-1], second])):
+        for requests in messages:
+            replies.append(placement_service.handle({"requests": requests}))
+    assert "error" in replies[3]
+    battery_lvls: np.ndarray = reference.migrator.fleet.batt_lvl.copy()
+    assert service.handle({"requests": second, "batt_lvl": [1.0] * 3})["error"].startswith("ValueError")
+    np.testing.assert_allclose(service.migrator.fleet.batt_lvl, battery_lvls)
+    np.testing.assert_allclose(replies[4]["battery"], replies[1]["battery"])
+    assert replies[4]["placement"] == replies[1]["placement"]
+    reference.migrator.dispose()
+    service.migrator.dispose()
@@ -0,0 +1,43 @@
+from pathlib import Path
+import gurobipy as gp
+import numpy as np
+from PowerConsumptionModel import PowerConsumptionModel as PCM
+from ServiceMigrator import ServiceMigrator
+from SweepRunner import SweepRunner
+
+SCENARIO: Path = Path(__file__).resolve().parents[1] / "input" / "Scenario_36.json"
+
+
+def test_evaluate_placements_matches_the_model_expressions() -> None:
+    env: gp.Env = gp.Env(params={"OutputFlag": 0})
+    migrator: ServiceMigrator = ServiceMigrator(env=env, **SweepRunner.get_migrator_arguments(SCENARIO, 10, None, 20))
+    placements: np.ndarray = (np.random.default_rng(1).random((3, len(migrator.uav_ids), len(migrator.instance_ids)))
+                              < 0.3).astype(float)
+    metrics: dict[str, np.ndarray] = PCM.evaluate_placements(migrator.fleet, migrator.catalog, migrator.request_matrix,
+                                                             placements, migrator.time_slot_interval)
+    single: dict[str, np.ndarray] = PCM.evaluate_placements(migrator.fleet, migrator.catalog, migrator.request_matrix,
+                                                            placements[1], migrator.time_slot_interval)
+    for column, values in single.items():
+        np.testing.assert_allclose(values, metrics[column][1])
+
+    uavs: dict[str, dict[str, float]] = migrator.uavs
+    for k, placement in enumerate(placements):
+        model: gp.Model = gp.Model(env=env)
+        variables: dict[tuple[str, str], gp.Var] = {
+            (uav, instance): model.addVar(lb=placement[i, j], ub=placement[i, j])
+            for i, uav in enumerate(migrator.uav_ids) for j, instance in enumerate(migrator.instance_ids)}
+        model.optimize()
+        for i, uav in enumerate(migrator.uav_ids):
+            expressions: dict[str, gp.LinExpr] = {
+                name: function(services=migrator.services, uav=(uav, uavs[uav]),
+                               requests=migrator.requests, variables=variables)
+                for name, function in (("cpu_utilization", PCM.get_cpu_utilization),
+                                       ("uplink_data_rate", PCM.get_uplink_data_rate),
+                                       ("downlink_data_rate", PCM.get_downlink_data_rate))}
+            expressions["step_consumption"] = PCM.get_energy_consumption(
+                time_slot_interval=migrator.time_slot_interval, **expressions)
+            for name, expr in expressions.items():
+                assert np.isclose(expr.getValue(), metrics[name][k, i], rtol=1e-9, atol=1e-9), (name, k, uav)
+        model.dispose()
+    migrator.dispose()
+    env.dispose()
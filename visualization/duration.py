@@ -1,17 +1,25 @@
 from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 from pathlib import Path
 import pandas as pd
-import os
 
 
 base_dir = Path("../output")
 output_file = Path("epochs.csv")
-data = pd.read_csv(os.path.join(base_dir, output_file))
 
-plt.plot(data["No of UAVs"], data["Time slots"]*10)
-plt.xlabel("No. of UAVs", fontsize=12)
-plt.yticks(ticks = [i for i in range(0, 601, 60)])
-plt.xticks(ticks = [i for i in range(10, 61, 5)])
-plt.ylabel("Elapsed time (minutes)", fontsize=12)
 
-plt.show()
\ No newline at end of file
+def plot(data: pd.DataFrame) -> Figure:
+    data = data.groupby("No of UAVs", as_index=False)["Time slots"].mean()
+
+    fig = plt.figure()
+    plt.plot(data["No of UAVs"], data["Time slots"]*10)
+    plt.xlabel("No. of UAVs", fontsize=12)
+    plt.yticks(ticks = [i for i in range(0, int(data["Time slots"].max()*10) + 60, 60)])
+    plt.xticks(ticks = [i for i in range(data["No of UAVs"].min() // 5 * 5, data["No of UAVs"].max() + 5, 5)])
+    plt.ylabel("Elapsed time (minutes)", fontsize=12)
+    return fig
+
+
+if __name__ == "__main__":
+    plot(pd.read_csv(base_dir / output_file))
+    plt.show()
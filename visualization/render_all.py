@@ -0,0 +1,42 @@
+import argparse
+import importlib
+from pathlib import Path
+import matplotlib
+import pandas as pd
+from results_loader import load_results
+
+# Render every figure of a run at once, loading the results a single
+# time (from the cache if it is up to date), and save them as images.
+
+heatmaps: list[str] = ["cpu_usage",
+                       "downlink_data_rate_generation",
+                       "uplink_data_rate_generation",
+                       "microservice_migration",
+                       "energy_usage"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=Path, default=Path("../output/Scenario_36.csv"))
+    parser.add_argument("--epochs", type=Path, default=Path("../output/epochs.csv"))
+    parser.add_argument("--output", type=Path, default=Path("../output/figures"))
+    parser.add_argument("--format", default="png")
+    parser.add_argument("--no-cache", dest="cache", action="store_false")
+    parser.add_argument("--show", action="store_true",
+                        help="Show the figures instead of only saving them")
+    args = parser.parse_args()
+    if (not args.show):
+        matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    figures: dict = {}
+    results = load_results(args.results, use_cache=args.cache)
+    for name in heatmaps:
+        figures[name] = importlib.import_module(name).plot(results)
+    if (args.epochs.exists()):
+        figures["duration"] = importlib.import_module("duration").plot(pd.read_csv(args.epochs))
+    for name, figure in figures.items():
+        figure.savefig(args.output / f"{name}.{args.format}", bbox_inches="tight")
+        print(f"Saved {args.output / f'{name}.{args.format}'}")
+    if (args.show):
+        plt.show()
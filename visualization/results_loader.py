@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "serviceMigration"))
+from ResultWriter import NpzResultWriter
+
+# Shared loader of the results of a run (output/Scenario_36.csv or the
+# .csv/.npz/.parquet files of ResultWriter). The rows are pivoted in a
+# single pass into UAV × time slot arrays, one per metric, which are
+# cached next to the source file and reused while its mtime and size
+# do not change.
+
+cache_version: int = 1
+
+
+def read_table(path: Path) -> pd.DataFrame:
+    """Returns:
+        pd.DataFrame: The rows of the results file, one per UAV and
+        time slot.
+    """
+    if (path.suffix == ".parquet"):
+        return pd.read_parquet(path)
+    if (path.suffix == ".npz"):
+        return NpzResultWriter.read_npz(path)
+    return pd.read_csv(path)
+
+
+def pivot(data: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Pivot the rows into UAV × time slot arrays. The UAVs keep the
+    order in which they first appear and missing cells are NaN.
+
+    Returns:
+        dict[str, np.ndarray]: "uavs" and "steps" with the labels of
+        the rows and columns, one array per metric column, "services"
+        with the number of services deployed in each UAV and
+        "migrations" with its change with respect to the previous time
+        slot (the deployments themselves in the first one).
+    """
+    uav_index, uavs = pd.factorize(data["uav"])
+    step_index, steps = pd.factorize(data["step"], sort=True)
+    results: dict[str, np.ndarray] = {"uavs": np.asarray(uavs).astype(str),
+                                      "steps": np.asarray(steps)}
+    service_columns: list[str] = [column for column in data.columns if column.startswith("service_")]
+    for column in data.columns:
+        if (column in ("uav", "step")):
+            continue
+        values: np.ndarray = np.full((len(uavs), len(steps)), np.nan)
+        values[uav_index, step_index] = data[column].to_numpy(dtype=float)
+        results[column] = values
+    if (service_columns):
+        results["services"] = sum(results[column] for column in service_columns)
+        results["migrations"] = np.diff(results["services"], axis=1, prepend=0.0)
+    return results
+
+
+def get_cache_path(path: Path) -> Path:
+    """Returns:
+        Path: The cache file of a results file.
+    """
+    return path.parent / ".cache" / f"{path.name}.npz"
+
+
+def load_results(path: Path, use_cache: bool = True) -> dict[str, np.ndarray]:
+    """Load a results file pivoted by pivot, from the cache if it was
+    built from the current version of the file.
+
+    Args:
+        path (Path): The results file.
+        use_cache (bool): Read and write the cache.
+
+    Returns:
+        dict[str, np.ndarray]: The arrays of pivot.
+    """
+    stat = path.stat()
+    key: np.ndarray = np.array([cache_version, stat.st_mtime_ns, stat.st_size])
+    cache_path: Path = get_cache_path(path)
+    if (use_cache and cache_path.exists()):
+        with np.load(cache_path) as cache:
+            if (np.array_equal(cache["key"], key)):
+                return {name: cache[name] for name in cache.files if name != "key"}
+    results: dict[str, np.ndarray] = pivot(read_table(path))
+    if (use_cache):
+        cache_path.parent.mkdir(exist_ok=True)
+        np.savez(cache_path, key=key, **results)
+    return results
+
+
+def set_heatmap_ticks(n_uavs: int, n_slots: int, max_ticks: int = 100) -> None:
+    """Label the axes of a UAV × time slot heatmap with a blank tick
+    per UAV and time slot, or without ticks if there are more than
+    max_ticks of them.
+    """
+    from matplotlib import pyplot as plt
+    plt.xticks(ticks=range(n_slots) if n_slots <= max_ticks else [],
+               labels=["" for _ in range(n_slots)] if n_slots <= max_ticks else [])
+    plt.yticks(ticks=range(n_uavs) if n_uavs <= max_ticks else [],
+               labels=["" for _ in range(n_uavs)] if n_uavs <= max_ticks else [])
+    plt.xlabel("Time slots", fontsize=24)
+    plt.ylabel("UAVs", fontsize=24)